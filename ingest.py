@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Belge Yükleme Aracı - Dizinleri vektör veritabanına ekler ve senkronize eder
+
+Kullanım:
+    python ingest.py sync data/test_documents
+    python ingest.py sync data/mevzuat --bulk-workers 0
+    python ingest.py bench-pdf data/pdfs --backends pypdf2 pypdfium2 pdfminer
+    python ingest.py onnx-parity data/test_documents --limit 500
+    python ingest.py vector-report --dims 256 128 64
+    python ingest.py fit-projection --dim 128
+    python ingest.py migrate-space --space cosine
+    python ingest.py build-bm25
+    python ingest.py build-articles
+"""
+
+import argparse
+import sys
+
+# src klasörünü path'e ekle
+sys.path.append('src')
+
+
+def cmd_sync(args):
+    """Dizini artımlı olarak senkronize et"""
+    from database.chroma_manager import ChromaManager
+    from processing.document_processor import DocumentProcessor
+
+    processor = DocumentProcessor(args.config)
+    chroma_manager = ChromaManager(args.config, use_cache=not args.no_cache)
+
+    if args.bulk_workers is not None:
+        chroma_manager.start_embedding_pool(args.bulk_workers, args.threads_per_worker)
+    try:
+        stats = chroma_manager.sync_directory(args.directory, processor, max_workers=args.workers)
+    except Exception as e:
+        print(f"❌ Senkronizasyon yarım kaldı (yazılamayan dosyalar bir sonraki çalıştırmada denenecek): {e}")
+        return 1
+    finally:
+        chroma_manager.stop_embedding_pool()
+
+    print(f"✅ Senkronizasyon: {stats['added']} yeni, {stats['updated']} güncellenen, "
+          f"{stats['deleted']} silinen, {stats['unchanged']} değişmeyen dosya")
+    print(f"📄 {stats['chunks']} chunk yazıldı, {stats['failed']} dosya işlenemedi")
+    if chroma_manager.embedding_cache is not None:
+        cache_stats = chroma_manager.embedding_cache.stats()
+        print(f"💾 Embedding önbelleği: {cache_stats['hits']} isabet, {cache_stats['misses']} ıska")
+    return 0
+
+
+def cmd_bench_pdf(args):
+    """PDF motorlarını aynı dosya setinde karşılaştır"""
+    from processing.pdf_benchmark import benchmark_backends, collect_pdfs
+
+    pdf_paths = collect_pdfs(args.paths)
+    if not pdf_paths:
+        print("❌ PDF bulunamadı")
+        return 1
+
+    print(f"📊 {len(pdf_paths)} PDF üzerinde benchmark...")
+    try:
+        report = benchmark_backends(pdf_paths, args.backends, reference=args.reference)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"\n{'Motor':<12} {'Sayfa':>7} {'Süre(s)':>9} {'Sayfa/s':>9} {'Tepe RSS(MB)':>13} {'Benzerlik':>10}")
+    for row in report:
+        rss = f"{row['peak_rss_mb']:.1f}" if row['peak_rss_mb'] is not None else "-"
+        print(f"{row['backend']:<12} {row['pages']:>7} {row['seconds']:>9.2f} {row['pages_per_sec']:>9.1f} "
+              f"{rss:>13} {row['similarity']:>10.3f}")
+    print(f"\n(Benzerlik referansı: {args.reference})")
+    return 0
+
+
+def cmd_onnx_parity(args):
+    """ONNX motorunun vektörlerini PyTorch vektörleriyle karşılaştır"""
+    import yaml
+    from database.onnx_encoder import embedding_parity
+    from processing.document_processor import DocumentProcessor
+
+    with open(args.config, 'r', encoding='utf-8') as file:
+        embedding_config = yaml.safe_load(file)['embedding']
+
+    processor = DocumentProcessor(args.config)
+    texts = []
+    for doc in processor.iter_directory(args.directory):
+        texts.append(doc['content'])
+        if len(texts) >= args.limit:
+            break
+    if not texts:
+        print("❌ Karşılaştırılacak metin bulunamadı")
+        return 1
+
+    quantize = embedding_config.get('onnx_quantize', True) if args.quantize is None else args.quantize == 'int8'
+    report = embedding_parity(
+        embedding_config['model_name'],
+        texts,
+        quantize=quantize,
+        onnx_dir=embedding_config.get('onnx_dir', './data/onnx_models'),
+        max_seq_length=embedding_config.get('max_seq_length', 128)
+    )
+
+    print(f"📊 {report['texts']} chunk, ONNX {'int8' if report['quantized'] else 'fp32'}")
+    print(f"   Kosinüs uyumu: ort. {report['mean_cosine']:.4f}, %5 {report['p05_cosine']:.4f}, en düşük {report['min_cosine']:.4f}")
+    print(f"   Süre: PyTorch {report['torch_seconds']}s, ONNX {report['onnx_seconds']}s ({report['speedup']}x)")
+    return 0
+
+
+def cmd_vector_report(args):
+    """Tam hassasiyete göre float16 ve PCA seçeneklerinin recall/boyut raporu"""
+    from database.chroma_manager import ChromaManager
+    from database.vector_projection import recall_report
+
+    chroma_manager = ChromaManager(args.config)
+    if chroma_manager.projection is not None:
+        print("❌ Koleksiyon zaten projeksiyonlu; rapor tam boyutlu vektörlerle üretilmeli")
+        return 1
+
+    vectors = chroma_manager.sample_embeddings(args.sample)
+    if len(vectors) <= args.k:
+        print(f"❌ Rapor için yeterli vektör yok ({len(vectors)})")
+        return 1
+
+    print(f"📊 {len(vectors)} vektör, {min(args.queries, len(vectors))} sorgu, recall@{args.k} "
+          f"({chroma_manager.distance_space} uzayında)")
+    report = recall_report(vectors, args.dims, k=args.k, n_queries=args.queries, space=chroma_manager.distance_space)
+
+    print(f"\n{'Seçenek':<18} {'Boyut':>6} {'Bayt/vektör':>12} {'Oran':>6} {'Recall':>8} {'Varyans':>8}")
+    for row in report:
+        variance = f"{row['explained_variance']:.3f}" if 'explained_variance' in row else "-"
+        print(f"{row['variant']:<18} {row['dim']:>6} {row['bytes_per_vector']:>12} {row['size_ratio']:>6.3f} "
+              f"{row['recall_at_k']:>8.4f} {variance:>8}")
+    print("\n(ChromaDB HNSW vektörleri float32 saklar; float16 satırları yalnızca karşılaştırma içindir)")
+    return 0
+
+
+def cmd_fit_projection(args):
+    """Koleksiyondaki vektörlerle PCA projeksiyonu eğit ve kaydet"""
+    from database.chroma_manager import ChromaManager
+    from database.onnx_encoder import embedding_model_id
+    from database.vector_projection import PCAProjection
+
+    chroma_manager = ChromaManager(args.config)
+    if chroma_manager.projection is not None:
+        print("❌ Koleksiyon zaten projeksiyonlu; yeni projeksiyon tam boyutlu vektörlerle eğitilmeli")
+        return 1
+
+    vectors = chroma_manager.sample_embeddings(args.sample)
+    model_id = embedding_model_id(chroma_manager.config['embedding'], chroma_manager.embedding_model)
+    projection = PCAProjection.fit(vectors, args.dim, model_id)
+    path = chroma_manager.projection_path()
+    projection.save(path)
+
+    print(f"✅ PCA {projection.input_dim} -> {projection.output_dim}, açıklanan varyans {projection.explained_variance:.3f}")
+    print(f"💾 {path}")
+    print("ℹ️ vector_db.projection.enabled: true yapıp koleksiyonu yeniden kurun (delete_all + sync;"
+          " embedding önbelleği sayesinde yeniden encode gerekmez)")
+    return 0
+
+
+def cmd_migrate_space(args):
+    """Mevcut koleksiyonu yeniden embedding yapmadan yeni mesafe uzayına taşı"""
+    from database.chroma_manager import ChromaManager
+
+    chroma_manager = ChromaManager(args.config)
+    before = chroma_manager.distance_space
+    moved = chroma_manager.migrate_distance_space(args.space)
+
+    print(f"✅ {before} -> {chroma_manager.distance_space}: {moved} kayıt taşındı")
+    return 0
+
+
+def cmd_build_bm25(args):
+    """BM25 indeksini koleksiyondaki chunk metinlerinden yeniden kur"""
+    from database.chroma_manager import ChromaManager
+
+    chroma_manager = ChromaManager(args.config)
+    indexed = chroma_manager.rebuild_bm25_index()
+
+    print(f"✅ BM25 indeksi: {indexed} chunk")
+    return 0
+
+
+def cmd_build_articles(args):
+    """Madde indeksini koleksiyondaki chunk metadata'larından yeniden kur"""
+    from database.chroma_manager import ChromaManager
+
+    chroma_manager = ChromaManager(args.config)
+    articles = chroma_manager.rebuild_article_index()
+
+    print(f"✅ Madde indeksi: {articles} madde")
+    return 0
+
+
+def main():
+    """Komut satırı girişi"""
+    parser = argparse.ArgumentParser(description="Hukuk RAG belge yükleme aracı")
+    parser.add_argument("--config", default="config/config.yaml", help="Konfigürasyon dosyası")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = subparsers.add_parser("sync", help="Dizini artımlı senkronize et")
+    sync_parser.add_argument("directory", help="Belge dizini")
+    sync_parser.add_argument("--workers", type=int, default=None, help="Süreç sayısı")
+    sync_parser.add_argument("--no-cache", action="store_true", help="Embedding önbelleğini kullanma")
+    sync_parser.add_argument("--bulk-workers", type=int, default=None,
+                             help="Embedding süreç havuzu (0 = tüm çekirdekler; verilmezse tek süreç)")
+    sync_parser.add_argument("--threads-per-worker", type=int, default=None, help="Embedding süreci başına thread")
+    sync_parser.set_defaults(func=cmd_sync)
+
+    bench_parser = subparsers.add_parser("bench-pdf", help="PDF motorlarını karşılaştır")
+    bench_parser.add_argument("paths", nargs="+", help="PDF dosyaları veya dizinleri")
+    bench_parser.add_argument("--backends", nargs="+", default=None, help="Denenecek motorlar (varsayılan: kurulu olanlar)")
+    bench_parser.add_argument("--reference", default="pypdf2", help="Metin benzerliği için referans motor")
+    bench_parser.set_defaults(func=cmd_bench_pdf)
+
+    parity_parser = subparsers.add_parser("onnx-parity", help="ONNX ve PyTorch embedding'lerini karşılaştır")
+    parity_parser.add_argument("directory", help="Örnek chunk'ların alınacağı belge dizini")
+    parity_parser.add_argument("--limit", type=int, default=500, help="En fazla chunk sayısı")
+    parity_parser.add_argument("--quantize", choices=["int8", "fp32"], default=None, help="Varsayılan: config'teki onnx_quantize")
+    parity_parser.set_defaults(func=cmd_onnx_parity)
+
+    report_parser = subparsers.add_parser("vector-report", help="float16/PCA seçenekleri için recall ve boyut raporu")
+    report_parser.add_argument("--dims", type=int, nargs="+", default=[256, 128, 64], help="Denenecek PCA boyutları")
+    report_parser.add_argument("--k", type=int, default=10, help="recall@k")
+    report_parser.add_argument("--queries", type=int, default=200, help="Sorgu sayısı")
+    report_parser.add_argument("--sample", type=int, default=20000, help="Koleksiyondan alınacak en fazla vektör")
+    report_parser.set_defaults(func=cmd_vector_report)
+
+    fit_parser = subparsers.add_parser("fit-projection", help="PCA projeksiyonunu koleksiyon üzerinde eğit")
+    fit_parser.add_argument("--dim", type=int, default=128, help="Hedef boyut")
+    fit_parser.add_argument("--sample", type=int, default=50000, help="Eğitimde kullanılacak en fazla vektör")
+    fit_parser.set_defaults(func=cmd_fit_projection)
+
+    migrate_parser = subparsers.add_parser("migrate-space", help="Koleksiyonu cosine/ip/l2 uzayına taşı")
+    migrate_parser.add_argument("--space", choices=["cosine", "ip", "l2"], default=None,
+                                help="Hedef uzay (varsayılan: config'teki vector_db.distance)")
+    migrate_parser.set_defaults(func=cmd_migrate_space)
+
+    bm25_parser = subparsers.add_parser("build-bm25", help="BM25 indeksini koleksiyondan yeniden kur")
+    bm25_parser.set_defaults(func=cmd_build_bm25)
+
+    articles_parser = subparsers.add_parser("build-articles", help="Madde indeksini koleksiyondan yeniden kur")
+    articles_parser.set_defaults(func=cmd_build_articles)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
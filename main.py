@@ -3,15 +3,21 @@
 Hukuk RAG API - Ana Sunucu Dosyası
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import uvicorn
 import time
 import os
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime
 
+from src.processing.turkish_analyzer import normalize_key
+
 # ChromaDB import kontrolü
 try:
     from src.database.chroma_manager import ChromaManager
@@ -20,11 +26,57 @@ except ImportError:
     CHROMA_AVAILABLE = False
     print("⚠️ ChromaDB bulunamadı, temel mod çalışacak")
 
+# Global değişkenler
+documents_count = 0
+start_time = time.time()
+chroma_manager = None
+readiness = {"ready": False, "phase": "starting", "error": None, "warmup_seconds": None}
+
+def initialize_chroma():
+    """ChromaDB ve embedding modelini yükle, ardından ısıt (ayrı thread'de çalışır)"""
+    global chroma_manager
+    warmup_start = time.time()
+    
+    if CHROMA_AVAILABLE:
+        try:
+            readiness["phase"] = "loading"
+            manager = ChromaManager()
+            print("✅ ChromaDB bağlantısı başarılı")
+            
+            readiness["phase"] = "warming_up"
+            manager.warm_up()
+            chroma_manager = manager
+        except Exception as e:
+            print(f"⚠️ ChromaDB başlatma hatası: {e}")
+            readiness["error"] = str(e)
+            chroma_manager = None
+    
+    readiness["warmup_seconds"] = round(time.time() - warmup_start, 2)
+    # ChromaDB kurulu ama başlatılamadıysa hazır sayılmaz (/health/ready 503 döner);
+    # ChromaDB hiç kurulu değilse temel modda hazırdır
+    if readiness["error"] or (CHROMA_AVAILABLE and chroma_manager is None):
+        readiness["phase"] = "failed"
+        readiness["ready"] = False
+        return
+    readiness["phase"] = "ready"
+    readiness["ready"] = True
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Sunucu yaşam döngüsü: ısınma arka planda, liveness hemen yanıt verir"""
+    warmup_task = asyncio.create_task(asyncio.to_thread(initialize_chroma))
+    yield
+    if not warmup_task.done():
+        await warmup_task
+    if chroma_manager:
+        chroma_manager.close()
+
 # FastAPI uygulaması
 app = FastAPI(
     title="Hukuk RAG API",
     description="Hukuk belgeleri için RAG (Retrieval-Augmented Generation) API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -36,25 +88,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global değişkenler
-documents_count = 0
-start_time = time.time()
-chroma_manager = None
-
-# ChromaDB başlat
-if CHROMA_AVAILABLE:
-    try:
-        chroma_manager = ChromaManager()
-        print("✅ ChromaDB bağlantısı başarılı")
-    except Exception as e:
-        print(f"⚠️ ChromaDB başlatma hatası: {e}")
-        chroma_manager = None
-
 # ------------------ MODELLER ------------------ #
 class QueryRequest(BaseModel):
     question: str
     chat_history: Optional[List[Dict[str, str]]] = None
     max_sources: Optional[int] = 5
+    # Metadata filtreleri: {"filename": "...", "file_type": [".pdf"], "timestamp_from": "2025-01-01", "article_no": 3}
+    filters: Optional[Dict[str, Any]] = None
 
 class QueryResponse(BaseModel):
     query: str
@@ -71,7 +111,9 @@ async def root():
         "message": "Hukuk RAG API",
         "version": "1.0.0",
         "docs_url": "/docs",
-        "health_url": "/health"
+        "health_url": "/health",
+        "liveness_url": "/health/live",
+        "readiness_url": "/health/ready"
     }
 
 @app.get("/health")
@@ -82,15 +124,38 @@ async def health_check():
         "database": "healthy" if chroma_manager else "unavailable",
         "llm": "healthy"
     }
-    status = "healthy" if chroma_manager else "degraded"
+    if not readiness["ready"]:
+        components["database"] = readiness["phase"]
+        status = "unhealthy" if readiness["phase"] == "failed" else "starting"
+    else:
+        status = "healthy" if chroma_manager else "degraded"
     
     return {
         "status": status,
+        "ready": readiness["ready"],
         "timestamp": datetime.now().isoformat(),
         "components": components,
         "uptime_seconds": time.time() - start_time
     }
 
+@app.get("/health/live")
+async def liveness_check():
+    """Süreç ayakta mı? (ısınma sürerken de 200)"""
+    return {"status": "alive", "uptime_seconds": time.time() - start_time}
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Trafik alınabilir mi? Model ve indeks ısınana kadar 503"""
+    body = {
+        "ready": readiness["ready"],
+        "phase": readiness["phase"],
+        "database": "connected" if chroma_manager else "unavailable",
+        "warmup_seconds": readiness["warmup_seconds"]
+    }
+    if readiness["error"]:
+        body["error"] = readiness["error"]
+    return JSONResponse(status_code=200 if readiness["ready"] else 503, content=body)
+
 @app.get("/stats")
 async def get_stats():
     """Sistem istatistikleri"""
@@ -116,10 +181,30 @@ async def query_documents(request: QueryRequest):
     """RAG sorgusu"""
     start_query_time = time.time()
     try:
-        if chroma_manager:
-            search_results = chroma_manager.search(
-                request.question, 
-                n_results=request.max_sources or 5
+        article = None
+        if chroma_manager and not request.filters:
+            # Yalnızca madde atıfı olan sorgular ("TCK madde 81") embedding'siz doğrudan yanıtlanır
+            article = await run_in_threadpool(chroma_manager.lookup_citation, request.question)
+        
+        if article:
+            answer = f"{article['label']}:\n\n" + "\n".join(chunk['content'].strip() for chunk in article['chunks'])
+            confidence = 1.0
+            sources = [
+                {
+                    "filename": doc['metadata'].get('filename', 'unknown'),
+                    "content": doc['content'],
+                    "similarity": doc['similarity'],
+                    "chunk_index": doc['metadata'].get('chunk_index', 0)
+                }
+                for doc in article['chunks']
+            ]
+        elif chroma_manager:
+            # Thread havuzunda çalışır; eş zamanlı sorgular mikro-batch'lerde birleşir
+            search_results = await run_in_threadpool(
+                chroma_manager.search,
+                request.question,
+                n_results=request.max_sources or 5,
+                filters=request.filters
             )
             if search_results:
                 context = "\n".join([doc['content'] for doc in search_results[:3]])
@@ -151,18 +236,50 @@ async def query_documents(request: QueryRequest):
             sources=sources,
             response_time=response_time
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Geçersiz filtre: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Sorgu hatası: {str(e)}")
 
 @app.get("/documents/search")
-async def search_documents(query: str, limit: int = 5):
-    """Belgelerde arama"""
+async def search_documents(
+    query: str,
+    limit: int = 5,
+    filename: Optional[List[str]] = Query(None),
+    file_type: Optional[List[str]] = Query(None),
+    law_title: Optional[str] = None,
+    article_no: Optional[int] = None,
+    timestamp_from: Optional[str] = None,
+    timestamp_to: Optional[str] = None,
+    contains: Optional[str] = None
+):
+    """Belgelerde arama (metadata filtreleri ChromaDB'de uygulanır)"""
+    filters = {
+        "filename": filename,
+        "file_type": file_type,
+        "law_title": law_title,
+        "article_no": article_no,
+        "timestamp_from": timestamp_from,
+        "timestamp_to": timestamp_to,
+        "contains": contains
+    }
+    filters = {key: value for key, value in filters.items() if value is not None}
     try:
         if chroma_manager:
-            results = chroma_manager.search(query, n_results=limit)
-            return {"query": query, "count": len(results), "results": results}
+            results, timings = await run_in_threadpool(
+                chroma_manager.search_with_timings, query, n_results=limit, filters=filters
+            )
+            return {
+                "query": query,
+                "count": len(results),
+                "filters": filters,
+                "results": results,
+                "timings_ms": {leg: round(value, 2) for leg, value in timings.items()}
+            }
         else:
             return {"query": query, "count": 0, "results": [], "error": "ChromaDB bağlantısı yok"}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Geçersiz filtre: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Arama hatası: {str(e)}")
 
@@ -220,7 +337,7 @@ async def clear_documents():
 
 # ------------------ YARDIMCI FONKSİYONLAR ------------------ #
 def generate_answer(question: str, context: str) -> str:
-    q = question.lower()
+    q = normalize_key(question)
     if "ceza kanunu" in q:
         return f"Türk Ceza Kanunu ile ilgili sorunuza dayanarak: {context[:300]}..."
     elif "medeni kanun" in q:
@@ -236,7 +353,7 @@ def calculate_confidence(results: List[Dict]) -> float:
     return min(avg_similarity, 1.0)
 
 def get_fallback_answer(question: str) -> str:
-    q = question.lower()
+    q = normalize_key(question)
     if "ceza kanunu" in q:
         return "Türk Ceza Kanunu, suç teşkil eden fiilleri ve bunlara uygulanacak cezaları düzenler."
     elif "medeni kanun" in q:
@@ -252,6 +369,6 @@ if __name__ == "__main__":
     print("📍 URL: http://localhost:8000")
     print("📚 Dokümantasyon: http://localhost:8000/docs")
     print("❤️ Sağlık Kontrolü: http://localhost:8000/health")
-    print(f"🔌 ChromaDB: {'Bağlı' if chroma_manager else 'Bağlı Değil'}")
+    print("🚦 Hazırlık: http://localhost:8000/health/ready (ısınma bitene kadar 503)")
     
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
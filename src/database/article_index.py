@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Madde İndeksi - (kanun kodu, madde türü, madde no) -> chunk id eşlemesi ile doğrudan madde erişimi
+"""
+
+import os
+import pickle
+import sys
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Tuple, Optional
+
+from loguru import logger
+
+# Local imports
+sys.path.append('src')
+from processing.citation import law_code
+
+ArticleKey = Tuple[str, str, int]
+
+# Kanun kodu eşlemesi değişirse artırılır; farklı sürümle kaydedilmiş indeks yeniden kurulur
+INDEX_VERSION = 2
+
+
+class ArticleIndex:
+    """Madde atıflarından chunk id'lerine indeks
+
+    Madde bilgisi (law_title, article_no) taşıyan her chunk, kanun kodu
+    çözülebiliyorsa indekslenir. Bir madde fıkralarına bölünmüşse tüm chunk'ları
+    chunk sırasıyla tutulur.
+    """
+
+    def __init__(self, index_path: Optional[str] = None):
+        """Başlatma"""
+        self.index_path = Path(index_path) if index_path else None
+        self.articles: Dict[ArticleKey, Dict[str, int]] = {}
+        self.chunk_keys: Dict[str, ArticleKey] = {}
+        # Diskte geçerli indeks yoksa koleksiyondan kurulmalı (madde içermeyen koleksiyonda indeks boş kalır)
+        self.needs_rebuild = True
+        self._lock = threading.RLock()
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def _load(self):
+        """İndeksi diskten yükle"""
+        if self.index_path is None or not self.index_path.exists():
+            return
+
+        try:
+            with open(self.index_path, 'rb') as file:
+                data = pickle.load(file)
+            if data.get('version') != INDEX_VERSION:
+                logger.warning("Madde indeksi farklı sürümle oluşturulmuş, yeniden kurulacak")
+                return
+            self.articles = data['articles']
+            self.chunk_keys = {chunk_id: key for key, chunks in self.articles.items() for chunk_id in chunks}
+            self.needs_rebuild = False
+        except Exception as e:
+            logger.error(f"Madde indeksi okunamadı ({self.index_path}): {e}")
+            self.articles, self.chunk_keys = {}, {}
+
+    def save(self):
+        """İndeksi diske yaz"""
+        if self.index_path is None:
+            return
+
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with self._lock:
+            with open(tmp_path, 'wb') as file:
+                pickle.dump({'version': INDEX_VERSION, 'articles': self.articles}, file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def article_key(metadata: Dict[str, Any]) -> Optional[ArticleKey]:
+        """Chunk metadata'sından madde anahtarı (madde bilgisi ya da bilinen kanun yoksa None)"""
+        if metadata.get('article_no') is None:
+            return None
+        code = law_code(metadata.get('law_title'))
+        if code is None:
+            return None
+        return code, metadata.get('article_kind') or 'madde', int(metadata['article_no'])
+
+    def add(self, ids: List[str], metadatas: List[Dict[str, Any]]):
+        """Madde chunk'larını indeksle (aynı id tekrar gelirse eskisinin yerine geçer)"""
+        with self._lock:
+            for chunk_id, metadata in zip(ids, metadatas):
+                self._remove(chunk_id)
+                key = self.article_key(metadata)
+                if key is None:
+                    continue
+                self.articles.setdefault(key, {})[chunk_id] = int(metadata.get('chunk_index', 0))
+                self.chunk_keys[chunk_id] = key
+
+    def _remove(self, chunk_id: str):
+        """Chunk'ı indeksten çıkar"""
+        key = self.chunk_keys.pop(chunk_id, None)
+        if key is None:
+            return
+        chunks = self.articles[key]
+        chunks.pop(chunk_id, None)
+        if not chunks:
+            del self.articles[key]
+
+    def forget_prefix(self, prefix: str) -> int:
+        """Id'si prefix ile başlayan chunk'ları indeksten çıkar, çıkarılan sayıyı döndür"""
+        with self._lock:
+            removed = [chunk_id for chunk_id in self.chunk_keys if chunk_id.startswith(prefix)]
+            for chunk_id in removed:
+                self._remove(chunk_id)
+        return len(removed)
+
+    def lookup(self, law: str, article_no: int, article_kind: str = 'madde') -> List[str]:
+        """Maddenin chunk id'leri - kaynak dosya (içerik hash'i) ve chunk sırasıyla
+
+        Aynı madde birden fazla dosyada varsa her dosyanın chunk'ları art arda gelir.
+        """
+        with self._lock:
+            chunks = self.articles.get((law, article_kind, article_no), {})
+            return sorted(chunks, key=lambda chunk_id: (chunk_id.split(':', 1)[0], chunks[chunk_id]))
+
+    def clear(self):
+        """İndeksi sıfırla"""
+        with self._lock:
+            self.articles, self.chunk_keys = {}, {}
+            self.needs_rebuild = False
+        self.save()
+
+
+# Test fonksiyonu
+def test_article_index():
+    """ArticleIndex test fonksiyonu"""
+    print("🧪 Madde İndeksi Testi Başlıyor...")
+
+    try:
+        index = ArticleIndex()
+        index.add(
+            ['a:0', 'a:1', 'a:2', 'b:0'],
+            [
+                {'law_title': 'TÜRK CEZA KANUNU', 'article_no': 81, 'article_kind': 'madde', 'chunk_index': 1},
+                {'law_title': 'TÜRK CEZA KANUNU', 'article_no': 81, 'article_kind': 'madde', 'chunk_index': 0},
+                {'law_title': 'TÜRK CEZA KANUNU', 'article_no': 82, 'article_kind': 'madde', 'chunk_index': 2},
+                {'law_title': 'İcra ve İflas Kanunu', 'article_no': 3, 'chunk_index': 0}
+            ]
+        )
+        print(f"📄 TCK 81: {index.lookup('TCK', 81)}, İİK 3: {index.lookup('IIK', 3)}")
+        print(f"🗑️ Çıkarılan: {index.forget_prefix('a:')}, kalan madde: {len(index)}")
+
+        print("✅ Madde indeksi testi başarılı!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test hatası: {e}")
+        return False
+
+if __name__ == "__main__":
+    test_article_index()
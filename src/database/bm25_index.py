@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+BM25 İndeksi - Chunk metinleri üzerinde süreç içi ters indeks ile anahtar kelime araması
+"""
+
+import heapq
+import math
+import os
+import pickle
+import sys
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import List, Dict, Set, Tuple, Optional
+
+from loguru import logger
+
+# Local imports
+sys.path.append('src')
+from processing.turkish_analyzer import analyze, ANALYZER_VERSION
+
+# Tokenizer değişirse artırılır; farklı sürümle kaydedilmiş indeks yeniden kurulur
+TOKENIZER_VERSION = f"turkish-{ANALYZER_VERSION}"
+
+
+def tokenize(text: str) -> List[str]:
+    """Metni Türkçe indeks terimlerine ayır (küçük harf, aksansız, stopword'süz, gövde)"""
+    return analyze(text)
+
+
+class BM25Index:
+    """Chunk id'leri üzerinde Okapi BM25 ters indeksi
+
+    Her terim için (chunk id -> terim frekansı) posting listesi tutulur. Sorguda
+    yalnızca sorgu terimlerinin posting'leri gezilir; embedding gerektirmediği
+    için anahtar kelime tarzı sorgularda vektör aramasından çok daha ucuzdur.
+    """
+
+    def __init__(self, index_path: Optional[str] = None, k1: float = 1.5, b: float = 0.75):
+        """Başlatma"""
+        self.index_path = Path(index_path) if index_path else None
+        self.k1 = k1
+        self.b = b
+
+        self.postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self.doc_lengths: Dict[str, int] = {}
+        self.doc_terms: Dict[str, Tuple[str, ...]] = {}
+        self.total_length = 0
+        self._lock = threading.RLock()
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def _load(self):
+        """İndeksi diskten yükle"""
+        if self.index_path is None or not self.index_path.exists():
+            return
+
+        try:
+            with open(self.index_path, 'rb') as file:
+                data = pickle.load(file)
+            if data.get('tokenizer_version') != TOKENIZER_VERSION:
+                logger.warning("BM25 indeksi farklı tokenizer sürümüyle oluşturulmuş, yeniden kurulacak")
+                return
+            self.postings = defaultdict(dict, data['postings'])
+            self.doc_lengths = data['doc_lengths']
+            self.doc_terms = data['doc_terms']
+            self.total_length = sum(self.doc_lengths.values())
+        except Exception as e:
+            logger.error(f"BM25 indeksi okunamadı ({self.index_path}): {e}")
+            self.postings, self.doc_lengths, self.doc_terms = defaultdict(dict), {}, {}
+            self.total_length = 0
+
+    def save(self):
+        """İndeksi diske yaz"""
+        if self.index_path is None:
+            return
+
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with self._lock:
+            with open(tmp_path, 'wb') as file:
+                pickle.dump({
+                    'tokenizer_version': TOKENIZER_VERSION,
+                    'postings': dict(self.postings),
+                    'doc_lengths': self.doc_lengths,
+                    'doc_terms': self.doc_terms
+                }, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.index_path)
+
+    def add(self, ids: List[str], texts: List[str]):
+        """Chunk'ları indeksle (aynı id tekrar gelirse eskisinin yerine geçer)"""
+        # Çözümleme kilit dışında yapılır; eş zamanlı aramalar beklemez
+        analyzed = [(chunk_id, Counter(tokenize(text))) for chunk_id, text in zip(ids, texts)]
+        with self._lock:
+            for chunk_id, counts in analyzed:
+                self._remove(chunk_id)
+                for term, frequency in counts.items():
+                    self.postings[term][chunk_id] = frequency
+                length = sum(counts.values())
+                self.doc_lengths[chunk_id] = length
+                self.doc_terms[chunk_id] = tuple(counts)
+                self.total_length += length
+
+    def _remove(self, chunk_id: str):
+        """Chunk'ı posting listelerinden çıkar"""
+        terms = self.doc_terms.pop(chunk_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(chunk_id, None)
+                if not posting:
+                    del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(chunk_id)
+
+    def forget_prefix(self, prefix: str) -> int:
+        """Id'si prefix ile başlayan chunk'ları indeksten çıkar, çıkarılan sayıyı döndür"""
+        with self._lock:
+            removed = [chunk_id for chunk_id in self.doc_lengths if chunk_id.startswith(prefix)]
+            for chunk_id in removed:
+                self._remove(chunk_id)
+        return len(removed)
+
+    def search(self, query: str, n_results: int = 10, allowed_ids: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        """Sorgu için en yüksek BM25 skorlu (chunk id, skor) listesi (allowed_ids verilirse yalnızca onlar)"""
+        terms = set(tokenize(query))
+        with self._lock:
+            doc_count = len(self.doc_lengths)
+            if not terms or not doc_count:
+                return []
+
+            average_length = self.total_length / doc_count
+            scores: Dict[str, float] = defaultdict(float)
+            for term in terms:
+                posting = self.postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1.0 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+                # Dar filtrede yalnızca kesişim gezilir
+                chunk_ids = posting.keys() if allowed_ids is None else allowed_ids & posting.keys()
+                for chunk_id in chunk_ids:
+                    frequency = posting[chunk_id]
+                    norm = self.k1 * (1.0 - self.b + self.b * self.doc_lengths[chunk_id] / average_length)
+                    scores[chunk_id] += idf * frequency * (self.k1 + 1.0) / (frequency + norm)
+
+        return heapq.nlargest(n_results, scores.items(), key=lambda item: item[1])
+
+    def clear(self):
+        """İndeksi sıfırla"""
+        with self._lock:
+            self.postings, self.doc_lengths, self.doc_terms = defaultdict(dict), {}, {}
+            self.total_length = 0
+        self.save()
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Sıralı id listelerini RRF ile birleştir: skor = toplam 1 / (k + sıra)"""
+    scores: Dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, chunk_id in enumerate(ranking, start=1):
+            scores[chunk_id] += 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+# Test fonksiyonu
+def test_bm25_index():
+    """BM25Index test fonksiyonu"""
+    print("🧪 BM25 İndeksi Testi Başlıyor...")
+
+    try:
+        index = BM25Index()
+        index.add(
+            ['a:0', 'a:1', 'b:0'],
+            [
+                "Borçlu, ödeme emrine yedi gün içinde itiraz edebilir.",
+                "İcra dairesi ödeme emrini borçluya tebliğ eder.",
+                "Kiracı, kira bedelini zamanında ödemekle yükümlüdür."
+            ]
+        )
+        results = index.search("ödeme emrine itiraz yedi gün", n_results=3)
+        print(f"🔍 BM25 sonuçları: {results}")
+
+        fused = reciprocal_rank_fusion([['b:0', 'a:0'], [chunk_id for chunk_id, _ in results]])
+        print(f"🔗 RRF: {fused}")
+
+        print(f"🗑️ Çıkarılan: {index.forget_prefix('a:')}, kalan: {len(index)}")
+
+        print("✅ BM25 indeksi testi başarılı!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test hatası: {e}")
+        return False
+
+if __name__ == "__main__":
+    test_bm25_index()
@@ -4,28 +4,90 @@ ChromaDB Yöneticisi - Vektör veritabanı işlemleri
 """
 
 import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import uuid
+import numpy as np
 import chromadb
 from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
-from typing import List, Dict, Any, Optional
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 import yaml
 from loguru import logger
 
+# Local imports
+sys.path.append('src')
+from database.ingest_manifest import IngestManifest
+from database.ingest_pipeline import IngestionPipeline
+from database.chunk_dedup import ChunkDeduplicator
+from database.embedding_cache import EmbeddingCache
+from database.onnx_encoder import embedding_model_id
+from database.model_registry import get_shared, get_embedding_model, get_chroma_client
+from database.embedding_pool import EmbeddingPool
+from database.query_batcher import MicroBatcher
+from database.vector_projection import PCAProjection
+from database.bm25_index import BM25Index, reciprocal_rank_fusion
+from database.article_index import ArticleIndex
+from database.search_filters import build_where, filter_key, to_epoch, TIMESTAMP_FIELD
+from processing.turkish_analyzer import normalize_key
+from processing.citation import parse_citation, format_citation, paragraph_matches
+
+# ChromaDB HNSW mesafe uzayları; cosine ve ip normalize vektör bekler
+DISTANCE_SPACES = ('cosine', 'ip', 'l2')
+
+# Belgede varsa metadata'ya aynen taşınan alanlar (madde bilgisi vb.)
+OPTIONAL_METADATA_KEYS = ('law_title', 'section', 'article_no', 'article_kind', 'paragraph', 'page', 'page_end', 'encoding')
+
+# Aramada filtre olarak kullanılabilen metadata alanları
+FILTERABLE_METADATA_KEYS = ('filename', 'file_type', 'content_hash') + OPTIONAL_METADATA_KEYS
+
 class ChromaManager:
     """ChromaDB vektör veritabanı yöneticisi"""
     
-    def __init__(self, config_path: str = "config/config.yaml"):
+    def __init__(self, config_path: str = "config/config.yaml", use_cache: bool = True):
         """Başlatma"""
         self.config = self._load_config(config_path)
+        self.use_cache = use_cache
         self.embedding_model = None
         self.client = None
         self.collection = None
+        self.manifest = None
+        self.last_ingest_stats = None
+        self.deduplicator = None
+        self.dedup_skipped = 0
+        # İçerik hash'i başına ChromaDB'ye yazılmış (ya da kopya olarak bağlanmış) chunk sayısı
+        self.written_chunks = Counter()
+        self.embedding_cache = None
+        self.embedding_pool = None
+        self.projection = None
+        self.distance_space = 'l2'
+        self.bm25_index = None
+        self.article_index = None
+        
+        # Sorgu embedding'leri için süreç içi LRU önbellek
+        self.query_cache = OrderedDict()
+        self.query_cache_hits = 0
+        self.query_cache_misses = 0
+        self._query_cache_lock = threading.Lock()
+        
+        # Eş zamanlı sorgular için mikro-batcher'lar (ilk aramada başlatılır)
+        self._encode_batcher = None
+        self._search_batcher = None
+        
+        # Hibrit aramada vektör ve BM25 ayakları paralel çalışır; ayak süreleri biriktirilir
+        self._search_executor = None
+        self._search_timing_totals = defaultdict(float)
+        self._search_count = 0
         
         # Başlatma işlemleri
         self._initialize_client()
         self._initialize_embedding_model()
+        self._initialize_embedding_cache()
+        self._initialize_projection()
         
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Konfigürasyon dosyasını yükle"""
@@ -41,16 +103,61 @@ class ChromaManager:
         return {
             'vector_db': {
                 'collection_name': 'hukuk_documents',
-                'persist_directory': './data/chroma_db'
+                'persist_directory': './data/chroma_db',
+                'stream_batch_size': 256,
+                'pipelined_ingestion': True,
+                'pipeline_queue_size': 4,
+                'write_batch_size': 5000,
+                'distance': 'cosine',
+                'projection': {
+                    'enabled': False,
+                    'path': None
+                }
             },
             'embedding': {
                 'model_name': 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2',
-                'chunk_size': 1000,
-                'chunk_overlap': 200
+                'max_tokens': 128,
+                'chunk_overlap_tokens': 32,
+                'max_seq_length': 128,
+                'batch_size': 32,
+                'backend': 'torch',
+                'onnx_quantize': True,
+                'onnx_dir': './data/onnx_models',
+                'bulk_threads_per_worker': 1,
+                'bulk_shard_size': 256
             },
             'retrieval': {
                 'top_k': 5,
-                'similarity_threshold': 0.7
+                'similarity_threshold': 0.35,
+                'query_cache_size': 1024,
+                'micro_batching': {
+                    'enabled': True,
+                    'max_batch_size': 16,
+                    'max_wait_ms': 5
+                },
+                'hybrid': {
+                    'enabled': True,
+                    'candidates': 50,
+                    'rrf_k': 60,
+                    'bm25_k1': 1.5,
+                    'bm25_b': 0.75
+                },
+                'citation_fast_path': {
+                    'enabled': True
+                }
+            },
+            'embedding_cache': {
+                'enabled': True,
+                'directory': './data/embedding_cache',
+                'max_entries': 200000,
+                'dtype': 'float16'
+            },
+            'deduplication': {
+                'enabled': True,
+                'threshold': 0.9,
+                'num_perm': 128,
+                'bands': 16,
+                'shingle_size': 5
             }
         }
     
@@ -62,33 +169,173 @@ class ChromaManager:
             # Dizini oluştur
             os.makedirs(persist_dir, exist_ok=True)
             
-            # Client oluştur
-            self.client = chromadb.PersistentClient(path=persist_dir)
+            # Client oluştur (aynı dizin için süreçte tek client)
+            self.client = get_chroma_client(persist_dir)
             
-            # Koleksiyon oluştur veya getir
+            # Yarım kalmış bir mesafe uzayı taşımasını tamamla
             collection_name = self.config['vector_db']['collection_name']
+            self._recover_migration(collection_name)
+            
+            # Koleksiyon oluştur veya getir (uzay yalnızca oluştururken uygulanır)
             self.collection = self.client.get_or_create_collection(
                 name=collection_name,
-                metadata={"description": "Hukuk belgeleri için vektör veritabanı"}
+                metadata=self._collection_metadata(self._configured_space())
             )
+            self.distance_space = (self.collection.metadata or {}).get('hnsw:space', 'l2')
+            if self.distance_space != self._configured_space():
+                logger.warning(
+                    f"Koleksiyon '{self.distance_space}' uzayında, config '{self._configured_space()}' istiyor "
+                    f"(ingest.py migrate-space ile taşıyın)"
+                )
             
-            logger.info(f"ChromaDB başlatıldı: {collection_name}")
+            logger.info(f"ChromaDB başlatıldı: {collection_name} ({self.distance_space})")
             
         except Exception as e:
             logger.error(f"ChromaDB başlatma hatası: {e}")
             raise
     
+    def _configured_space(self) -> str:
+        """Config'teki mesafe uzayı"""
+        space = self.config['vector_db'].get('distance', 'l2')
+        if space not in DISTANCE_SPACES:
+            logger.warning(f"Bilinmeyen mesafe uzayı: {space}, l2 kullanılacak")
+            return 'l2'
+        return space
+    
+    @staticmethod
+    def _collection_metadata(space: str) -> Dict[str, Any]:
+        """Koleksiyon metadata'sı"""
+        return {"description": "Hukuk belgeleri için vektör veritabanı", "hnsw:space": space}
+    
+    @staticmethod
+    def _migration_name(collection_name: str) -> str:
+        """Taşıma sırasında kullanılan geçici koleksiyon adı"""
+        return f"{collection_name}__migrating"
+    
+    def _recover_migration(self, collection_name: str):
+        """Eski koleksiyon silinip geçici koleksiyon adlandırılmadan kesilen taşımayı tamamla"""
+        names = {getattr(collection, 'name', collection) for collection in self.client.list_collections()}
+        temp_name = self._migration_name(collection_name)
+        if temp_name in names and collection_name not in names:
+            self.client.get_collection(temp_name).modify(name=collection_name)
+            logger.warning(f"Yarım kalan taşıma tamamlandı: {temp_name} -> {collection_name}")
+    
     def _initialize_embedding_model(self):
         """Embedding modelini yükle"""
         try:
             model_name = self.config['embedding']['model_name']
-            self.embedding_model = SentenceTransformer(model_name)
-            logger.info(f"Embedding model yüklendi: {model_name}")
+            # Aynı model süreçte bir kez yüklenir, ChromaManager örnekleri paylaşır
+            self.embedding_model = get_embedding_model(self.config['embedding'])
+            logger.info(f"Embedding model yüklendi: {model_name} ({self.config['embedding'].get('backend', 'torch')})")
             
         except Exception as e:
             logger.error(f"Embedding model hatası: {e}")
             raise
     
+    def _initialize_embedding_cache(self):
+        """Kalıcı embedding önbelleğini aç"""
+        cache_config = self.config.get('embedding_cache', {})
+        if not self.use_cache or not cache_config.get('enabled', False):
+            return
+        
+        try:
+            cache_dir = os.path.abspath(cache_config.get('directory', './data/embedding_cache'))
+            model_id = embedding_model_id(self.config['embedding'], self.embedding_model)
+            # Aynı dosyaları iki örnek ayrı ayrı yazmasın
+            self.embedding_cache = get_shared('embedding_cache', (cache_dir, model_id), lambda: EmbeddingCache(
+                cache_dir,
+                model_id,
+                max_entries=cache_config.get('max_entries', 200000),
+                dtype=cache_config.get('dtype', 'float16')
+            ))
+        except Exception as e:
+            logger.error(f"Embedding önbelleği açılamadı, önbelleksiz devam ediliyor: {e}")
+            self.embedding_cache = None
+    
+    def projection_path(self) -> str:
+        """PCA projeksiyon dosyasının yolu"""
+        projection_config = self.config['vector_db'].get('projection', {}) or {}
+        if projection_config.get('path'):
+            return projection_config['path']
+        persist_dir = self.config['vector_db']['persist_directory']
+        collection_name = self.config['vector_db']['collection_name']
+        return os.path.join(persist_dir, f"{collection_name}_pca.npz")
+    
+    def _initialize_projection(self):
+        """Boyut küçültme projeksiyonunu yükle (açıksa)"""
+        projection_config = self.config['vector_db'].get('projection', {}) or {}
+        if not projection_config.get('enabled', False):
+            return
+        
+        path = self.projection_path()
+        if not os.path.exists(path):
+            logger.warning(f"Projeksiyon açık ama dosya yok: {path} (ingest.py fit-projection ile oluşturun)")
+            return
+        
+        projection = PCAProjection.load(path)
+        model_id = embedding_model_id(self.config['embedding'], self.embedding_model)
+        if projection.model_id and projection.model_id != model_id:
+            logger.error(f"Projeksiyon farklı bir model için eğitilmiş ({projection.model_id}), kullanılmıyor")
+            return
+        
+        self.projection = projection
+        logger.info(f"📉 PCA projeksiyonu: {projection.input_dim} -> {projection.output_dim} boyut")
+    
+    def _index_vectors(self, embeddings: np.ndarray) -> np.ndarray:
+        """Koleksiyona yazılan/sorgulanan vektörleri indeks uzayına taşı (projeksiyon, normalizasyon)
+
+        cosine/ip uzayında PCA normalize edilmiş vektörlerle eğitildiği için giriş
+        projeksiyondan önce, çıkış da projeksiyondan sonra normalize edilir.
+        """
+        normalized = self.distance_space in ('cosine', 'ip')
+        if normalized:
+            embeddings = self._normalize(embeddings)
+        if self.projection is not None:
+            embeddings = self.projection.transform(embeddings)
+            if normalized:
+                embeddings = self._normalize(embeddings)
+        return embeddings
+    
+    @staticmethod
+    def _normalize(embeddings: np.ndarray) -> np.ndarray:
+        """Satırları birim uzunluğa getir"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.clip(norms, 1e-12, None)
+    
+    def _distance_to_similarity(self, distance: float) -> float:
+        """ChromaDB mesafesini 0-1 benzerliğe çevir"""
+        if self.distance_space in ('cosine', 'ip'):
+            # Normalize vektörlerde her iki uzayda da mesafe = 1 - kosinüs benzerliği
+            return max(0.0, 1.0 - distance)
+        # Eski l2 koleksiyonları: squared Euclidean distance'ı 20 ile normalize et
+        return max(0, 1.0 - (distance / 20.0))
+    
+    def sample_embeddings(self, limit: int = 20000) -> np.ndarray:
+        """Koleksiyonda saklanan vektörlerden örnek (rapor ve PCA eğitimi için)
+
+        cosine/ip uzayında normalize edilmiş döner; _index_vectors projeksiyona da bu girdiyi verir.
+        """
+        results = self.collection.get(limit=limit, include=['embeddings'])
+        embeddings = np.asarray(results['embeddings'], dtype=np.float32)
+        if self.distance_space in ('cosine', 'ip') and len(embeddings):
+            embeddings = self._normalize(embeddings)
+        return embeddings
+    
+    def start_embedding_pool(self, workers: int = 0, threads_per_worker: Optional[int] = None):
+        """Toplu yükleme modu: encode işini süreç havuzuna dağıt (workers=0 -> tüm çekirdekler)"""
+        if self.embedding_pool is not None:
+            return
+        if threads_per_worker is None:
+            threads_per_worker = self.config['embedding'].get('bulk_threads_per_worker', 1)
+        self.embedding_pool = EmbeddingPool(self.config['embedding'], workers, threads_per_worker)
+    
+    def stop_embedding_pool(self):
+        """Toplu yükleme modunu kapat"""
+        if self.embedding_pool is not None:
+            self.embedding_pool.close()
+            self.embedding_pool = None
+    
     def add_documents(self, documents: List[Dict[str, Any]]) -> bool:
         """Belgeleri vektör veritabanına ekle"""
         try:
@@ -97,48 +344,14 @@ class ChromaManager:
                 return False
             
             # Belge verilerini hazırla
-            texts = []
-            metadatas = []
-            ids = []
-            
-            for doc in documents:
-                # UUID oluştur
-                doc_id = str(uuid.uuid4())
-                
-                # Metin içeriği
-                content = doc.get('content', '')
-                if not content:
-                    continue
-                
-                # Metadata hazırla
-                metadata = {
-                    'filename': doc.get('filename', 'unknown'),
-                    'file_type': doc.get('file_type', 'txt'),
-                    'chunk_index': doc.get('chunk_index', 0),
-                    'total_chunks': doc.get('total_chunks', 1),
-                    'timestamp': doc.get('timestamp', ''),
-                    'file_size': doc.get('file_size', 0)
-                }
-                
-                texts.append(content)
-                metadatas.append(metadata)
-                ids.append(doc_id)
+            texts, metadatas, ids = self._prepare_records(documents)
             
             if not texts:
                 logger.warning("İşlenebilir metin yok")
                 return False
             
-            # Embeddingleri oluştur
-            logger.info(f"Embedding oluşturuluyor: {len(texts)} chunk")
-            embeddings = self.embedding_model.encode(texts)
-            
-            # ChromaDB'ye ekle
-            self.collection.add(
-                documents=texts,
-                metadatas=metadatas,
-                ids=ids,
-                embeddings=embeddings.tolist()
-            )
+            self._write_batch(texts, metadatas, ids)
+            self._save_ingest_state()
             
             logger.success(f"✅ {len(texts)} belge eklendi")
             return True
@@ -147,57 +360,912 @@ class ChromaManager:
             logger.error(f"Belge ekleme hatası: {e}")
             return False
     
-    def search(self, query: str, n_results: int = None) -> List[Dict[str, Any]]:
-        """Semantic arama yap"""
+    def add_documents_stream(self, documents: Iterable[Dict[str, Any]], batch_size: Optional[int] = None) -> int:
+        """Belge akışını sınırlı boyutlu batch'ler halinde ekle, eklenen chunk sayısını döndür"""
+        if batch_size is None:
+            batch_size = self.config['vector_db'].get('stream_batch_size', 256)
+        
+        # Aşamalı pipeline: çıkarma, embedding ve yazma eş zamanlı ilerler
+        if self.config['vector_db'].get('pipelined_ingestion', False):
+            pipeline = IngestionPipeline(
+                self,
+                batch_size=batch_size,
+                queue_size=self.config['vector_db'].get('pipeline_queue_size', 4)
+            )
+            skipped_before = self.dedup_skipped
+            try:
+                self.last_ingest_stats = pipeline.run(documents)
+            except Exception:
+                self.last_ingest_stats = pipeline.report
+                self._discard_pending_state()
+                raise
+            finally:
+                self.last_ingest_stats['skipped_duplicates'] = self.dedup_skipped - skipped_before
+                self._save_ingest_state()
+            if self.last_ingest_stats['skipped_duplicates']:
+                logger.info(f"🔗 {self.last_ingest_stats['skipped_duplicates']} kopya chunk atlandı")
+            return self.last_ingest_stats['written']
+        
+        added = 0
+        batch = []
+        skipped_before = self.dedup_skipped
         try:
-            if n_results is None:
-                n_results = self.config['retrieval']['top_k']
+            for doc in documents:
+                batch.append(doc)
+                if len(batch) >= batch_size:
+                    added += self._add_stream_batch(batch)
+                    batch = []
             
-            # Query embeddingini oluştur
-            query_embedding = self.embedding_model.encode([query])
+            if batch:
+                added += self._add_stream_batch(batch)
             
-            # Arama yap
-            results = self.collection.query(
-                query_embeddings=query_embedding.tolist(),
-                n_results=n_results,
-                include=['documents', 'metadatas', 'distances']
+            logger.success(f"✅ Akıştan {added} belge eklendi, {self.dedup_skipped - skipped_before} kopya chunk atlandı")
+            
+        except Exception as e:
+            logger.error(f"Akış ekleme hatası: {e}")
+            self._discard_pending_state()
+            raise
+        
+        finally:
+            self._save_ingest_state()
+        return added
+    
+    def _add_stream_batch(self, batch: List[Dict[str, Any]]) -> int:
+        """Akıştaki tek bir batch'i ekle"""
+        texts, metadatas, ids = self._prepare_records(batch)
+        if texts:
+            self._write_batch(texts, metadatas, ids)
+            logger.info(f"📥 Batch eklendi: {len(texts)} chunk")
+        return len(texts)
+    
+    def _prepare_records(self, documents: Iterable[Dict[str, Any]]) -> Tuple[List[str], List[Dict[str, Any]], List[str]]:
+        """Belgelerden metin, metadata ve id listelerini hazırla"""
+        texts = []
+        metadatas = []
+        ids = []
+        
+        for doc in documents:
+            # UUID oluştur
+            doc_id = str(uuid.uuid4())
+            
+            # Metin içeriği
+            content = doc.get('content', '')
+            if not content:
+                continue
+            
+            # İçerik hash'i varsa deterministik id kullan (tekrar eklemede kopya oluşmaz)
+            content_hash = doc.get('content_hash')
+            if content_hash:
+                doc_id = self._chunk_id(content_hash, doc.get('chunk_index', 0))
+            
+            # Metadata hazırla
+            metadata = {
+                'filename': doc.get('filename', 'unknown'),
+                'file_type': doc.get('file_type', 'txt'),
+                'chunk_index': doc.get('chunk_index', 0),
+                'timestamp': doc.get('timestamp', ''),
+                'file_size': doc.get('file_size', 0)
+            }
+            if content_hash:
+                metadata['content_hash'] = content_hash
+            # Akış halinde chunk'lanan dosyalarda toplam chunk sayısı önceden bilinmez
+            if 'total_chunks' in doc:
+                metadata['total_chunks'] = doc['total_chunks']
+            # Tarih aralığı filtreleri için sayısal zaman (ISO metin aralıkla karşılaştırılamaz)
+            timestamp_epoch = to_epoch(metadata['timestamp'])
+            if timestamp_epoch is not None:
+                metadata[TIMESTAMP_FIELD] = timestamp_epoch
+            for key in OPTIONAL_METADATA_KEYS:
+                if doc.get(key) is not None:
+                    metadata[key] = doc[key]
+            
+            texts.append(content)
+            metadatas.append(metadata)
+            ids.append(doc_id)
+        
+        # Neredeyse aynı chunk'lar embedding'e girmesin
+        deduplicator = self._get_deduplicator()
+        if deduplicator is not None and texts:
+            texts, metadatas, ids, skipped = deduplicator.filter(texts, metadatas, ids)
+            self.dedup_skipped += skipped
+            # Kanoniği zaten yazılmış kopyalar hemen bağlanır; diğerleri kanonik yazılınca
+            self._count_linked_duplicates(deduplicator.commit())
+        
+        return texts, metadatas, ids
+    
+    def _write_batch(self, texts: List[str], metadatas: List[Dict[str, Any]], ids: List[str]):
+        """Embedding oluştur ve ChromaDB'ye yaz"""
+        embeddings = self.encode_texts(texts)
+        self._write_records(texts, metadatas, ids, embeddings)
+    
+    def encode_texts(self, texts: List[str]) -> np.ndarray:
+        """Metinlerin embeddinglerini oluştur (önbellekte olanlar yeniden hesaplanmaz)"""
+        if self.embedding_cache is None:
+            logger.info(f"Embedding oluşturuluyor: {len(texts)} chunk")
+            return self._encode_batched(texts)
+        
+        cached = self.embedding_cache.get_many(texts)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+        logger.info(f"Embedding oluşturuluyor: {len(missing)} chunk ({len(texts) - len(missing)} önbellekten)")
+        
+        if missing:
+            encoded = self._encode_batched([texts[i] for i in missing])
+            self.embedding_cache.put_many([texts[i] for i in missing], encoded)
+            for i, vector in zip(missing, encoded):
+                cached[i] = vector
+        
+        return np.vstack(cached)
+    
+    def _token_lengths(self, texts: List[str]) -> List[int]:
+        """Metinlerin model tokenizer'ına göre uzunlukları (tokenizer yoksa karakter sayısı)"""
+        tokenizer = getattr(self.embedding_model, 'tokenizer', None)
+        if tokenizer is not None:
+            try:
+                max_length = self.config['embedding'].get('max_seq_length', 128)
+                encoded = tokenizer(texts, add_special_tokens=True, truncation=True, max_length=max_length)
+                return [len(ids) for ids in encoded['input_ids']]
+            except Exception as e:
+                logger.debug(f"Token uzunlukları hesaplanamadı, karakter sayısı kullanılacak: {e}")
+        return [len(text) for text in texts]
+    
+    def _encode_batched(self, texts: List[str]) -> np.ndarray:
+        """Metinleri uzunluğa göre sıralı batch'lerle encode et, orijinal sırayla döndür
+        
+        Benzer uzunluktaki metinler aynı batch'e düştüğü için padding azalır; sonuçlar
+        önceden ayrılmış tek bir float32 dizisine yazılır.
+        """
+        batch_size = self.config['embedding'].get('batch_size', 32)
+        lengths = self._token_lengths(texts)
+        # Uzundan kısaya: bellek sınırı varsa ilk batch'te ortaya çıkar
+        order = sorted(range(len(texts)), key=lambda i: lengths[i], reverse=True)
+        
+        if self.embedding_pool is not None and len(texts) > batch_size:
+            return self._encode_with_pool(texts, order, batch_size)
+        
+        total_batches = (len(texts) + batch_size - 1) // batch_size
+        progress_every = max(1, total_batches // 10)
+        embeddings = None
+        padded_tokens = 0
+        
+        for batch_num, start in enumerate(range(0, len(order), batch_size), 1):
+            indices = order[start:start + batch_size]
+            vectors = self.embedding_model.encode(
+                [texts[i] for i in indices],
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            )
+            if embeddings is None:
+                embeddings = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            embeddings[indices] = vectors
+            padded_tokens += len(indices) * lengths[indices[0]]
+            
+            if total_batches > 1 and (batch_num % progress_every == 0 or batch_num == total_batches):
+                logger.info(f"🧮 Embedding: {batch_num}/{total_batches} batch ({min(start + batch_size, len(texts))}/{len(texts)} chunk)")
+        
+        if embeddings is None:
+            return np.empty((0, 0), dtype=np.float32)
+        
+        if padded_tokens:
+            logger.debug(f"Padding verimliliği: {sum(lengths) / padded_tokens:.1%}")
+        return embeddings
+    
+    def _encode_with_pool(self, texts: List[str], order: List[int], batch_size: int) -> np.ndarray:
+        """Uzunluğa göre sıralı metinleri ardışık parçalar halinde süreç havuzuna dağıt"""
+        shard_size = max(batch_size, self.config['embedding'].get('bulk_shard_size', 256))
+        shard_indices = [order[start:start + shard_size] for start in range(0, len(order), shard_size)]
+        shards = [[texts[i] for i in indices] for indices in shard_indices]
+        
+        logger.info(f"🧮 Embedding: {len(texts)} chunk, {len(shards)} parça, {self.embedding_pool.workers} süreç")
+        results = self.embedding_pool.encode_shards(shards, batch_size)
+        
+        embeddings = np.empty((len(texts), results[0].shape[1]), dtype=np.float32)
+        for indices, vectors in zip(shard_indices, results):
+            embeddings[indices] = vectors
+        return embeddings
+    
+    def _write_records(self, texts: List[str], metadatas: List[Dict[str, Any]], ids: List[str], embeddings):
+        """Embedding'i hazır kayıtları ChromaDB'ye istemcinin batch sınırını aşmadan yaz"""
+        write_batch_size = self.config['vector_db'].get('write_batch_size', 5000)
+        client_limit = getattr(self.client, 'max_batch_size', None)
+        if client_limit:
+            write_batch_size = min(write_batch_size, client_limit)
+        
+        # Koleksiyona indeks uzayındaki vektör yazılır (projeksiyon, normalizasyon)
+        embeddings = self._index_vectors(embeddings)
+        deduplicator = self._get_deduplicator()
+        bm25_index = self._get_bm25_index()
+        article_index = self._get_article_index()
+        
+        # Türetilmiş indekslere yalnızca gerçekten yazılan kayıtlar girer
+        total = len(ids)
+        for start in range(0, total, write_batch_size):
+            end = min(start + write_batch_size, total)
+            # ChromaDB'ye ekle (deterministik id'ler için upsert)
+            self.collection.upsert(
+                documents=texts[start:end],
+                metadatas=metadatas[start:end],
+                ids=ids[start:end],
+                embeddings=embeddings[start:end].tolist()
+            )
+            self.written_chunks.update(
+                metadata['content_hash'] for metadata in metadatas[start:end] if metadata.get('content_hash')
+            )
+            if deduplicator is not None:
+                self._count_linked_duplicates(deduplicator.commit(ids[start:end]))
+            if bm25_index is not None:
+                bm25_index.add(ids[start:end], texts[start:end])
+            if article_index is not None:
+                article_index.add(ids[start:end], metadatas[start:end])
+            if total > write_batch_size:
+                logger.info(f"💾 ChromaDB yazımı: {end}/{total} chunk")
+    
+    def _count_linked_duplicates(self, duplicate_ids: List[str]):
+        """Kanonik chunk'a bağlanan kopyaları dosyaları için işlenmiş say"""
+        self.written_chunks.update(chunk_id.split(':', 1)[0] for chunk_id in duplicate_ids if ':' in chunk_id)
+    
+    def _discard_pending_state(self):
+        """Yazılamayan batch'lerin bekleyen tekilleştirme imzalarını geri al"""
+        if self.deduplicator is not None:
+            discarded = self.deduplicator.discard_pending()
+            if discarded:
+                logger.warning(f"⚠️ Yazılamayan {discarded} chunk tekilleştirme indeksine alınmadı")
+    
+    @staticmethod
+    def _chunk_id(content_hash: str, chunk_index: int) -> str:
+        """İçerik hash'i ve chunk sırasından kararlı chunk id'si"""
+        return f"{content_hash}:{chunk_index}"
+    
+    def _get_manifest(self) -> IngestManifest:
+        """Koleksiyona ait ingest manifest'i"""
+        if self.manifest is None:
+            persist_dir = self.config['vector_db']['persist_directory']
+            collection_name = self.config['vector_db']['collection_name']
+            manifest_path = os.path.abspath(os.path.join(persist_dir, f"{collection_name}_manifest.json"))
+            self.manifest = get_shared('manifest', manifest_path, lambda: IngestManifest(manifest_path))
+        return self.manifest
+    
+    def _get_deduplicator(self) -> Optional[ChunkDeduplicator]:
+        """Koleksiyona ait tekilleştirme indeksi (kapalıysa None)"""
+        dedup_config = self.config.get('deduplication', {})
+        if not dedup_config.get('enabled', False):
+            return None
+        
+        if self.deduplicator is None:
+            persist_dir = self.config['vector_db']['persist_directory']
+            collection_name = self.config['vector_db']['collection_name']
+            dedup_path = os.path.abspath(os.path.join(persist_dir, f"{collection_name}_dedup.pkl"))
+            self.deduplicator = get_shared('deduplicator', dedup_path, lambda: ChunkDeduplicator(
+                dedup_path,
+                threshold=dedup_config.get('threshold', 0.9),
+                num_perm=dedup_config.get('num_perm', 128),
+                bands=dedup_config.get('bands', 16),
+                shingle_size=dedup_config.get('shingle_size', 5)
+            ))
+        return self.deduplicator
+    
+    def _get_bm25_index(self) -> Optional[BM25Index]:
+        """Koleksiyona ait BM25 indeksi (hibrit arama kapalıysa None)
+        
+        İndeks yoksa ya da tokenizer sürümü değiştiyse koleksiyondaki metinlerden kurulur.
+        """
+        hybrid_config = self.config['retrieval'].get('hybrid', {})
+        if not hybrid_config.get('enabled', False):
+            return None
+        
+        if self.bm25_index is None:
+            persist_dir = self.config['vector_db']['persist_directory']
+            collection_name = self.config['vector_db']['collection_name']
+            index_path = os.path.abspath(os.path.join(persist_dir, f"{collection_name}_bm25.pkl"))
+            bm25_index = get_shared('bm25_index', index_path, lambda: BM25Index(
+                index_path,
+                k1=hybrid_config.get('bm25_k1', 1.5),
+                b=hybrid_config.get('bm25_b', 0.75)
+            ))
+            if not len(bm25_index) and self.collection.count():
+                self.rebuild_bm25_index(bm25_index)
+            self.bm25_index = bm25_index
+        return self.bm25_index
+    
+    def rebuild_bm25_index(self, bm25_index: Optional[BM25Index] = None, batch_size: int = 1000) -> int:
+        """BM25 indeksini koleksiyondaki chunk metinlerinden yeniden kur, indekslenen sayıyı döndür"""
+        if bm25_index is None:
+            bm25_index = self._get_bm25_index()
+        if bm25_index is None:
+            return 0
+        
+        bm25_index.clear()
+        total = self.collection.count()
+        indexed = 0
+        while indexed < total:
+            page = self.collection.get(limit=batch_size, offset=indexed, include=['documents'])
+            if not page['ids']:
+                break
+            bm25_index.add(page['ids'], page['documents'])
+            indexed += len(page['ids'])
+        bm25_index.save()
+        logger.info(f"📇 BM25 indeksi kuruldu: {indexed} chunk")
+        return indexed
+    
+    def _get_article_index(self) -> Optional[ArticleIndex]:
+        """Koleksiyona ait madde indeksi (atıf kısayolu kapalıysa None)"""
+        citation_config = self.config['retrieval'].get('citation_fast_path', {})
+        if not citation_config.get('enabled', False):
+            return None
+        
+        if self.article_index is None:
+            persist_dir = self.config['vector_db']['persist_directory']
+            collection_name = self.config['vector_db']['collection_name']
+            index_path = os.path.abspath(os.path.join(persist_dir, f"{collection_name}_articles.pkl"))
+            article_index = get_shared('article_index', index_path, lambda: ArticleIndex(index_path))
+            if article_index.needs_rebuild and self.collection.count():
+                self.rebuild_article_index(article_index)
+            self.article_index = article_index
+        return self.article_index
+    
+    def rebuild_article_index(self, article_index: Optional[ArticleIndex] = None, batch_size: int = 1000) -> int:
+        """Madde indeksini koleksiyondaki chunk metadata'larından yeniden kur, madde sayısını döndür"""
+        if article_index is None:
+            article_index = self._get_article_index()
+        if article_index is None:
+            return 0
+        
+        article_index.clear()
+        total = self.collection.count()
+        scanned = 0
+        while scanned < total:
+            page = self.collection.get(limit=batch_size, offset=scanned, include=['metadatas'])
+            if not page['ids']:
+                break
+            article_index.add(page['ids'], page['metadatas'])
+            scanned += len(page['ids'])
+        article_index.save()
+        logger.info(f"📑 Madde indeksi kuruldu: {len(article_index)} madde ({scanned} chunk tarandı)")
+        return len(article_index)
+    
+    def lookup_citation(self, query: str) -> Optional[Dict[str, Any]]:
+        """Sorgu yalnızca bir madde atıfıysa ("TCK madde 81", "İİK 3. madde ne diyor") maddenin chunk'ları
+        
+        Embedding ve vektör araması yapılmaz; atıf yoksa, soru atıftan fazlasını
+        içeriyorsa ya da madde indekste yoksa None döner. Madde birden fazla
+        dosyada (ör. değişiklik öncesi ve sonrası metin) varsa chunk'lar karışmasın
+        diye yalnızca en son eklenen dosyanın chunk'ları döner.
+        """
+        article_index = self._get_article_index()
+        if article_index is None:
+            return None
+        
+        citation = parse_citation(query)
+        if citation is None or not citation['lookup_only']:
+            return None
+        
+        chunk_ids = article_index.lookup(citation['law'], citation['article_no'], citation['article_kind'])
+        if not chunk_ids:
+            return None
+        
+        stored = self.collection.get(ids=chunk_ids, include=['documents', 'metadatas'])
+        records = {
+            chunk_id: (document, metadata)
+            for chunk_id, document, metadata in zip(stored['ids'], stored['documents'], stored['metadatas'])
+        }
+        sources = {}
+        for chunk_id in chunk_ids:
+            if chunk_id not in records:
+                continue
+            document, metadata = records[chunk_id]
+            source = metadata.get('content_hash') or metadata.get('filename', '')
+            sources.setdefault(source, []).append(
+                {'id': chunk_id, 'content': document, 'metadata': metadata, 'similarity': 1.0}
             )
+        if not sources:
+            return None
+        
+        # En yeni kaynak (eşitlikte içerik hash'i) - her çağrıda aynı seçim
+        source = max(sources, key=lambda key: (sources[key][0]['metadata'].get(TIMESTAMP_FIELD, 0), key))
+        chunks = sources[source]
+        if len(sources) > 1:
+            logger.info(f"📑 Madde {len(sources)} kaynakta var, en yenisi kullanılıyor: "
+                        f"{chunks[0]['metadata'].get('filename')}")
+        if citation['paragraph']:
+            # Fıkralarına bölünmüş maddede yalnızca istenen fıkra; bulunamazsa maddenin tamamı
+            selected = [chunk for chunk in chunks
+                        if paragraph_matches(chunk['metadata'].get('paragraph'), citation['paragraph'])]
+            chunks = selected or chunks
+        if not chunks:
+            return None
+        
+        logger.info(f"📑 Atıf kısayolu: {format_citation(citation)} ({len(chunks)} chunk)")
+        return {'citation': citation, 'label': format_citation(citation), 'chunks': chunks}
+    
+    def _save_ingest_state(self):
+        """Tekilleştirme, BM25 ve madde indekslerini ve embedding önbelleğini kaydet"""
+        if self.deduplicator is not None:
+            self.deduplicator.save()
+        if self.bm25_index is not None:
+            self.bm25_index.save()
+        if self.article_index is not None:
+            self.article_index.save()
+        if self.embedding_cache is not None:
+            self.embedding_cache.save()
+    
+    def sync_directory(self, directory_path: str, processor, max_workers: Optional[int] = None) -> Dict[str, int]:
+        """Dizini veritabanı ile artımlı senkronize et
+        
+        Değişmeyen dosyalar atlanır, değişen dosyaların eski chunk'ları yenileriyle
+        değiştirilir, silinen dosyaların chunk'ları temizlenir. Yazma hatası,
+        tamamlanan dosyalar manifest'e kaydedildikten sonra yükseltilir.
+        """
+        stats = {'unchanged': 0, 'added': 0, 'updated': 0, 'deleted': 0, 'failed': 0, 'chunks': 0,
+                 'skipped_duplicates': 0}
+        write_error = None
+        
+        try:
+            directory = Path(directory_path)
+            if not directory.exists():
+                logger.error(f"Dizin bulunamadı: {directory}")
+                return stats
+            
+            manifest = self._get_manifest()
+            file_paths = {str(file_path.resolve()): file_path for file_path in processor.list_files(directory)}
+            changed_files = []
+            
+            # Silinen dosyaları temizle
+            for key in manifest.paths_under(str(directory)):
+                if key not in file_paths:
+                    self._purge_file(key)
+                    stats['deleted'] += 1
+            
+            # Değişen dosyaların eski chunk'larını hash ile bulup temizle
+            updated_keys = set()
+            for key, file_path in file_paths.items():
+                entry = manifest.get(key)
+                if entry and entry['content_hash'] != processor.file_hash(file_path):
+                    self._purge_file(key)
+                    updated_keys.add(key)
             
-            # Sonuçları formatla
-            formatted_results = []
-            for i in range(len(results['ids'][0])):
-                distance = results['distances'][0][i]
-                # ChromaDB distance'ı daha iyi similarity'ye çevir
-                # Squared Euclidean distance'ı normalize et
-                similarity = max(0, 1.0 - (distance / 20.0))  # 20 ile normalize et
+            # Temizlik sonrası kaydı kalmayan dosyalar yeniden işlenir
+            # (kanonik chunk'ı silinen kopyaların sahipleri de buraya düşer)
+            for key, file_path in file_paths.items():
+                if manifest.get(key):
+                    stats['unchanged'] += 1
+                    continue
                 
-                result = {
-                    'id': results['ids'][0][i],
-                    'content': results['documents'][0][i],
-                    'metadata': results['metadatas'][0][i],
-                    'distance': distance,
-                    'similarity': similarity
-                }
-                formatted_results.append(result)
+                if key in updated_keys:
+                    stats['updated'] += 1
+                else:
+                    stats['added'] += 1
+                changed_files.append(file_path)
+            
+            # Değişen dosyaları işle ve akış halinde ekle
+            file_chunks = {}
+            expected_chunks = Counter()
             
-            logger.info(f"🔍 Arama tamamlandı: {len(formatted_results)} sonuç")
-            return formatted_results
+            def track(documents):
+                for doc in documents:
+                    key = str(Path(doc['file_path']).resolve())
+                    chunk_count = file_chunks[key][1] + 1 if key in file_chunks else 1
+                    file_chunks[key] = (doc['content_hash'], chunk_count, doc.get('file_size', 0))
+                    if doc.get('content'):
+                        expected_chunks[doc['content_hash']] += 1
+                    yield doc
+            
+            skipped_before = self.dedup_skipped
+            self.written_chunks.clear()
+            failed_files = set()
+            if changed_files:
+                try:
+                    stats['chunks'] = self.add_documents_stream(
+                        track(processor.iter_files(changed_files, max_workers, failed_files=failed_files))
+                    )
+                except Exception as e:
+                    write_error = e
+            
+            # Manifest'e yalnızca tamamı okunmuş ve tüm chunk'ları yazılmış dosyalar girer;
+            # yarım kalanlar sonraki senkronizasyonda tekrar denenir
+            completed = 0
+            for key, (content_hash, chunk_count, file_size) in file_chunks.items():
+                if key in failed_files:
+                    continue
+                if self.written_chunks[content_hash] >= expected_chunks[content_hash]:
+                    manifest.update(key, content_hash, chunk_count, file_size)
+                    completed += 1
+            stats['failed'] = len(changed_files) - completed
+            stats['skipped_duplicates'] = self.dedup_skipped - skipped_before
+            
+            manifest.save()
+            self._save_ingest_state()
+            if write_error is not None:
+                logger.error(f"❌ Senkronizasyon yarım kaldı, {stats['failed']} dosya kaydedilmedi: {write_error}")
+                raise write_error
+            logger.success(f"✅ Senkronizasyon tamamlandı: {stats}")
+            
+        except Exception as e:
+            if write_error is not None:
+                raise
+            logger.error(f"Senkronizasyon hatası: {e}")
+        
+        return stats
+    
+    def _purge_file(self, file_key: str):
+        """Dosyanın chunk'larını ve manifest kaydını sil
+
+        Manifest ve türetilmiş indeksler burada kaydedilmez; sync_directory
+        senkronizasyon sonunda hepsini bir kez kaydeder.
+        """
+        manifest = self._get_manifest()
+        entry = manifest.remove(file_key)
+        if not entry:
+            return
+        
+        # Aynı içerik başka bir yolda da kayıtlıysa chunk'lar paylaşılıyordur
+        if manifest.hash_in_use(entry['content_hash']):
+            return
+        
+        self.collection.delete(where={'content_hash': entry['content_hash']})
+        bm25_index = self._get_bm25_index()
+        if bm25_index is not None:
+            bm25_index.forget_prefix(self._chunk_id(entry['content_hash'], ''))
+        article_index = self._get_article_index()
+        if article_index is not None:
+            article_index.forget_prefix(self._chunk_id(entry['content_hash'], ''))
+        logger.info(f"🗑️ Eski chunk'lar silindi: {Path(file_key).name}")
+        
+        # Silinen chunk'lara bağlı kopyalar artık temsil edilmiyor; sahibi dosyalar yeniden işlensin
+        deduplicator = self._get_deduplicator()
+        if deduplicator is None:
+            return
+        orphaned = deduplicator.forget_prefix(self._chunk_id(entry['content_hash'], ''))
+        for content_hash in {chunk_id.split(':', 1)[0] for chunk_id in orphaned}:
+            for path in manifest.paths_with_hash(content_hash):
+                manifest.remove(path)
+                logger.info(f"🔁 Kopya chunk'ları yeniden eklenecek: {Path(path).name}")
+    
+    def search(self, query: str, n_results: int = None,
+               filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Semantic arama yap (hibrit açıksa BM25 ile birleştirilmiş)"""
+        results, _ = self.search_with_timings(query, n_results, filters)
+        return results
+    
+    def search_with_timings(self, query: str, n_results: int = None,
+                            filters: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+        """Arama sonuçları ve ayak başına süreler (ms)
+        
+        Hibrit açıksa BM25 ayağı havuzda, vektör ayağı çağıran thread'de paralel
+        çalışır; sıralamalar reciprocal rank fusion ile birleştirilir. filters (filename, file_type,
+        timestamp_from/to, madde alanları, contains) ChromaDB'de where /
+        where_document olarak uygulanır; geçersiz filtre ValueError verir.
+        """
+        where, where_document = build_where(filters, FILTERABLE_METADATA_KEYS)
+        timings = {}
+        try:
+            if n_results is None:
+                n_results = self.config['retrieval']['top_k']
+            
+            start_time = time.perf_counter()
+            hybrid_config = self.config['retrieval'].get('hybrid', {})
+            bm25_index = self._get_bm25_index()
+            
+            if bm25_index is None:
+                _, formatted_results = self._vector_leg(query, n_results, where, where_document)
+                timings['vector_ms'] = (time.perf_counter() - start_time) * 1000
+            else:
+                depth = max(n_results, hybrid_config.get('candidates', 50))
+                # BM25 ayağı havuzda, vektör ayağı çağıran thread'de: eş zamanlı aramaların
+                # vektör ayakları havuz boyutuyla sınırlanmadan mikro-batcher'da birleşir
+                lexical_future = self._get_search_executor().submit(
+                    self._timed, self._lexical_leg, bm25_index, query, depth, where, where_document
+                )
+                (query_vector, vector_hits), timings['vector_ms'] = self._timed(
+                    self._vector_leg, query, depth, where, where_document
+                )
+                lexical_hits, timings['bm25_ms'] = lexical_future.result()
+                
+                fusion_start = time.perf_counter()
+                formatted_results = self._fuse_results(
+                    query_vector, vector_hits, lexical_hits, n_results, hybrid_config.get('rrf_k', 60)
+                )
+                timings['fusion_ms'] = (time.perf_counter() - fusion_start) * 1000
+            
+            timings['total_ms'] = (time.perf_counter() - start_time) * 1000
+            self._record_timings(timings)
+            
+            logger.info(f"🔍 Arama tamamlandı: {len(formatted_results)} sonuç "
+                        f"({', '.join(f'{leg} {value:.1f}' for leg, value in timings.items())})")
+            return formatted_results, timings
             
         except Exception as e:
             logger.error(f"Arama hatası: {e}")
+            return [], timings
+    
+    @staticmethod
+    def _timed(function, *args):
+        """Fonksiyonu çalıştır, (sonuç, süre ms) döndür"""
+        start_time = time.perf_counter()
+        result = function(*args)
+        return result, (time.perf_counter() - start_time) * 1000
+    
+    def _get_search_executor(self) -> ThreadPoolExecutor:
+        """Hibrit aramanın BM25 ayakları için thread havuzu
+        
+        Mikro-batching açıksa havuz en az bir batch kadar eş zamanlı aramayı taşır.
+        """
+        with self._query_cache_lock:
+            if self._search_executor is None:
+                batching_config = self.config['retrieval'].get('micro_batching', {})
+                workers = 8
+                if batching_config.get('enabled', False):
+                    workers = max(workers, batching_config.get('max_batch_size', 16))
+                self._search_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hybrid-search")
+        return self._search_executor
+    
+    def _record_timings(self, timings: Dict[str, float]):
+        """Ayak sürelerini istatistiklere ekle"""
+        with self._query_cache_lock:
+            self._search_count += 1
+            for leg, value in timings.items():
+                self._search_timing_totals[leg] += value
+    
+    def _vector_leg(self, query: str, n_results: int, where: Optional[Dict[str, Any]] = None,
+                    where_document: Optional[Dict[str, Any]] = None) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """Vektör araması: (indeks uzayındaki sorgu vektörü, formatlanmış sonuçlar)"""
+        # Query embeddingini oluştur (önbellekte yoksa)
+        query_embedding = self._encode_query(query)
+        
+        # Arama yap (sorgu da koleksiyonla aynı indeks uzayına taşınır)
+        query_vector = self._index_vectors(query_embedding[None, :])[0]
+        results = self._query_collection(query_vector, n_results, where, where_document)
+        
+        # Sonuçları formatla
+        formatted_results = []
+        for i in range(len(results['ids'][0])):
+            distance = results['distances'][0][i]
+            similarity = self._distance_to_similarity(distance)
+            
+            result = {
+                'id': results['ids'][0][i],
+                'content': results['documents'][0][i],
+                'metadata': results['metadatas'][0][i],
+                'distance': distance,
+                'similarity': similarity
+            }
+            formatted_results.append(result)
+        
+        return query_vector, formatted_results
+    
+    def _lexical_leg(self, bm25_index: BM25Index, query: str, n_results: int, where: Optional[Dict[str, Any]] = None,
+                     where_document: Optional[Dict[str, Any]] = None) -> List[Tuple[str, float]]:
+        """BM25 araması; filtre varsa yalnızca filtreye uyan chunk'lar skorlanır"""
+        if where is None and where_document is None:
+            return bm25_index.search(query, n_results)
+        
+        # Filtreye uyan id'ler ChromaDB'nin metadata indeksinden gelir (embedding okunmaz)
+        allowed = self.collection.get(where=where, where_document=where_document, include=[])
+        if not allowed['ids']:
             return []
+        return bm25_index.search(query, n_results, allowed_ids=set(allowed['ids']))
+    
+    def _fuse_results(self, query_vector: np.ndarray, vector_hits: List[Dict[str, Any]],
+                      lexical_hits: List[Tuple[str, float]], n_results: int, rrf_k: int) -> List[Dict[str, Any]]:
+        """İki ayağın sıralamalarını RRF ile birleştir
+        
+        Yalnızca BM25'in bulduğu chunk'ların metni ve benzerliği koleksiyondaki
+        saklı vektörden tamamlanır; benzerlik her sonuçta aynı ölçekte kalır.
+        """
+        vector_ranks = {hit['id']: rank for rank, hit in enumerate(vector_hits, start=1)}
+        lexical_ranks = {chunk_id: rank for rank, (chunk_id, _) in enumerate(lexical_hits, start=1)}
+        lexical_scores = dict(lexical_hits)
+        fused = reciprocal_rank_fusion([list(vector_ranks), list(lexical_ranks)], k=rrf_k)[:n_results]
+        
+        hits = {hit['id']: hit for hit in vector_hits}
+        missing = [chunk_id for chunk_id, _ in fused if chunk_id not in hits]
+        if missing:
+            stored = self.collection.get(ids=missing, include=['documents', 'metadatas', 'embeddings'])
+            for chunk_id, document, metadata, embedding in zip(
+                stored['ids'], stored['documents'], stored['metadatas'], stored['embeddings']
+            ):
+                distance = self._vector_distance(query_vector, np.asarray(embedding, dtype=np.float32))
+                hits[chunk_id] = {
+                    'id': chunk_id,
+                    'content': document,
+                    'metadata': metadata,
+                    'distance': distance,
+                    'similarity': self._distance_to_similarity(distance)
+                }
+        
+        formatted_results = []
+        for chunk_id, score in fused:
+            # BM25 indeksinde kalmış ama koleksiyondan silinmiş chunk'lar atlanır
+            if chunk_id not in hits:
+                continue
+            result = dict(hits[chunk_id])
+            result['rrf_score'] = score
+            result['vector_rank'] = vector_ranks.get(chunk_id)
+            result['bm25_rank'] = lexical_ranks.get(chunk_id)
+            result['bm25_score'] = lexical_scores.get(chunk_id)
+            formatted_results.append(result)
+        return formatted_results
+    
+    def _vector_distance(self, query_vector: np.ndarray, embedding: np.ndarray) -> float:
+        """Koleksiyonun mesafe uzayında sorgu ile saklı vektör arasındaki mesafe"""
+        if self.distance_space == 'cosine':
+            norms = np.linalg.norm(query_vector) * np.linalg.norm(embedding)
+            return float(1.0 - np.dot(query_vector, embedding) / max(norms, 1e-12))
+        if self.distance_space == 'ip':
+            return float(1.0 - np.dot(query_vector, embedding))
+        return float(np.sum((query_vector - embedding) ** 2))
+    
+    def _encode_query(self, query: str) -> np.ndarray:
+        """Sorgu embedding'i; yalnızca harf, aksan, noktalama farkı olan sorgular tekrar encode edilmez"""
+        cache_size = self.config['retrieval'].get('query_cache_size', 1024)
+        if cache_size <= 0:
+            return self._encode_single(query)
+        
+        key = normalize_key(query)
+        with self._query_cache_lock:
+            embedding = self.query_cache.get(key)
+            if embedding is not None:
+                self.query_cache.move_to_end(key)
+                self.query_cache_hits += 1
+                return embedding
+            self.query_cache_misses += 1
+        
+        embedding = self._encode_single(query)
+        
+        with self._query_cache_lock:
+            self.query_cache[key] = embedding
+            self.query_cache.move_to_end(key)
+            while len(self.query_cache) > cache_size:
+                self.query_cache.popitem(last=False)
+        
+        return embedding
+    
+    def _start_batchers(self) -> bool:
+        """Mikro-batching açıksa batcher'ları başlat"""
+        batching_config = self.config['retrieval'].get('micro_batching', {})
+        if not batching_config.get('enabled', False):
+            return False
+        
+        with self._query_cache_lock:
+            if self._encode_batcher is None:
+                max_batch_size = batching_config.get('max_batch_size', 16)
+                max_wait_ms = batching_config.get('max_wait_ms', 5)
+                self._encode_batcher = MicroBatcher(
+                    self._encode_query_batch, max_batch_size, max_wait_ms, name="query-encode-batcher"
+                )
+                self._search_batcher = MicroBatcher(
+                    self._query_collection_batch, max_batch_size, max_wait_ms, name="query-search-batcher"
+                )
+        return True
+    
+    def _encode_single(self, query: str) -> np.ndarray:
+        """Tek sorguyu encode et; eş zamanlı sorgular tek encode çağrısında birleşir"""
+        if self._start_batchers():
+            return self._encode_batcher.submit(query).result()
+        return self.embedding_model.encode([query])[0]
+    
+    def _encode_query_batch(self, queries: List[str]) -> List[np.ndarray]:
+        """Batcher: sorguları tek çağrıda encode et"""
+        return list(self.embedding_model.encode(queries, batch_size=len(queries)))
+    
+    def _query_collection(self, query_embedding: np.ndarray, n_results: int, where: Optional[Dict[str, Any]] = None,
+                          where_document: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Koleksiyonda tek vektörle ara (sonuç ChromaDB'nin tek sorguluk formatında)"""
+        if self._start_batchers():
+            return self._search_batcher.submit((query_embedding, n_results, where, where_document)).result()
+        return self.collection.query(
+            query_embeddings=[query_embedding.tolist()],
+            n_results=n_results,
+            where=where,
+            where_document=where_document,
+            include=['documents', 'metadatas', 'distances']
+        )
+    
+    def _query_collection_batch(self, items: List[Tuple[np.ndarray, int, Optional[Dict[str, Any]],
+                                                         Optional[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """Batcher: aynı n_results ve filtreli sorguları tek collection.query çağrısında çalıştır"""
+        groups: Dict[Tuple[int, str], List[int]] = {}
+        for position, (_, n_results, where, where_document) in enumerate(items):
+            groups.setdefault((n_results, filter_key(where, where_document)), []).append(position)
+        
+        outputs: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        for (n_results, _), positions in groups.items():
+            _, _, where, where_document = items[positions[0]]
+            results = self.collection.query(
+                query_embeddings=[items[position][0].tolist() for position in positions],
+                n_results=n_results,
+                where=where,
+                where_document=where_document,
+                include=['documents', 'metadatas', 'distances']
+            )
+            for row, position in enumerate(positions):
+                outputs[position] = {
+                    key: [results[key][row]] for key in ('ids', 'documents', 'metadatas', 'distances')
+                }
+        return outputs
+    
+    def warm_up(self) -> Dict[str, float]:
+        """İlk gerçek sorgudan önce modeli ve koleksiyon indeksini ısıt
+        
+        Model ilk çıkarımlarını (thread havuzları, bellek ayırma) ve ChromaDB HNSW
+        indeksinin diskten yüklenmesini burada öder. Süreleri saniye cinsinden döndürür.
+        """
+        timings = {}
+        
+        start_time = time.perf_counter()
+        samples = [
+            "Türk Ceza Kanunu madde 1",
+            "Kiracı, kira bedelini zamanında ödemekle yükümlüdür.",
+            "Madde 2 - (1) Bu Kanun hükümleri, Türkiye Cumhuriyeti sınırları içinde uygulanır. " * 4
+        ]
+        for _ in range(2):
+            self.embedding_model.encode(samples[:1])
+            self.embedding_model.encode(samples)
+        timings['encode'] = time.perf_counter() - start_time
+        
+        start_time = time.perf_counter()
+        count = self.collection.count()
+        if count:
+            # Boş olmayan koleksiyonda sorgu, HNSW indeksini belleğe yükletir
+            query_embedding = self._index_vectors(self.embedding_model.encode(samples[:1]))
+            self.collection.query(query_embeddings=query_embedding.tolist(), n_results=1, include=[])
+        timings['index'] = time.perf_counter() - start_time
+        
+        # BM25 ve madde indeksleri diskten yüklenir (yoksa koleksiyondan kurulur)
+        start_time = time.perf_counter()
+        self._get_bm25_index()
+        self._get_article_index()
+        timings['bm25'] = time.perf_counter() - start_time
+        
+        logger.info(f"🔥 Isınma tamamlandı: encode {timings['encode']:.2f}s, indeks {timings['index']:.2f}s, "
+                    f"bm25 {timings['bm25']:.2f}s ({count} kayıt)")
+        return timings
     
     def get_stats(self) -> Dict[str, Any]:
         """Veritabanı istatistikleri"""
         try:
             count = self.collection.count()
             
-            return {
+            stats = {
                 'total_documents': count,
+                'distance_space': self.distance_space,
                 'collection_name': self.config['vector_db']['collection_name'],
                 'embedding_model': self.config['embedding']['model_name']
             }
             
+            deduplicator = self._get_deduplicator()
+            if deduplicator is not None:
+                stats['dedup_skipped'] = self.dedup_skipped
+                stats['dedup_linked_chunks'] = len(deduplicator.duplicates)
+            if self.embedding_cache is not None:
+                stats['embedding_cache'] = self.embedding_cache.stats()
+            
+            lookups = self.query_cache_hits + self.query_cache_misses
+            stats['query_cache'] = {
+                'entries': len(self.query_cache),
+                'max_entries': self.config['retrieval'].get('query_cache_size', 1024),
+                'hits': self.query_cache_hits,
+                'misses': self.query_cache_misses,
+                'hit_rate': round(self.query_cache_hits / lookups, 3) if lookups else 0.0
+            }
+            if self.projection is not None:
+                stats['projection_dim'] = self.projection.output_dim
+            if self.bm25_index is not None:
+                stats['bm25_documents'] = len(self.bm25_index)
+            if self.article_index is not None:
+                stats['indexed_articles'] = len(self.article_index)
+            if self._search_count:
+                stats['search_timings_ms'] = {
+                    leg: round(total / self._search_count, 2) for leg, total in self._search_timing_totals.items()
+                }
+                stats['search_timings_ms']['searches'] = self._search_count
+            if self._encode_batcher is not None:
+                stats['micro_batching'] = {
+                    'encode': self._encode_batcher.stats(),
+                    'search': self._search_batcher.stats()
+                }
+            
+            return stats
+            
         except Exception as e:
             logger.error(f"İstatistik hatası: {e}")
             return {}
@@ -211,8 +1279,21 @@ class ChromaManager:
             
             self.collection = self.client.get_or_create_collection(
                 name=collection_name,
-                metadata={"description": "Hukuk belgeleri için vektör veritabanı"}
+                metadata=self._collection_metadata(self._configured_space())
             )
+            self.distance_space = self._configured_space()
+            
+            # Manifest de sıfırlansın, aksi halde senkronizasyon dosyaları değişmemiş sanar
+            self._get_manifest().clear()
+            deduplicator = self._get_deduplicator()
+            if deduplicator is not None:
+                deduplicator.clear()
+            bm25_index = self._get_bm25_index()
+            if bm25_index is not None:
+                bm25_index.clear()
+            article_index = self._get_article_index()
+            if article_index is not None:
+                article_index.clear()
             
             logger.warning("⚠️ Tüm belgeler silindi!")
             return True
@@ -221,8 +1302,66 @@ class ChromaManager:
             logger.error(f"Silme hatası: {e}")
             return False
     
+    def migrate_distance_space(self, space: Optional[str] = None, batch_size: int = 1000) -> int:
+        """Koleksiyonu yeni mesafe uzayına taşı (yeniden embedding yok), taşınan kayıt sayısını döndür
+        
+        Kayıtlar saklı vektörleriyle geçici bir koleksiyona kopyalanır (cosine/ip için
+        normalize edilerek), eski koleksiyon silinir ve geçici koleksiyon eski adı alır.
+        """
+        space = space or self._configured_space()
+        if space not in DISTANCE_SPACES:
+            raise ValueError(f"Bilinmeyen mesafe uzayı: {space}")
+        if space == self.distance_space:
+            logger.info(f"Koleksiyon zaten '{space}' uzayında")
+            return 0
+        
+        collection_name = self.config['vector_db']['collection_name']
+        temp_name = self._migration_name(collection_name)
+        names = {getattr(collection, 'name', collection) for collection in self.client.list_collections()}
+        if temp_name in names:
+            self.client.delete_collection(name=temp_name)
+        target = self.client.create_collection(name=temp_name, metadata=self._collection_metadata(space))
+        
+        total = self.collection.count()
+        moved = 0
+        while moved < total:
+            page = self.collection.get(
+                limit=batch_size, offset=moved, include=['documents', 'metadatas', 'embeddings']
+            )
+            if not page['ids']:
+                break
+            embeddings = np.asarray(page['embeddings'], dtype=np.float32)
+            if space in ('cosine', 'ip'):
+                embeddings = self._normalize(embeddings)
+            target.upsert(
+                ids=page['ids'],
+                documents=page['documents'],
+                metadatas=page['metadatas'],
+                embeddings=embeddings.tolist()
+            )
+            moved += len(page['ids'])
+            logger.info(f"🔁 Taşınıyor: {moved}/{total}")
+        
+        if target.count() != total:
+            self.client.delete_collection(name=temp_name)
+            raise RuntimeError(f"Taşıma doğrulanamadı: {target.count()}/{total} kayıt")
+        
+        self.client.delete_collection(name=collection_name)
+        target.modify(name=collection_name)
+        self.collection = self.client.get_collection(collection_name)
+        self.distance_space = space
+        logger.success(f"✅ Koleksiyon '{space}' uzayına taşındı: {moved} kayıt")
+        return moved
+    
     def close(self):
         """Bağlantıyı kapat"""
+        for batcher in (self._encode_batcher, self._search_batcher):
+            if batcher is not None:
+                batcher.close()
+        self._encode_batcher = self._search_batcher = None
+        if self._search_executor is not None:
+            self._search_executor.shutdown()
+            self._search_executor = None
         logger.info("ChromaDB bağlantısı kapatıldı")
 
 
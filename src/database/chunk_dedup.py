@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Chunk Tekilleştirme - Embedding öncesi neredeyse aynı chunk'ları MinHash + LSH ile bulur
+"""
+
+import os
+import pickle
+import re
+import sys
+import threading
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Tuple, Optional
+
+import numpy as np
+from loguru import logger
+
+# Local imports
+sys.path.append('src')
+from processing.turkish_analyzer import normalize_key
+
+# (kanun, madde türü, madde no, kaynak dosya); kaynak yalnızca kanun bilgisi yoksa dolar
+DedupScope = Tuple[Optional[str], Optional[str], Optional[int], Optional[str]]
+
+_NO_SCOPE: DedupScope = (None, None, None, None)
+
+# Kapsam tanımı değişirse artırılır; farklı sürümle kaydedilmiş indeks sıfırlanır
+SCOPE_VERSION = 2
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+# Permütasyon katsayıları için sabit tohum (imzalar çalıştırmalar arasında kararlı kalmalı)
+_SEED = 20240101
+
+
+class ChunkDeduplicator:
+    """Eklenmiş chunk'ların MinHash imzalarını tutan tekilleştirme indeksi
+
+    Her chunk kelime n-gram'larına (shingle) ayrılır ve num_perm elemanlı MinHash
+    imzası çıkarılır. İmza bantlara bölünür; aynı bant değerini paylaşan chunk'lar
+    aday olur ve tahmini Jaccard benzerliği eşiği geçen aday kopya sayılır.
+    Atlanan chunk, indeksteki kanonik chunk'a bağlanır. Adaylar yalnızca aynı
+    kapsamdaki (kanun, madde türü, madde no) chunk'lardır; farklı kanunların ya da
+    maddelerin aynı metni birleşmez, kanun/madde filtreleri ve madde araması
+    kopyanın kanununu kaçırmaz. Kanun bilgisi olmayan chunk'lar yalnızca kendi
+    dosyalarının chunk'larıyla karşılaştırılır.
+
+    filter() ile tutulan chunk'ların imzaları ve kopya bağlantıları önce
+    bekleyen durumda kalır (sonraki batch'ler yine de onlara karşı denetlenir);
+    chunk veritabanına yazıldıktan sonra commit() ile kalıcı indekse geçer.
+    Yazma başarısız olursa discard_pending() bekleyenleri geri alır.
+    """
+
+    def __init__(self, index_path: Optional[str] = None, threshold: float = 0.9,
+                 num_perm: int = 128, bands: int = 16, shingle_size: int = 5):
+        """Başlatma"""
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) bands ({bands}) değerine tam bölünmeli")
+
+        self.index_path = Path(index_path) if index_path else None
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.RandomState(_SEED)
+        # Çarp-kaydır hash ailesi: ((a * x + b) mod 2^64) >> 32, a tek sayı
+        self._a = (rng.randint(0, 2 ** 31, num_perm, dtype=np.uint64) << np.uint64(32)) | \
+            rng.randint(0, 2 ** 32, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = (rng.randint(0, 2 ** 31, num_perm, dtype=np.uint64) << np.uint64(32)) | \
+            rng.randint(0, 2 ** 32, num_perm, dtype=np.uint64)
+
+        self.signatures: Dict[str, np.ndarray] = {}
+        self.scopes: Dict[str, DedupScope] = {}
+        self.duplicates: Dict[str, str] = {}
+        self._buckets: List[Dict[Tuple[DedupScope, bytes], set]] = [defaultdict(set) for _ in range(bands)]
+        # Henüz yazılmamış chunk'ların imzaları ve kopya bağlantıları
+        self._pending: Dict[str, Tuple[np.ndarray, DedupScope]] = {}
+        self._pending_duplicates: Dict[str, str] = {}
+        # Pipeline'da filter() ve commit() farklı thread'lerden çağrılır
+        self._lock = threading.Lock()
+
+        self._load()
+
+    def _load(self):
+        """İndeksi diskten yükle"""
+        if self.index_path is None or not self.index_path.exists():
+            return
+
+        try:
+            with open(self.index_path, 'rb') as file:
+                data = pickle.load(file)
+            if data.get('num_perm') != self.num_perm or data.get('shingle_size') != self.shingle_size:
+                logger.warning("Tekilleştirme indeksi farklı parametrelerle oluşturulmuş, sıfırlanıyor")
+                return
+            if data.get('scope_version') != SCOPE_VERSION:
+                logger.warning("Tekilleştirme indeksi farklı kapsam tanımıyla oluşturulmuş, sıfırlanıyor")
+                return
+            self.duplicates = data['duplicates']
+            for chunk_id, signature in data['signatures'].items():
+                self._index(chunk_id, signature, data['scopes'].get(chunk_id, _NO_SCOPE))
+        except Exception as e:
+            logger.error(f"Tekilleştirme indeksi okunamadı ({self.index_path}): {e}")
+            self.signatures, self.scopes, self.duplicates = {}, {}, {}
+            self._buckets = [defaultdict(set) for _ in range(self.bands)]
+
+    def save(self):
+        """İndeksi diske yaz"""
+        if self.index_path is None:
+            return
+
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as file:
+            pickle.dump({
+                'num_perm': self.num_perm,
+                'shingle_size': self.shingle_size,
+                'scope_version': SCOPE_VERSION,
+                'signatures': self.signatures,
+                'scopes': self.scopes,
+                'duplicates': self.duplicates
+            }, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.index_path)
+
+    def signature(self, text: str) -> np.ndarray:
+        """Metnin MinHash imzası"""
+        words = _WORD_PATTERN.findall(text.lower())
+        if len(words) <= self.shingle_size:
+            shingles = {' '.join(words)}
+        else:
+            shingles = {' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+        permuted = (np.outer(hashes, self._a) + self._b) >> np.uint64(32)
+        return permuted.min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def scope(metadata: Dict[str, Any]) -> DedupScope:
+        """Chunk'ın tekilleştirme kapsamı: (kanun, madde türü, madde no, kaynak dosya)
+
+        Kanun adı büyük/küçük harf ve aksandan bağımsız karşılaştırılır; kısa ad
+        eşlemesi (law_code) yalnızca bilinen kanunları tanıdığı için kullanılmaz.
+        Kanun bilgisi olmayan düz TXT/DOCX chunk'larında kapsam kaynak dosyadır;
+        farklı dosyaların metinleri birleşmez, dosya adı filtresi kopyayı kaçırmaz.
+        """
+        title = metadata.get('law_title')
+        law = normalize_key(title) if title else None
+        article_no = metadata.get('article_no')
+        source = None
+        if law is None:
+            source = metadata.get('content_hash') or metadata.get('filename') or None
+        return (
+            law,
+            (metadata.get('article_kind') or 'madde') if article_no is not None else None,
+            int(article_no) if article_no is not None else None,
+            source
+        )
+
+    def _band_keys(self, signature: np.ndarray, scope: DedupScope) -> List[Tuple[DedupScope, bytes]]:
+        """İmzanın kapsama bağlı bant anahtarları"""
+        return [(scope, signature[i * self.rows:(i + 1) * self.rows].tobytes()) for i in range(self.bands)]
+
+    def _index(self, chunk_id: str, signature: np.ndarray, scope: DedupScope):
+        """İmzayı indekse ekle"""
+        self.signatures[chunk_id] = signature
+        self.scopes[chunk_id] = scope
+        self._add_to_buckets(chunk_id, signature, scope)
+
+    def _add_to_buckets(self, chunk_id: str, signature: np.ndarray, scope: DedupScope):
+        """İmzanın bant anahtarlarını kovalara ekle"""
+        for bucket, key in zip(self._buckets, self._band_keys(signature, scope)):
+            bucket[key].add(chunk_id)
+
+    def _remove_from_buckets(self, chunk_id: str, signature: np.ndarray, scope: DedupScope):
+        """İmzanın bant anahtarlarını kovalardan çıkar"""
+        for bucket, key in zip(self._buckets, self._band_keys(signature, scope)):
+            members = bucket.get(key)
+            if members is not None:
+                members.discard(chunk_id)
+                if not members:
+                    del bucket[key]
+
+    def find_duplicate(self, signature: np.ndarray, scope: DedupScope = _NO_SCOPE) -> Optional[str]:
+        """Aynı kapsamda imzaya eşik üstünde benzeyen kanonik chunk id'si (bekleyenler dahil)"""
+        candidates = set()
+        for bucket, key in zip(self._buckets, self._band_keys(signature, scope)):
+            candidates.update(bucket.get(key, ()))
+
+        best_id, best_score = None, self.threshold
+        for candidate in candidates:
+            candidate_signature = self.signatures.get(candidate)
+            if candidate_signature is None:
+                candidate_signature = self._pending[candidate][0]
+            score = float(np.mean(candidate_signature == signature))
+            if score >= best_score:
+                best_id, best_score = candidate, score
+        return best_id
+
+    def filter(self, texts: List[str], metadatas: List[Dict[str, Any]],
+               ids: List[str]) -> Tuple[List[str], List[Dict[str, Any]], List[str], int]:
+        """Kopya chunk'ları çıkar; tutulanların imzaları ve kopya bağlantıları beklemeye alınır
+
+        Aynı id ile tekrar gelen chunk (upsert) kendi kopyası sayılmaz.
+        """
+        kept_texts, kept_metadatas, kept_ids = [], [], []
+        skipped = 0
+
+        with self._lock:
+            for text, metadata, chunk_id in zip(texts, metadatas, ids):
+                if chunk_id in self.signatures or chunk_id in self._pending:
+                    kept_texts.append(text)
+                    kept_metadatas.append(metadata)
+                    kept_ids.append(chunk_id)
+                    continue
+
+                signature = self.signature(text)
+                scope = self.scope(metadata)
+                canonical_id = self.find_duplicate(signature, scope)
+                if canonical_id is not None:
+                    self._pending_duplicates[chunk_id] = canonical_id
+                    skipped += 1
+                    continue
+
+                self._pending[chunk_id] = (signature, scope)
+                self._add_to_buckets(chunk_id, signature, scope)
+                kept_texts.append(text)
+                kept_metadatas.append(metadata)
+                kept_ids.append(chunk_id)
+
+        return kept_texts, kept_metadatas, kept_ids, skipped
+
+    def commit(self, written_ids: Iterable[str] = ()) -> List[str]:
+        """Yazılan chunk'ların imzalarını kalıcı indekse al
+
+        Kanoniği artık kalıcı indekste olan bekleyen kopyaları da bağlar ve
+        bu kopyaların id'lerini döndürür (kopyanın dosyası için işlenmiş sayılır).
+        """
+        with self._lock:
+            for chunk_id in written_ids:
+                pending = self._pending.pop(chunk_id, None)
+                if pending is not None:
+                    self.signatures[chunk_id], self.scopes[chunk_id] = pending
+                    self.duplicates.pop(chunk_id, None)
+
+            resolved = [dup_id for dup_id, canonical_id in self._pending_duplicates.items()
+                        if canonical_id in self.signatures]
+            for dup_id in resolved:
+                self.duplicates[dup_id] = self._pending_duplicates.pop(dup_id)
+            return resolved
+
+    def discard_pending(self) -> int:
+        """Yazılamayan chunk'ların bekleyen imzalarını ve kopya bağlantılarını geri al"""
+        with self._lock:
+            discarded = len(self._pending) + len(self._pending_duplicates)
+            for chunk_id, (signature, scope) in self._pending.items():
+                self._remove_from_buckets(chunk_id, signature, scope)
+            self._pending, self._pending_duplicates = {}, {}
+            return discarded
+
+    def forget_prefix(self, prefix: str) -> List[str]:
+        """Id'si prefix ile başlayan chunk'ları unut, kanoniği silinen kopya id'lerini döndür"""
+        removed = [chunk_id for chunk_id in self.signatures if chunk_id.startswith(prefix)]
+        for chunk_id in removed:
+            self._remove_from_buckets(chunk_id, self.signatures.pop(chunk_id), self.scopes.pop(chunk_id))
+
+        for chunk_id in [chunk_id for chunk_id in self.duplicates if chunk_id.startswith(prefix)]:
+            del self.duplicates[chunk_id]
+
+        removed_set = set(removed)
+        orphaned = [dup_id for dup_id, canonical_id in self.duplicates.items() if canonical_id in removed_set]
+        for dup_id in orphaned:
+            del self.duplicates[dup_id]
+        return orphaned
+
+    def clear(self):
+        """İndeksi sıfırla"""
+        self.signatures, self.scopes, self.duplicates = {}, {}, {}
+        self._pending, self._pending_duplicates = {}, {}
+        self._buckets = [defaultdict(set) for _ in range(self.bands)]
+        self.save()
+
+
+# Test fonksiyonu
+def test_chunk_dedup():
+    """ChunkDeduplicator test fonksiyonu"""
+    print("🧪 Chunk Tekilleştirme Testi Başlıyor...")
+
+    try:
+        dedup = ChunkDeduplicator(threshold=0.8)
+
+        article = ("Madde 81 - (1) Bir insanı kasten öldüren kişi, ağırlaştırılmış müebbet hapis cezası "
+                   "ile değil müebbet hapis cezası ile cezalandırılır. Bu hüküm kanunun yürürlüğe "
+                   "girdiği tarihten itibaren uygulanır ve ilgili tüm davalarda dikkate alınır.")
+        texts = [
+            article,
+            article.replace("uygulanır", "uygulanır,"),
+            "Madde 1 - Kanun, lafzı veya ruhu ile bir hükme bağlamış olduğu hallerde hakim bu hükmü uygular."
+        ]
+        ids = ['a:0', 'b:0', 'c:0']
+
+        kept_texts, _, kept_ids, skipped = dedup.filter(texts, [{}] * 3, ids)
+        print(f"📄 Tutulan: {kept_ids}, atlanan: {skipped}")
+        print(f"🔗 Yazım sonrası bağlanan kopyalar: {dedup.commit(kept_ids)}, bağlantılar: {dedup.duplicates}")
+        print(f"🗑️ Kanoniği silinen kopyalar: {dedup.forget_prefix('a:')}")
+
+        # Aynı metin farklı kanunun maddesiyse kopya sayılmaz
+        metadatas = [{'law_title': 'TÜRK CEZA KANUNU', 'article_no': 81},
+                     {'law_title': 'Türk Ceza Kanunu', 'article_no': 81},
+                     {'law_title': 'ASKERİ CEZA KANUNU', 'article_no': 81}]
+        _, _, kept_ids, skipped = dedup.filter([article] * 3, metadatas, ['x:0', 'y:0', 'z:0'])
+        print(f"⚖️ Kapsamlı tekilleştirme - tutulan: {kept_ids}, atlanan: {skipped}")
+        assert kept_ids == ['x:0', 'z:0']
+
+        # Kanun bilgisi olmayan düz metinler yalnızca aynı dosya içinde birleşir
+        metadatas = [{'content_hash': 'h1', 'filename': 'dilekce1.txt'},
+                     {'content_hash': 'h1', 'filename': 'dilekce1.txt'},
+                     {'content_hash': 'h2', 'filename': 'dilekce2.docx'}]
+        _, _, kept_ids, skipped = dedup.filter([article] * 3, metadatas, ['h1:0', 'h1:1', 'h2:0'])
+        print(f"📁 Dosya kapsamlı tekilleştirme - tutulan: {kept_ids}, atlanan: {skipped}")
+        assert kept_ids == ['h1:0', 'h2:0']
+
+        print("✅ Chunk tekilleştirme testi başarılı!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test hatası: {e}")
+        return False
+
+if __name__ == "__main__":
+    test_chunk_dedup()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Embedding Önbelleği - Metin içeriğiyle anahtarlanan, diskte memory-mapped embedding deposu
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Dict, Any
+
+import numpy as np
+from loguru import logger
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Önbellek anahtarı için metni normalize et (NFC, tek boşluk)"""
+    return _WHITESPACE_PATTERN.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+class EmbeddingCache:
+    """(model adı, normalize metin hash'i) ile anahtarlanan kalıcı embedding önbelleği
+
+    Vektörler sabit kapasiteli bir .npy dosyasında (memory-mapped) tutulur, anahtar ->
+    satır eşlemesi ayrı bir indeks dosyasındadır. Kapasite dolunca en uzun süredir
+    kullanılmayan kayıt (LRU) yerini yeni vektöre bırakır. Her satırın anahtarı
+    vektörle birlikte yazılır ve okumada doğrulanır; indeks kaydedilmeden kesilen
+    bir çalıştırma yanlış vektör döndürmez.
+    """
+
+    def __init__(self, cache_dir: str, model_name: str, max_entries: int = 200000, dtype: str = 'float16'):
+        """Başlatma"""
+        safe_model = re.sub(r'[^\w.-]+', '_', model_name)
+        self.cache_dir = Path(cache_dir) / safe_model
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.dtype = np.dtype(dtype)
+
+        self.vectors_path = self.cache_dir / 'vectors.npy'
+        self.keys_path = self.cache_dir / 'keys.npy'
+        self.index_path = self.cache_dir / 'index.pkl'
+
+        self.vectors: Optional[np.memmap] = None
+        self.slot_keys: Optional[np.memmap] = None
+        self.entries: 'OrderedDict[bytes, int]' = OrderedDict()
+        self.free_slots: List[int] = []
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._load()
+
+    def _load(self):
+        """Mevcut önbelleği aç"""
+        if not (self.vectors_path.exists() and self.keys_path.exists() and self.index_path.exists()):
+            return
+
+        try:
+            with open(self.index_path, 'rb') as file:
+                data = pickle.load(file)
+            vectors = np.lib.format.open_memmap(self.vectors_path, mode='r+')
+            slot_keys = np.lib.format.open_memmap(self.keys_path, mode='r+')
+            if vectors.dtype != self.dtype or vectors.shape[0] != self.max_entries or len(slot_keys) != self.max_entries:
+                logger.warning("Embedding önbelleği farklı ayarlarla oluşturulmuş, sıfırlanıyor")
+                return
+
+            self.vectors, self.slot_keys = vectors, slot_keys
+            self.entries = data['entries']
+            used = set(self.entries.values())
+            self.free_slots = [slot for slot in range(self.max_entries - 1, -1, -1) if slot not in used]
+            logger.info(f"Embedding önbelleği açıldı: {len(self.entries)} kayıt")
+        except Exception as e:
+            logger.error(f"Embedding önbelleği okunamadı ({self.cache_dir}): {e}")
+            self.vectors, self.slot_keys, self.entries, self.free_slots = None, None, OrderedDict(), []
+
+    def _create(self, dim: int):
+        """Boş vektör dosyasını oluştur"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.vectors = np.lib.format.open_memmap(
+            self.vectors_path, mode='w+', dtype=self.dtype, shape=(self.max_entries, dim)
+        )
+        self.slot_keys = np.lib.format.open_memmap(
+            self.keys_path, mode='w+', dtype=np.uint8, shape=(self.max_entries, 20)
+        )
+        self.entries = OrderedDict()
+        self.free_slots = list(range(self.max_entries - 1, -1, -1))
+
+    def key(self, text: str) -> bytes:
+        """Metnin önbellek anahtarı (sha1 özeti)"""
+        payload = f"{self.model_name}\0{normalize_text(text)}".encode('utf-8')
+        return hashlib.sha1(payload).digest()
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Metinlerin önbellekteki vektörleri (yoksa None)"""
+        results = []
+        with self._lock:
+            for text in texts:
+                key = self.key(text)
+                slot = self.entries.get(key)
+                if slot is None or self.vectors is None or self.slot_keys[slot].tobytes() != key:
+                    self.misses += 1
+                    results.append(None)
+                    continue
+
+                self.entries.move_to_end(key)
+                self.hits += 1
+                results.append(np.asarray(self.vectors[slot], dtype=np.float32))
+        return results
+
+    def put_many(self, texts: List[str], vectors: np.ndarray):
+        """Vektörleri önbelleğe yaz"""
+        with self._lock:
+            if self.vectors is None or self.vectors.shape[1] != vectors.shape[1]:
+                self._create(vectors.shape[1])
+
+            for text, vector in zip(texts, vectors):
+                key = self.key(text)
+                slot = self.entries.get(key)
+                if slot is None:
+                    if self.free_slots:
+                        slot = self.free_slots.pop()
+                    else:
+                        # LRU: en eski kaydın satırını yeniden kullan
+                        _, slot = self.entries.popitem(last=False)
+                self.entries[key] = slot
+                self.entries.move_to_end(key)
+                self.vectors[slot] = vector
+                self.slot_keys[slot] = np.frombuffer(key, dtype=np.uint8)
+
+    def save(self):
+        """Vektörleri diske aktar ve indeksi yaz"""
+        with self._lock:
+            if self.vectors is None:
+                return
+
+            self.vectors.flush()
+            self.slot_keys.flush()
+            tmp_path = self.index_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as file:
+                pickle.dump({'entries': self.entries}, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.index_path)
+
+    def stats(self) -> Dict[str, Any]:
+        """İsabet/ıska sayaçları"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+# Test fonksiyonu
+def test_embedding_cache():
+    """EmbeddingCache test fonksiyonu"""
+    print("🧪 Embedding Önbelleği Testi Başlıyor...")
+
+    try:
+        import shutil
+        import tempfile
+
+        cache_dir = tempfile.mkdtemp()
+        cache = EmbeddingCache(cache_dir, 'test-model', max_entries=2)
+
+        texts = ["Madde 1 - Kanunun amacı", "Madde 2 - Kapsam", "Madde 3 - Tanımlar"]
+        vectors = np.random.rand(3, 4).astype(np.float32)
+
+        print(f"📄 İlk sorgu: {[v is not None for v in cache.get_many(texts)]}")
+        cache.put_many(texts, vectors)
+        cache.save()
+
+        # Yeniden aç: kapasite 2 olduğu için ilk metin LRU ile düşmüş olmalı
+        cache = EmbeddingCache(cache_dir, 'test-model', max_entries=2)
+        cached = cache.get_many(["Madde 1 - Kanunun amacı", "  Madde 3 -  Tanımlar "])
+        print(f"📄 Yeniden açıldıktan sonra: {[v is not None for v in cached]}")
+        print(f"📊 {cache.stats()}")
+
+        shutil.rmtree(cache_dir)
+
+        print("✅ Embedding önbelleği testi başarılı!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test hatası: {e}")
+        return False
+
+if __name__ == "__main__":
+    test_embedding_cache()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Embedding Süreç Havuzu - Toplu yüklemede metinleri kendi model kopyası olan süreçlere dağıtır
+"""
+
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+from loguru import logger
+
+# Her worker süreçte bir kez yüklenen model
+_worker_model = None
+
+# Worker'daki BLAS/OpenMP thread sınırı; nesne yaşadığı sürece sınır geçerli kalır
+_worker_thread_limits = None
+
+
+def _init_worker(embedding_config: Dict[str, Any], threads: int):
+    """Worker süreç başlatıcı: thread sayısını sabitle ve modeli yükle
+
+    spawn ile başlayan worker bu modülü (ve numpy'ı) initializer'dan önce import
+    eder; OMP_NUM_THREADS gibi ortam değişkenleri o noktada etkisizdir. BLAS
+    havuzları bu yüzden threadpoolctl ile, torch havuzları set_num_threads ile
+    çalışma anında sınırlanır.
+    """
+    global _worker_model, _worker_thread_limits
+
+    try:
+        from threadpoolctl import threadpool_limits
+        _worker_thread_limits = threadpool_limits(limits=threads)
+    except ImportError:
+        logger.warning("threadpoolctl bulunamadı, worker BLAS thread sayısı sınırlanmadı")
+
+    sys.path.append('src')
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        pass
+
+    from database.onnx_encoder import load_embedding_model
+    _worker_model = load_embedding_model(dict(embedding_config, onnx_threads=threads))
+
+
+def _encode_shard(texts: List[str], batch_size: int) -> np.ndarray:
+    """Worker içinde tek parçayı encode et"""
+    embeddings = _worker_model.encode(texts, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False)
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+class EmbeddingPool:
+    """Embedding worker süreçleri havuzu
+
+    Her worker modelin kendi kopyasını yükler ve threads_per_worker thread ile
+    çalışır; küçük modellerde tek süreçte thread sayısını artırmak yerine süreç
+    sayısını artırmak çekirdekleri daha iyi kullanır. Parçalar sırayla toplanır.
+    """
+
+    def __init__(self, embedding_config: Dict[str, Any], workers: int = 0, threads_per_worker: int = 1):
+        """Başlatma"""
+        cpu_count = os.cpu_count() or 1
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.workers = workers if workers > 0 else max(1, cpu_count // self.threads_per_worker)
+
+        context = multiprocessing.get_context('spawn')
+        self.executor: Optional[ProcessPoolExecutor] = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(embedding_config, self.threads_per_worker)
+        )
+        logger.info(f"🧵 Embedding havuzu: {self.workers} süreç x {self.threads_per_worker} thread")
+
+    def encode_shards(self, shards: List[List[str]], batch_size: int = 32) -> List[np.ndarray]:
+        """Parçaları worker'lara dağıt, sonuçları parça sırasıyla döndür"""
+        return list(self.executor.map(_encode_shard, shards, [batch_size] * len(shards)))
+
+    def close(self):
+        """Worker süreçlerini kapat"""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+# Test fonksiyonu
+def test_embedding_pool():
+    """EmbeddingPool test fonksiyonu"""
+    print("🧪 Embedding Havuzu Testi Başlıyor...")
+
+    try:
+        pool = EmbeddingPool({'model_name': 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2'}, workers=2)
+        shards = [
+            ["Türk Ceza Kanunu madde 1", "Türk Medeni Kanunu madde 1"],
+            ["Kiracı, kira bedelini zamanında ödemekle yükümlüdür."]
+        ]
+        results = pool.encode_shards(shards)
+        pool.close()
+
+        print(f"📊 Parça boyutları: {[r.shape for r in results]}")
+        print("✅ Embedding havuzu testi başarılı!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test hatası: {e}")
+        return False
+
+if __name__ == "__main__":
+    test_embedding_pool()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Ingest Manifest - Dosya yolu ve içerik hash'i ile artımlı senkronizasyon kaydı
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from loguru import logger
+
+
+class IngestManifest:
+    """Vektör veritabanına eklenmiş dosyaların manifest'i
+
+    Her kayıt dosya yolu ile anahtarlanır ve dosya baytlarının sha256 hash'ini,
+    üretilen chunk sayısını ve eklenme zamanını tutar.
+    """
+
+    def __init__(self, manifest_path: str):
+        """Başlatma"""
+        self.manifest_path = Path(manifest_path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self):
+        """Manifest dosyasını yükle"""
+        if not self.manifest_path.exists():
+            return
+
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                self.entries = json.load(file).get('files', {})
+        except Exception as e:
+            logger.error(f"Manifest okunamadı ({self.manifest_path}): {e}")
+            self.entries = {}
+
+    def save(self):
+        """Manifest'i diske yaz (yarım kalan yazım eski dosyayı bozmasın)"""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({'files': self.entries}, file, ensure_ascii=False, indent=1)
+
+        os.replace(tmp_path, self.manifest_path)
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Dosya kaydını getir"""
+        return self.entries.get(file_path)
+
+    def update(self, file_path: str, content_hash: str, chunk_count: int, file_size: int = 0):
+        """Dosya kaydını ekle veya güncelle"""
+        self.entries[file_path] = {
+            'content_hash': content_hash,
+            'chunk_count': chunk_count,
+            'file_size': file_size,
+            'ingested_at': datetime.now().isoformat()
+        }
+
+    def remove(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Dosya kaydını sil"""
+        return self.entries.pop(file_path, None)
+
+    def paths_under(self, directory: str) -> List[str]:
+        """Verilen dizin altındaki kayıtlı dosya yolları"""
+        prefix = str(Path(directory).resolve()) + os.sep
+        return [path for path in self.entries if path.startswith(prefix)]
+
+    def hash_in_use(self, content_hash: str, exclude_path: Optional[str] = None) -> bool:
+        """Aynı içeriğe sahip başka bir dosya kayıtlı mı?"""
+        return any(
+            entry['content_hash'] == content_hash
+            for path, entry in self.entries.items()
+            if path != exclude_path
+        )
+
+    def paths_with_hash(self, content_hash: str) -> List[str]:
+        """Verilen içerik hash'ine sahip dosya yolları"""
+        return [path for path, entry in self.entries.items() if entry['content_hash'] == content_hash]
+
+    def clear(self):
+        """Tüm kayıtları sil"""
+        self.entries = {}
+        self.save()
+
+
+# Test fonksiyonu
+def test_ingest_manifest():
+    """IngestManifest test fonksiyonu"""
+    print("🧪 IngestManifest Testi Başlıyor...")
+
+    try:
+        manifest_path = Path("test_manifest.json")
+        manifest = IngestManifest(str(manifest_path))
+
+        file_path = str(Path("data/test_documents/tck_madde1.txt").resolve())
+        manifest.update(file_path, "abc123", chunk_count=2)
+        manifest.save()
+
+        # Yeniden yükle
+        reloaded = IngestManifest(str(manifest_path))
+        print(f"📄 Kayıt: {reloaded.get(file_path)}")
+        print(f"📂 Dizindeki kayıtlar: {len(reloaded.paths_under('data/test_documents'))}")
+        print(f"🔁 Hash kullanımda mı: {reloaded.hash_in_use('abc123', exclude_path=file_path)}")
+
+        manifest_path.unlink()
+
+        print("✅ IngestManifest testi başarılı!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test hatası: {e}")
+        return False
+
+if __name__ == "__main__":
+    test_ingest_manifest()
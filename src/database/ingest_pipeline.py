@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Aşamalı Ingestion Pipeline - Çıkarma, embedding ve yazma aşamalarını sınırlı kuyruklarla eş zamanlı çalıştırır
+"""
+
+import queue
+import threading
+import time
+from typing import Iterable, Dict, Any, List, Callable
+
+from loguru import logger
+
+# Kuyruklarda akışın bittiğini bildiren işaret
+_DONE = object()
+
+
+class StageStats:
+    """Tek bir aşamanın sayaçları"""
+
+    def __init__(self, name: str):
+        """Başlatma"""
+        self.name = name
+        self.items = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+
+    def as_dict(self, wall_seconds: float) -> Dict[str, Any]:
+        """Rapor için sözlük"""
+        return {
+            'items': self.items,
+            'batches': self.batches,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'items_per_sec': round(self.items / self.busy_seconds, 1) if self.busy_seconds > 0 else 0.0,
+            'utilization': round(self.busy_seconds / wall_seconds, 2) if wall_seconds > 0 else 0.0
+        }
+
+
+class IngestionPipeline:
+    """Chunk akışını extract -> embed -> write aşamalarından geçiren pipeline
+
+    Her aşama kendi thread'inde çalışır ve aşamalar sınırlı kuyruklarla bağlanır:
+    yavaş bir aşama kuyruğu doldurduğunda önceki aşama bekler (backpressure).
+    Çıkarma ve chunk'lama DocumentProcessor'ın süreç havuzunda yapılır; bu aşama
+    o havuzdan gelen chunk'ları batch'ler. Embedding (CPU) ile çıkarma/yazma (I/O)
+    böylece sırayla değil aynı anda ilerler.
+    """
+
+    def __init__(self, chroma_manager, batch_size: int = 256, queue_size: int = 4,
+                 sample_interval: float = 0.2):
+        """Başlatma
+
+        Args:
+            chroma_manager: _prepare_records, encode_texts ve _write_records sağlayan yönetici
+            batch_size: Aşamalar arasında taşınan batch başına chunk sayısı
+            queue_size: Aşamalar arası kuyrukların kapasitesi (batch)
+        """
+        self.chroma_manager = chroma_manager
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.sample_interval = sample_interval
+
+        self.stats = {name: StageStats(name) for name in ('extract', 'embed', 'write')}
+        self.queues = {
+            'extract->embed': queue.Queue(maxsize=queue_size),
+            'embed->write': queue.Queue(maxsize=queue_size)
+        }
+        self._depth_samples = {name: [] for name in self.queues}
+        self._stop = threading.Event()
+        self._errors: List[BaseException] = []
+        self.report: Dict[str, Any] = {}
+
+    def run(self, documents: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Belge akışını işle ve aşama istatistiklerini döndür
+
+        Bir aşama hata verirse pipeline durur ve hata yeniden yükseltilir;
+        o ana kadarki istatistikler self.report'ta kalır.
+        """
+        start_time = time.perf_counter()
+
+        threads = [
+            threading.Thread(target=self._guard, args=(self._extract_stage, documents), name='ingest-extract'),
+            threading.Thread(target=self._guard, args=(self._embed_stage,), name='ingest-embed'),
+            threading.Thread(target=self._guard, args=(self._write_stage,), name='ingest-write')
+        ]
+        for thread in threads:
+            thread.start()
+
+        # Kuyruk derinliklerini örnekle
+        while any(thread.is_alive() for thread in threads):
+            for name, stage_queue in self.queues.items():
+                self._depth_samples[name].append(stage_queue.qsize())
+            threads[-1].join(self.sample_interval)
+
+        for thread in threads:
+            thread.join()
+
+        report = self.report = self._report(time.perf_counter() - start_time)
+        if self._errors:
+            logger.error(f"Ingestion pipeline hatası: {self._errors[0]}")
+            report['error'] = str(self._errors[0])
+        else:
+            logger.success(
+                f"✅ Pipeline tamamlandı: {report['written']} chunk, {report['wall_seconds']}s "
+                f"({report['chunks_per_sec']} chunk/s)"
+            )
+        for name, stage in report['stages'].items():
+            logger.info(f"  {name}: {stage['items']} chunk, {stage['items_per_sec']} chunk/s, "
+                        f"doluluk {stage['utilization']}")
+        for name, depth in report['queues'].items():
+            logger.info(f"  kuyruk {name}: ort. {depth['mean_depth']}, en fazla {depth['max_depth']}/{self.queue_size}")
+
+        if self._errors:
+            raise self._errors[0]
+        return report
+
+    def _guard(self, stage: Callable, *args):
+        """Aşamayı çalıştır; hata olursa diğer aşamaları durdur"""
+        try:
+            stage(*args)
+        except BaseException as e:
+            self._errors.append(e)
+            self._stop.set()
+
+    def _put(self, stage_queue: queue.Queue, item) -> bool:
+        """Kuyruk doluysa bekle (backpressure); pipeline durdurulduysa False döndür"""
+        while not self._stop.is_set():
+            try:
+                stage_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, stage_queue: queue.Queue):
+        """Kuyruktan al; pipeline durdurulduysa _DONE döndür"""
+        while not self._stop.is_set():
+            try:
+                return stage_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _extract_stage(self, documents: Iterable[Dict[str, Any]]):
+        """Chunk akışını batch'lere ayır"""
+        stats = self.stats['extract']
+        output = self.queues['extract->embed']
+        batch = []
+        busy_start = time.perf_counter()
+
+        try:
+            for doc in documents:
+                batch.append(doc)
+                if len(batch) >= self.batch_size:
+                    stats.busy_seconds += time.perf_counter() - busy_start
+                    stats.items += len(batch)
+                    stats.batches += 1
+                    if not self._put(output, batch):
+                        return
+                    batch = []
+                    busy_start = time.perf_counter()
+
+            stats.busy_seconds += time.perf_counter() - busy_start
+            if batch:
+                stats.items += len(batch)
+                stats.batches += 1
+                self._put(output, batch)
+        finally:
+            self._put(output, _DONE)
+
+    def _embed_stage(self):
+        """Batch'leri hazırla ve embedding'lerini oluştur"""
+        stats = self.stats['embed']
+        source, output = self.queues['extract->embed'], self.queues['embed->write']
+
+        try:
+            while True:
+                batch = self._get(source)
+                if batch is _DONE:
+                    return
+
+                busy_start = time.perf_counter()
+                texts, metadatas, ids = self.chroma_manager._prepare_records(batch)
+                if not texts:
+                    continue
+                embeddings = self.chroma_manager.encode_texts(texts)
+                stats.busy_seconds += time.perf_counter() - busy_start
+                stats.items += len(texts)
+                stats.batches += 1
+
+                if not self._put(output, (texts, metadatas, ids, embeddings)):
+                    return
+        finally:
+            self._put(output, _DONE)
+
+    def _write_stage(self):
+        """Embedding'li batch'leri ChromaDB'ye yaz"""
+        stats = self.stats['write']
+        source = self.queues['embed->write']
+
+        while True:
+            item = self._get(source)
+            if item is _DONE:
+                return
+
+            busy_start = time.perf_counter()
+            texts, metadatas, ids, embeddings = item
+            self.chroma_manager._write_records(texts, metadatas, ids, embeddings)
+            stats.busy_seconds += time.perf_counter() - busy_start
+            stats.items += len(texts)
+            stats.batches += 1
+
+    def _report(self, wall_seconds: float) -> Dict[str, Any]:
+        """Aşama ve kuyruk istatistikleri"""
+        written = self.stats['write'].items
+        return {
+            'written': written,
+            'wall_seconds': round(wall_seconds, 3),
+            'chunks_per_sec': round(written / wall_seconds, 1) if wall_seconds > 0 else 0.0,
+            'stages': {name: stage.as_dict(wall_seconds) for name, stage in self.stats.items()},
+            'queues': {
+                name: {
+                    'max_depth': max(samples, default=0),
+                    'mean_depth': round(sum(samples) / len(samples), 2) if samples else 0.0
+                }
+                for name, samples in self._depth_samples.items()
+            }
+        }
+
+
+# Test fonksiyonu
+def test_ingest_pipeline():
+    """IngestionPipeline test fonksiyonu"""
+    print("🧪 Ingestion Pipeline Testi Başlıyor...")
+
+    try:
+        import numpy as np
+
+        class _FakeManager:
+            """Embedding ve yazmayı taklit eden yönetici"""
+
+            def __init__(self):
+                self.written = []
+
+            def _prepare_records(self, documents):
+                texts = [doc['content'] for doc in documents]
+                return texts, [{} for _ in texts], [str(i) for i in range(len(texts))]
+
+            def encode_texts(self, texts):
+                time.sleep(0.01)
+                return np.zeros((len(texts), 4))
+
+            def _write_records(self, texts, metadatas, ids, embeddings):
+                time.sleep(0.005)
+                self.written.extend(texts)
+
+        manager = _FakeManager()
+        documents = ({'content': f"Madde {i}"} for i in range(1000))
+        report = IngestionPipeline(manager, batch_size=32, queue_size=2).run(documents)
+
+        print(f"📄 Yazılan: {report['written']} chunk, {report['chunks_per_sec']} chunk/s")
+        print(f"📊 Kuyruklar: {report['queues']}")
+        assert manager.written == [f"Madde {i}" for i in range(1000)]
+
+        # Yazma hatası run() dışına yükseltilmeli
+        def failing_write(texts, metadatas, ids, embeddings):
+            raise IOError("disk dolu")
+        manager._write_records = failing_write
+        try:
+            IngestionPipeline(manager, batch_size=32).run({'content': f"Madde {i}"} for i in range(100))
+            raise AssertionError("Yazma hatası yükseltilmedi")
+        except IOError as e:
+            print(f"🛑 Yazma hatası yükseltildi: {e}")
+
+        print("✅ Ingestion pipeline testi başarılı!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test hatası: {e}")
+        return False
+
+if __name__ == "__main__":
+    test_ingest_pipeline()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Model Kayıt Defteri - Embedding modelleri ve ChromaDB client'larını süreç içinde paylaştırır
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from loguru import logger
+
+_registry: Dict[Tuple[str, Hashable], Any] = {}
+_lock = threading.RLock()
+
+
+def get_shared(kind: str, key: Hashable, factory: Callable[[], Any]) -> Any:
+    """(kind, key) için tek örnek: ilk çağrıda factory ile oluşturulur, sonra aynısı döner"""
+    with _lock:
+        registry_key = (kind, key)
+        if registry_key not in _registry:
+            _registry[registry_key] = factory()
+        else:
+            logger.debug(f"Paylaşılan {kind} kullanılıyor: {key}")
+        return _registry[registry_key]
+
+
+def get_embedding_model(embedding_config: Dict[str, Any]):
+    """Embedding modeli; aynı model + motor süreçte bir kez yüklenir"""
+    from database.onnx_encoder import load_embedding_model, embedding_model_id
+
+    return get_shared('embedding_model', embedding_model_id(embedding_config),
+                      lambda: load_embedding_model(embedding_config))
+
+
+def get_chroma_client(persist_directory: str):
+    """Persist dizini başına tek ChromaDB PersistentClient"""
+    import chromadb
+
+    path = os.path.abspath(persist_directory)
+    return get_shared('chroma_client', path, lambda: chromadb.PersistentClient(path=path))
+
+
+def clear_registry():
+    """Kayıtlı tüm örnekleri bırak (testler için)"""
+    with _lock:
+        _registry.clear()
+
+
+# Test fonksiyonu
+def test_model_registry():
+    """Model kayıt defteri test fonksiyonu"""
+    print("🧪 Model Kayıt Defteri Testi Başlıyor...")
+
+    try:
+        config = {'model_name': 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2'}
+        first = get_embedding_model(config)
+        second = get_embedding_model(dict(config))
+        print(f"📊 Aynı model örneği: {first is second}")
+
+        client_a = get_chroma_client('./data/chroma_db')
+        client_b = get_chroma_client('data/chroma_db/')
+        print(f"📊 Aynı client örneği: {client_a is client_b}")
+
+        print("✅ Model kayıt defteri testi başarılı!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test hatası: {e}")
+        return False
+
+if __name__ == "__main__":
+    test_model_registry()
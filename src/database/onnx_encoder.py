@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+ONNX Embedding Motoru - Sentence-transformers modelini ONNX Runtime ile (opsiyonel int8) CPU'da çalıştırır
+"""
+
+import re
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+from loguru import logger
+
+_INPUT_NAMES = ('input_ids', 'attention_mask', 'token_type_ids')
+
+
+class OnnxSentenceEncoder:
+    """SentenceTransformer.encode ile uyumlu ONNX Runtime encoder'ı
+
+    İlk kullanımda model ONNX'e aktarılır (ve istenirse dinamik int8 kuantize edilir),
+    sonraki açılışlarda diskteki graf kullanılır. Çıkış, token embedding'lerinin
+    attention mask ile ortalamasıdır (MiniLM paraphrase modellerinin pooling'i).
+    """
+
+    def __init__(self, model_name: str, onnx_dir: str = "./data/onnx_models", quantize: bool = True,
+                 max_seq_length: int = 128, num_threads: int = 0):
+        """Başlatma"""
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.model_name = model_name
+        self.quantize = quantize
+        self.max_seq_length = max_seq_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+        model_dir = Path(onnx_dir) / re.sub(r'[^\w.-]+', '_', model_name)
+        self.model_path = self._ensure_model(model_dir)
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(str(self.model_path), options, providers=['CPUExecutionProvider'])
+        self.input_names = {node.name for node in self.session.get_inputs()}
+
+        logger.info(f"ONNX embedding motoru hazır: {self.model_path.name}")
+
+    def _ensure_model(self, model_dir: Path) -> Path:
+        """ONNX grafını (gerekirse) dışa aktar ve kuantize et"""
+        fp32_path = model_dir / 'model.onnx'
+        int8_path = model_dir / 'model_int8.onnx'
+
+        if not fp32_path.exists():
+            export_onnx(self.model_name, fp32_path, self.max_seq_length)
+
+        if not self.quantize:
+            return fp32_path
+
+        if not int8_path.exists():
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+
+            logger.info("ONNX modeli int8'e kuantize ediliyor...")
+            quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+        return int8_path
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """Embedding boyutu"""
+        return int(self.session.get_outputs()[0].shape[-1])
+
+    def encode(self, sentences, batch_size: int = 32, convert_to_numpy: bool = True,
+               show_progress_bar: bool = False, normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        """Cümleleri encode et (SentenceTransformer.encode imzasının kullanılan kısmı)"""
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        outputs = []
+        for start in range(0, len(sentences), batch_size):
+            outputs.append(self._encode_batch(list(sentences[start:start + batch_size])))
+
+        embeddings = np.vstack(outputs) if outputs else np.empty((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+        if normalize_embeddings:
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Tek batch: tokenize, çalıştır, mean pooling"""
+        encoded = self.tokenizer(
+            texts, padding=True, truncation=True, max_length=self.max_seq_length, return_tensors='np'
+        )
+        feeds = {name: encoded[name].astype(np.int64) for name in _INPUT_NAMES if name in self.input_names and name in encoded}
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        mask = encoded['attention_mask'][..., None].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        return (summed / np.clip(mask.sum(axis=1), 1e-9, None)).astype(np.float32)
+
+
+def export_onnx(model_name: str, output_path: Path, max_seq_length: int = 128):
+    """Transformer gövdesini dinamik batch/uzunluk eksenleriyle ONNX'e aktar"""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    logger.info(f"ONNX'e aktarılıyor: {model_name}")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name)
+    model.eval()
+
+    sample = tokenizer(["Örnek cümle"], padding='max_length', max_length=max_seq_length,
+                       truncation=True, return_tensors='pt')
+    input_names = [name for name in _INPUT_NAMES if name in sample]
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            str(output_path),
+            input_names=input_names,
+            output_names=['last_hidden_state'],
+            dynamic_axes=dynamic_axes,
+            opset_version=14
+        )
+
+
+def load_embedding_model(embedding_config: Dict[str, Any]):
+    """Config'e göre embedding modeli: 'torch' (SentenceTransformer) veya 'onnx'"""
+    model_name = embedding_config['model_name']
+    backend = embedding_config.get('backend', 'torch')
+
+    if backend == 'onnx':
+        try:
+            return OnnxSentenceEncoder(
+                model_name,
+                onnx_dir=embedding_config.get('onnx_dir', './data/onnx_models'),
+                quantize=embedding_config.get('onnx_quantize', True),
+                max_seq_length=embedding_config.get('max_seq_length', 128),
+                num_threads=embedding_config.get('onnx_threads', 0)
+            )
+        except ImportError as e:
+            logger.warning(f"ONNX motoru kullanılamıyor ({e}), PyTorch'a dönülüyor")
+    elif backend != 'torch':
+        logger.warning(f"Bilinmeyen embedding motoru: {backend}, PyTorch kullanılacak")
+
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+def embedding_model_id(embedding_config: Dict[str, Any], model=None) -> str:
+    """Önbellek anahtarları için model + motor kimliği (farklı motorların vektörleri karışmasın)
+
+    model verilirse kimlik gerçekten yüklenen encoder'dan çıkarılır: ONNX istenip
+    onnxruntime bulunamadığında PyTorch'a dönülen model PyTorch kimliğini alır.
+    Verilmezse kimlik config'teki isteğe göredir (model kayıt anahtarı).
+    """
+    model_name = embedding_config['model_name']
+    if model is not None:
+        if isinstance(model, OnnxSentenceEncoder):
+            return f"{model_name}@onnx-{'int8' if model.quantize else 'fp32'}"
+        return model_name
+    if embedding_config.get('backend', 'torch') == 'onnx':
+        return f"{model_name}@onnx-{'int8' if embedding_config.get('onnx_quantize', True) else 'fp32'}"
+    return model_name
+
+
+def embedding_parity(model_name: str, texts: List[str], quantize: bool = True,
+                     onnx_dir: str = "./data/onnx_models", max_seq_length: int = 128) -> Dict[str, Any]:
+    """ONNX vektörlerinin PyTorch vektörleriyle kosinüs uyumu ve hız karşılaştırması"""
+    import time
+    from sentence_transformers import SentenceTransformer
+
+    torch_model = SentenceTransformer(model_name)
+    torch_model.max_seq_length = max_seq_length
+    onnx_model = OnnxSentenceEncoder(model_name, onnx_dir=onnx_dir, quantize=quantize, max_seq_length=max_seq_length)
+
+    start_time = time.perf_counter()
+    reference = torch_model.encode(texts, convert_to_numpy=True)
+    torch_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    candidate = onnx_model.encode(texts)
+    onnx_seconds = time.perf_counter() - start_time
+
+    cosine = (reference * candidate).sum(axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1) + 1e-12
+    )
+    return {
+        'texts': len(texts),
+        'quantized': quantize,
+        'mean_cosine': float(cosine.mean()),
+        'min_cosine': float(cosine.min()),
+        'p05_cosine': float(np.percentile(cosine, 5)),
+        'torch_seconds': round(torch_seconds, 3),
+        'onnx_seconds': round(onnx_seconds, 3),
+        'speedup': round(torch_seconds / onnx_seconds, 2) if onnx_seconds > 0 else 0.0
+    }
+
+
+# Test fonksiyonu
+def test_onnx_encoder():
+    """ONNX encoder parity testi"""
+    print("🧪 ONNX Encoder Testi Başlıyor...")
+
+    try:
+        texts = [
+            "Türk Ceza Kanunu madde 1: Bu Kanunun amacı, suç teşkil eden fiilleri göstermektir.",
+            "Türk Medeni Kanunu madde 1: Kanun, lafzı veya ruhu ile bir hükme bağlamış olduğu hallerde uygulanır.",
+            "Kiracı, kira bedelini zamanında ödemekle yükümlüdür."
+        ]
+        report = embedding_parity('sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2', texts)
+        print(f"📊 Ortalama kosinüs: {report['mean_cosine']:.4f}, en düşük: {report['min_cosine']:.4f}")
+        print(f"⏱️ Hızlanma: {report['speedup']}x")
+
+        print("✅ ONNX encoder testi başarılı!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test hatası: {e}")
+        return False
+
+if __name__ == "__main__":
+    test_onnx_encoder()
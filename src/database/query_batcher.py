@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Sorgu Mikro-Batcher - Eş zamanlı gelen istekleri kısa bir pencerede toplayıp tek çağrıda işler
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Tuple
+
+from loguru import logger
+
+
+class MicroBatcher:
+    """Eş zamanlı istekleri batch'leyen arka plan thread'i
+
+    submit() bir Future döndürür. İlk istek geldiğinde pencere açılır; pencere
+    max_wait_ms dolana ya da max_batch_size istek birikene kadar beklenir, sonra
+    process_fn tüm istek listesiyle bir kez çağrılır ve sonuçlar sırayla
+    Future'lara dağıtılır. Tek istek varken ek gecikme en fazla max_wait_ms olur.
+    """
+
+    def __init__(self, process_fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 16,
+                 max_wait_ms: float = 5.0, name: str = "micro-batcher"):
+        """Başlatma"""
+        self.process_fn = process_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+
+        self.batches = 0
+        self.items = 0
+
+        self._queue: "queue.Queue[Tuple[Any, Future]]" = queue.Queue()
+        self._stop = threading.Event()
+        # submit'teki kontrol+put ile close'taki durdurma arasına girilmesin
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """İsteği kuyruğa ekle"""
+        future = Future()
+        with self._lock:
+            if not self._stop.is_set():
+                self._queue.put((item, future))
+                return future
+        future.set_exception(RuntimeError(f"{self.name} kapatıldı"))
+        return future
+
+    def _collect(self) -> List[Tuple[Any, Future]]:
+        """İlk isteği bekle, pencere boyunca gelenleri ekle"""
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """Batch döngüsü"""
+        while not self._stop.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+
+            items = [item for item, _ in batch]
+            try:
+                results = self.process_fn(items)
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                logger.error(f"{self.name} batch hatası: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+            self.batches += 1
+            self.items += len(batch)
+
+    def stats(self) -> dict:
+        """Batch istatistikleri"""
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'mean_batch_size': round(self.items / self.batches, 2) if self.batches else 0.0
+        }
+
+    def close(self):
+        """Thread'i durdur, bekleyen isteklere hata döndür
+
+        Durdurma kilit altında yapıldığı için sonrasında kuyruğa yeni istek
+        girmez; boşaltılan kuyrukta kalan her Future sonuçlanır.
+        """
+        with self._lock:
+            self._stop.set()
+        self._thread.join()
+        while True:
+            try:
+                _, future = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            future.set_exception(RuntimeError(f"{self.name} kapatıldı"))
+
+
+# Test fonksiyonu
+def test_query_batcher():
+    """MicroBatcher test fonksiyonu"""
+    print("🧪 Mikro-Batcher Testi Başlıyor...")
+
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+
+        calls = []
+
+        def process(items):
+            calls.append(len(items))
+            return [item.upper() for item in items]
+
+        batcher = MicroBatcher(process, max_batch_size=8, max_wait_ms=20)
+        queries = [f"soru {i}" for i in range(20)]
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            results = list(executor.map(lambda q: batcher.submit(q).result(), queries))
+        batcher.close()
+
+        assert results == [q.upper() for q in queries]
+        print(f"📊 {len(queries)} istek, {len(calls)} çağrı: {calls}")
+
+        # close ile yarışan submit'lerin hepsi sonuç ya da hata almalı
+        for _ in range(20):
+            batcher = MicroBatcher(process, max_batch_size=8, max_wait_ms=1)
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                pending = [executor.submit(batcher.submit, q) for q in queries]
+                batcher.close()
+                futures = [p.result() for p in pending]
+            for future in futures:
+                future.exception(timeout=1)
+        print("🔒 close ile yarışan istekler sonuçlandı")
+
+        print("✅ Mikro-batcher testi başarılı!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test hatası: {e}")
+        return False
+
+if __name__ == "__main__":
+    test_query_batcher()
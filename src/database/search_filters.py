@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Arama Filtreleri - Yapılandırılmış filtreleri ChromaDB where / where_document koşullarına çevirir
+"""
+
+import json
+from datetime import datetime, date
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
+
+# Değer sözlüğünde kullanılabilen karşılaştırmalar: {"article_no": {"gte": 10, "lte": 20}}
+_OPERATORS = {
+    'eq': '$eq', 'ne': '$ne', 'gt': '$gt', 'gte': '$gte', 'lt': '$lt', 'lte': '$lte', 'in': '$in', 'nin': '$nin'
+}
+
+# Zaman aralığı filtreleri sayısal timestamp_epoch alanına uygulanır (ChromaDB aralık karşılaştırması sayı ister)
+TIMESTAMP_FIELD = 'timestamp_epoch'
+_TIMESTAMP_BOUNDS = {'timestamp_from': '$gte', 'timestamp_to': '$lte'}
+
+# Metin içinde geçmesi gereken ifade(ler) -> where_document
+CONTAINS_KEY = 'contains'
+
+
+def to_epoch(value: Union[str, int, float, datetime, date, None]) -> Optional[float]:
+    """ISO tarih/zaman, datetime ya da sayıyı Unix zamanına çevir (çevrilemezse None)"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day).timestamp()
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
+
+
+def _condition(field: str, value: Any) -> Dict[str, Any]:
+    """Tek alan koşulu"""
+    if isinstance(value, dict):
+        conditions = []
+        for operator, operand in value.items():
+            chroma_operator = _OPERATORS.get(operator.lstrip('$'))
+            if chroma_operator is None:
+                raise ValueError(f"Bilinmeyen filtre karşılaştırması: {field}.{operator}")
+            conditions.append({field: {chroma_operator: operand}})
+        return conditions[0] if len(conditions) == 1 else {'$and': conditions}
+    if isinstance(value, (list, tuple, set)):
+        values = list(value)
+        if not values:
+            raise ValueError(f"Boş filtre listesi: {field}")
+        return {field: {'$eq': values[0]}} if len(values) == 1 else {field: {'$in': values}}
+    return {field: {'$eq': value}}
+
+
+def _combine(conditions: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Koşulları $and ile birleştir"""
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {'$and': conditions}
+
+
+def build_where(filters: Optional[Dict[str, Any]],
+                metadata_keys: Iterable[str]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Filtre sözlüğünden (where, where_document)
+
+    Değer tek ise eşitlik, liste ise $in, sözlük ise karşılaştırma ({"gte": 3})
+    olarak çevrilir. timestamp_from / timestamp_to aralığı ve contains metin
+    koşulu ayrıca desteklenir. Bilinmeyen alanlar ValueError verir.
+    """
+    if not filters:
+        return None, None
+
+    allowed = set(metadata_keys)
+    where_conditions = []
+    document_conditions = []
+
+    for key, value in filters.items():
+        if value is None:
+            continue
+        if key in _TIMESTAMP_BOUNDS:
+            epoch = to_epoch(value)
+            if epoch is None:
+                raise ValueError(f"Geçersiz tarih: {key}={value}")
+            where_conditions.append({TIMESTAMP_FIELD: {_TIMESTAMP_BOUNDS[key]: epoch}})
+        elif key == CONTAINS_KEY:
+            phrases = [value] if isinstance(value, str) else list(value)
+            document_conditions.extend({'$contains': phrase} for phrase in phrases if phrase)
+        elif key in allowed:
+            where_conditions.append(_condition(key, value))
+        else:
+            raise ValueError(f"Filtrelenemeyen alan: {key} (izin verilenler: {', '.join(sorted(allowed))})")
+
+    return _combine(where_conditions), _combine(document_conditions)
+
+
+def filter_key(where: Optional[Dict[str, Any]], where_document: Optional[Dict[str, Any]]) -> str:
+    """Aynı filtreli sorguları gruplamak için kararlı anahtar"""
+    return json.dumps([where, where_document], sort_keys=True, ensure_ascii=False)
+
+
+# Test fonksiyonu
+def test_search_filters():
+    """Arama filtreleri test fonksiyonu"""
+    print("🧪 Arama Filtreleri Testi Başlıyor...")
+
+    try:
+        metadata_keys = ('filename', 'file_type', 'law_title', 'article_no', 'article_kind')
+        where, where_document = build_where({
+            'filename': 'icra_iflas_kanunu.txt',
+            'file_type': ['.pdf', '.docx'],
+            'article_no': {'gte': 1, 'lte': 10},
+            'timestamp_from': '2025-01-01',
+            'contains': 'ödeme emri'
+        }, metadata_keys)
+        print(f"📋 where: {where}")
+        print(f"📄 where_document: {where_document}")
+
+        try:
+            build_where({'yazar': 'x'}, metadata_keys)
+        except ValueError as e:
+            print(f"🚫 {e}")
+
+        print("✅ Arama filtreleri testi başarılı!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test hatası: {e}")
+        return False
+
+if __name__ == "__main__":
+    test_search_filters()
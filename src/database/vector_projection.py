@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Vektör Projeksiyonu - Korpus üzerinde eğitilen PCA ile embedding boyutunu küçültür, recall/boyut raporu üretir
+"""
+
+import os
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+from loguru import logger
+
+
+class PCAProjection:
+    """Korpus vektörleriyle eğitilen doğrusal PCA projeksiyonu
+
+    Yazarken ve sorgularken aynı projeksiyon uygulanmalıdır; koleksiyondaki
+    vektörlerin boyutu projeksiyon boyutuna eşit olur.
+    """
+
+    def __init__(self, mean: np.ndarray, components: np.ndarray, explained_variance: float = 0.0,
+                 model_id: str = ""):
+        """Başlatma"""
+        self.mean = mean.astype(np.float32)
+        self.components = components.astype(np.float32)
+        self.explained_variance = explained_variance
+        self.model_id = model_id
+
+    @property
+    def input_dim(self) -> int:
+        return self.components.shape[1]
+
+    @property
+    def output_dim(self) -> int:
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(cls, vectors: np.ndarray, dim: int, model_id: str = "") -> "PCAProjection":
+        """Vektörlerden ilk dim temel bileşeni çıkar"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if dim >= vectors.shape[1]:
+            raise ValueError(f"Projeksiyon boyutu ({dim}) vektör boyutundan ({vectors.shape[1]}) küçük olmalı")
+        if len(vectors) < dim:
+            raise ValueError(f"PCA için en az {dim} vektör gerekli, {len(vectors)} var")
+
+        mean = vectors.mean(axis=0)
+        _, singular_values, vt = np.linalg.svd(vectors - mean, full_matrices=False)
+        variance = singular_values ** 2
+        explained = float(variance[:dim].sum() / variance.sum())
+        return cls(mean, vt[:dim], explained, model_id)
+
+    def transform(self, vectors: np.ndarray) -> np.ndarray:
+        """Vektörleri projeksiyon uzayına taşı"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        return (vectors - self.mean) @ self.components.T
+
+    def save(self, path: str):
+        """Projeksiyonu .npz olarak kaydet"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, mean=self.mean, components=self.components,
+                 explained_variance=self.explained_variance, model_id=self.model_id)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "PCAProjection":
+        """Kaydedilmiş projeksiyonu yükle"""
+        data = np.load(path)
+        return cls(data['mean'], data['components'], float(data['explained_variance']), str(data['model_id']))
+
+
+def _to_space(vectors: np.ndarray, space: str) -> np.ndarray:
+    """Vektörleri koleksiyonun arama uzayına taşı: cosine/ip için birim uzunluk
+
+    Birim vektörlerde L2 en yakın komşuları kosinüs ve iç çarpım sıralamasıyla aynıdır.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if space in ('cosine', 'ip'):
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.clip(norms, 1e-12, None)
+    return vectors
+
+
+def _top_k(base: np.ndarray, queries: np.ndarray, k: int, exclude: Optional[np.ndarray] = None,
+           block_size: int = 256) -> np.ndarray:
+    """Kaba kuvvet L2 en yakın k komşu (satır indeksleri)"""
+    base_norms = (base.astype(np.float32) ** 2).sum(axis=1)
+    neighbours = np.empty((len(queries), k), dtype=np.int64)
+
+    for start in range(0, len(queries), block_size):
+        block = queries[start:start + block_size].astype(np.float32)
+        distances = base_norms[None, :] - 2.0 * block @ base.astype(np.float32).T
+        if exclude is not None:
+            distances[np.arange(len(block)), exclude[start:start + block_size]] = np.inf
+        candidates = np.argpartition(distances, k, axis=1)[:, :k]
+        order = np.take_along_axis(distances, candidates, axis=1).argsort(axis=1)
+        neighbours[start:start + block_size] = np.take_along_axis(candidates, order, axis=1)
+    return neighbours
+
+
+def _recall(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """Ortalama recall@k"""
+    k = reference.shape[1]
+    hits = sum(len(set(ref) & set(cand)) for ref, cand in zip(reference, candidate))
+    return hits / (len(reference) * k)
+
+
+def recall_report(vectors: np.ndarray, dims: List[int], k: int = 10, n_queries: int = 200,
+                  seed: int = 0, space: str = 'l2') -> List[Dict[str, Any]]:
+    """Tam hassasiyetli float32 aramaya göre float16 ve PCA seçeneklerinin recall@k / boyut tablosu
+
+    Sorgu olarak korpustan rastgele vektörler kullanılır (kendisi sonuçtan çıkarılır).
+    PCA korpusun tamamıyla eğitilir; raporun amacı boyut seçimi için göreli karşılaştırmadır.
+    Referans ve adaylar koleksiyonun mesafe uzayında (space) aranır: cosine/ip
+    koleksiyonda vektörler projeksiyondan önce ve sonra normalize edildiği için PCA
+    normalize vektörlerle eğitilir, çıktısı da normalize edilir (float16 yuvarlaması
+    normalizasyondan sonra).
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    rng = np.random.RandomState(seed)
+    query_rows = rng.choice(len(vectors), size=min(n_queries, len(vectors)), replace=False)
+    k = min(k, len(vectors) - 1)
+
+    full = _to_space(vectors, space)
+    reference = _top_k(full, full[query_rows], k, exclude=query_rows)
+    full_dim = vectors.shape[1]
+    rows = []
+
+    def add_row(name, dim, bytes_per_value, base, extra=None):
+        candidate = _top_k(base, base[query_rows], k, exclude=query_rows)
+        row = {
+            'variant': name,
+            'dim': dim,
+            'bytes_per_vector': dim * bytes_per_value,
+            'size_ratio': round(dim * bytes_per_value / (full_dim * 4), 3),
+            'recall_at_k': round(_recall(reference, candidate), 4)
+        }
+        row.update(extra or {})
+        rows.append(row)
+
+    add_row('float32', full_dim, 4, full)
+    add_row('float16', full_dim, 2, full.astype(np.float16).astype(np.float32))
+
+    for dim in sorted(set(dims), reverse=True):
+        if dim >= full_dim or dim > len(vectors):
+            logger.warning(f"PCA boyutu atlandı: {dim}")
+            continue
+        projection = PCAProjection.fit(full, dim)
+        projected = _to_space(projection.transform(full), space)
+        extra = {'explained_variance': round(projection.explained_variance, 4)}
+        add_row(f'pca-{dim}', dim, 4, projected, extra)
+        add_row(f'pca-{dim}+float16', dim, 2, projected.astype(np.float16).astype(np.float32), extra)
+
+    return rows
+
+
+# Test fonksiyonu
+def test_vector_projection():
+    """Vektör projeksiyonu test fonksiyonu"""
+    print("🧪 Vektör Projeksiyonu Testi Başlıyor...")
+
+    try:
+        rng = np.random.RandomState(42)
+        # Düşük boyutlu bir yapının 384 boyuta gömülmüş hali
+        latent = rng.randn(2000, 48)
+        vectors = latent @ rng.randn(48, 384) + 0.05 * rng.randn(2000, 384)
+
+        for space in ('l2', 'cosine'):
+            for row in recall_report(vectors, dims=[128, 64, 32], k=10, n_queries=100, space=space):
+                print(f"📊 {space:<6} {row['variant']:<18} {row['bytes_per_vector']:>6} B  "
+                      f"recall@10={row['recall_at_k']:.3f}")
+
+        print("✅ Vektör projeksiyonu testi başarılı!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test hatası: {e}")
+        return False
+
+if __name__ == "__main__":
+    test_vector_projection()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Token Chunker - Metni embedding modelinin token bütçesine göre parçalara böler
+"""
+
+import re
+from typing import List, Dict, Any, Iterable, Iterator, Tuple, Optional
+
+from loguru import logger
+
+# Tokenizer yüklenemezse kullanılan yaklaşık tokenizasyon:
+# kelimeleri en fazla 4 karakterlik parçalara böler (Türkçe alt-kelime token'larına yakın)
+_FALLBACK_TOKEN_PATTERN = re.compile(r'\w{1,4}|[^\w\s]')
+
+# Tokenizer'a tek seferde verilen en fazla karakter; offset listesi bu pencereyle sınırlı kalır
+TOKENIZE_WINDOW_CHARS = 64 * 1024
+
+
+class TokenChunker:
+    """Embedding modelinin tokenizer'ı ile token bütçeli chunker
+
+    Metin boşluklardan kesilen pencereler halinde tokenize edilir, chunk'lar
+    token offset'leri üzerinden kesilir. Bellekte yalnızca işlenmekte olan
+    pencerenin token'ları tutulur; çok büyük metinlerde de süre doğrusal kalır
+    ve her adım ileri gider.
+    """
+
+    def __init__(self, model_name: str, max_tokens: int = 128, overlap_tokens: int = 32,
+                 model_max_length: Optional[int] = None, window_chars: int = TOKENIZE_WINDOW_CHARS):
+        """Başlatma
+
+        Args:
+            max_tokens: Chunk başına token bütçesi (özel token'lar dahil)
+            overlap_tokens: Ardışık chunk'lar arasındaki token örtüşmesi
+            model_max_length: Modelin kırpma sınırı; bunu aşan chunk'lar "truncated" sayılır
+            window_chars: Tokenizer'a tek çağrıda verilen en fazla karakter
+        """
+        self.model_name = model_name
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.model_max_length = model_max_length or max_tokens
+        self.window_chars = window_chars
+        self._tokenizer = None
+        self._tokenizer_loaded = False
+        self.special_tokens = 0
+
+    def _get_tokenizer(self):
+        """Tokenizer'ı ilk kullanımda yükle"""
+        if not self._tokenizer_loaded:
+            self._tokenizer_loaded = True
+            try:
+                from transformers import AutoTokenizer
+                self._tokenizer = AutoTokenizer.from_pretrained(self.model_name, use_fast=True)
+                # [CLS]/[SEP] gibi özel token'lar da bütçeden düşer
+                self.special_tokens = self._tokenizer.num_special_tokens_to_add()
+                logger.info(f"Chunker tokenizer yüklendi: {self.model_name}")
+            except Exception as e:
+                logger.warning(f"Tokenizer yüklenemedi, yaklaşık tokenizasyon kullanılacak: {e}")
+                self._tokenizer = None
+                self.special_tokens = 2
+        return self._tokenizer
+
+    @property
+    def budget(self) -> int:
+        """Özel token'lar düşüldükten sonra chunk başına token bütçesi"""
+        self._get_tokenizer()
+        return max(self.max_tokens - self.special_tokens, 1)
+
+    def _tokenize(self, text: str, offset: int = 0) -> List[Tuple[int, int]]:
+        """Tek pencerenin token'larının karakter aralıkları (offset eklenmiş)"""
+        tokenizer = self._get_tokenizer()
+        if tokenizer is not None:
+            encoding = tokenizer(
+                text,
+                add_special_tokens=False,
+                return_offsets_mapping=True,
+                return_attention_mask=False,
+                verbose=False
+            )
+            return [(offset + start, offset + end) for start, end in encoding['offset_mapping'] if end > start]
+
+        return [(offset + start, offset + end) for start, end in
+                (match.span() for match in _FALLBACK_TOKEN_PATTERN.finditer(text))]
+
+    def _window_cut(self, text: str, final: bool) -> int:
+        """Tokenize edilebilecek önek uzunluğu: pencereyi aşmadan son boşluğa kadar
+
+        Token'lar boşluk aşmadığından kesim noktasında bölünen token olmaz.
+        Son parçada metnin tamamı, boşluksuz uzun metinde pencere sınırı kullanılır.
+        """
+        if final and len(text) <= self.window_chars:
+            return len(text)
+        limit = min(len(text), self.window_chars)
+        cut = max(text.rfind(' ', 0, limit), text.rfind('\n', 0, limit)) + 1
+        if cut:
+            return cut
+        return limit if len(text) >= self.window_chars or final else 0
+
+    def iter_token_spans(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Metindeki token'ların karakter aralıkları (pencere pencere tokenize edilir)"""
+        position = 0
+        while position < len(text):
+            cut = self._window_cut(text[position:position + self.window_chars + 1],
+                                   final=len(text) - position <= self.window_chars)
+            yield from self._tokenize(text[position:position + cut], position)
+            position += cut
+
+    def token_spans(self, text: str) -> List[Tuple[int, int]]:
+        """Metindeki token'ların karakter aralıkları"""
+        return list(self.iter_token_spans(text))
+
+    def count_tokens(self, text: str) -> int:
+        """Metnin token sayısı (özel token'lar dahil)"""
+        return sum(1 for _ in self.iter_token_spans(text)) + self.special_tokens
+
+    def split(self, text: str) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """Metni token bütçeli chunk'lara böl
+
+        Returns:
+            (chunk listesi, istatistikler). Her chunk: text, start, end, token_count, truncated
+        """
+        stats = {'chunks': 0, 'tokens': 0, 'truncated': 0}
+        chunks = list(self.iter_chunks([text], stats))
+        return chunks, stats
+
+    def iter_chunks(self, blocks: Iterable[str], stats: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+        """Sırayla gelen metin bloklarını (bitişik metin parçaları) token bütçeli chunk'lara böl
+
+        Bloklar birleşik tek metin gibi işlenir; chunk offset'leri bu birleşik
+        metne göredir. Bellekte yalnızca henüz chunk'lanmamış token'lar ve son
+        chunk'ın örtüşme penceresi kalır.
+        """
+        if stats is None:
+            stats = {'chunks': 0, 'tokens': 0, 'truncated': 0}
+        budget = self.budget
+        overlap = min(self.overlap_tokens, budget - 1)
+
+        buffer = ""           # Tutulan metin (ilk karakterinin mutlak offset'i: base)
+        base = 0
+        untokenized = 0       # Henüz tokenize edilmemiş kısmın mutlak offset'i
+        spans: List[Tuple[int, int]] = []
+        start = 0
+
+        def tokenize_window(final: bool) -> bool:
+            """Tutulan metnin bir sonraki penceresini tokenize et; ilerleme yoksa False"""
+            nonlocal untokenized
+            offset = untokenized - base
+            if offset >= len(buffer):
+                return False
+            remaining = buffer[offset:offset + self.window_chars + 1]
+            cut = self._window_cut(remaining, final=final and len(buffer) - offset <= self.window_chars)
+            if not cut:
+                return False
+            spans.extend(self._tokenize(remaining[:cut], untokenized))
+            untokenized += cut
+            return True
+
+        def release():
+            """Chunk'lanmış token'ları ve (yarıdan fazlaysa) metinlerini bırak"""
+            nonlocal buffer, base, start
+            # Kelime sınırı araması için bir önceki token tutulur
+            keep = max(start - 1, 0)
+            if not keep:
+                return
+            stats['tokens'] += keep
+            del spans[:keep]
+            start -= keep
+            trim = spans[0][0] - base if spans else untokenized - base
+            if trim * 2 > len(buffer):
+                buffer = buffer[trim:]
+                base += trim
+
+        def emit(final: bool) -> Iterator[Dict[str, Any]]:
+            nonlocal start
+            n = len(spans)
+            # Son blok gelmeden, kesim kontrolü için bütçeden bir fazla token gerekir
+            while start < n and (final or start + budget < n):
+                end = min(start + budget, n)
+
+                if end < n:
+                    # Kelime ortasında kesilmesin: kesimi bir kelime başına çek
+                    cut = self._word_boundary(spans, start, end, min_end=start + budget // 2)
+                    if cut is not None:
+                        end = cut
+
+                chunk = self._make_chunk(buffer, base, spans, start, end)
+                stats['chunks'] += 1
+                stats['truncated'] += chunk['truncated']
+                yield chunk
+
+                if end >= n:
+                    start = n
+                    break
+
+                # Overlap ile bir sonraki chunk'a geç - her adımda en az bir token ilerle
+                next_start = max(end - overlap, start + 1)
+                # Sonraki chunk da kelime başından başlasın (yakında kelime başı yoksa olduğu gibi kalır)
+                boundary = self._word_boundary(spans, start, next_start, min_end=next_start - budget // 4)
+                start = boundary if boundary is not None else next_start
+
+        for block in blocks:
+            if not block:
+                continue
+            buffer += block
+            while tokenize_window(final=False):
+                yield from emit(final=False)
+                release()
+
+        while tokenize_window(final=True):
+            yield from emit(final=False)
+            release()
+        yield from emit(final=True)
+        stats['tokens'] += len(spans)
+
+    @staticmethod
+    def _word_boundary(spans: List[Tuple[int, int]], start: int, end: int, min_end: int) -> Optional[int]:
+        """end'den geriye doğru (start'tan sonra, min_end'den önce olmadan) önünde boşluk olan ilk token indeksini bul"""
+        for i in range(end, max(min_end, start + 1) - 1, -1):
+            if spans[i][0] > spans[i - 1][1]:
+                return i
+        return None
+
+    def _make_chunk(self, text: str, base: int, spans: List[Tuple[int, int]], start: int, end: int) -> Dict[str, Any]:
+        """Token aralığından chunk kaydı oluştur (text, mutlak offset'i base olan tutulan metin)"""
+        char_start = spans[start][0]
+        char_end = spans[end - 1][1]
+        token_count = end - start + self.special_tokens
+
+        return {
+            'text': text[char_start - base:char_end - base],
+            'start': char_start,
+            'end': char_end,
+            'token_count': token_count,
+            'truncated': token_count > self.model_max_length
+        }
+
+
+# Test fonksiyonu
+def test_token_chunker():
+    """TokenChunker test fonksiyonu"""
+    print("🧪 TokenChunker Testi Başlıyor...")
+
+    try:
+        chunker = TokenChunker(
+            'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2',
+            max_tokens=64,
+            overlap_tokens=16
+        )
+
+        text = "Bu Kanunun amacı, suç teşkil eden fiilleri ve bunlara uygulanacak cezaları göstermektir. " * 50
+        chunks, stats = chunker.split(text)
+
+        print(f"✅ {stats['chunks']} chunk, {stats['tokens']} token, {stats['truncated']} kırpılmış")
+        print(f"📄 İlk chunk ({chunks[0]['token_count']} token): {chunks[0]['text'][:100]}...")
+
+        print("✅ TokenChunker testi başarılı!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test hatası: {e}")
+        return False
+
+if __name__ == "__main__":
+    test_token_chunker()
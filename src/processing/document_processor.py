@@ -3,27 +3,88 @@
 Belge İşleyici - PDF, DOCX, TXT dosyalarını işler ve parçalara böler
 """
 
+import codecs
+import hashlib
+import mmap
 import os
 import re
+import sys
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from itertools import chain, islice
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from pathlib import Path
 
 # Belge okuma kütüphaneleri
-import PyPDF2
 from docx import Document
 import yaml
 from loguru import logger
 
+# Local imports
+sys.path.append('src')
+from processing.chunker import TokenChunker
+from processing.docx_reader import iter_docx_blocks
+from processing.legal_splitter import LegalStructureSplitter
+from processing.pdf_backends import PDF_BACKENDS, DEFAULT_PDF_BACKEND, get_pdf_backend
+
+# TXT okuma: encoding tespiti için örnek boyutu ve çözme bloğu
+TXT_SAMPLE_BYTES = 64 * 1024
+TXT_BLOCK_BYTES = 1024 * 1024
+# Örnekten sonra çözme hatası çıkarsa sırayla denenecek encoding'ler
+TXT_FALLBACK_ENCODINGS = ('utf-8-sig', 'utf-8', 'cp1254', 'iso-8859-9')
+
+# Yapı bazlı bölücünün chunk'lara eklediği metadata alanları
+STRUCTURE_METADATA_KEYS = ('law_title', 'section', 'article_no', 'article_kind', 'paragraph')
+
+
+# Süreç havuzundaki her worker kendi DocumentProcessor örneğini tutar
+_worker_processor = None
+
+
+def _init_worker(config_path: str):
+    """Worker süreci başlat (süreç başına bir kez)"""
+    global _worker_processor
+    _worker_processor = DocumentProcessor(config_path)
+
+
+def _process_file_in_worker(file_path: str) -> List[Dict[str, Any]]:
+    """Worker içinde tek dosya işle"""
+    return _worker_processor.process_file(file_path)
+
+
+def _extract_pdf_page_range(file_path: str, start: int, end: int, backend_name: str) -> List[str]:
+    """PDF'in [start, end) sayfa aralığından metin çıkar (worker içinde çalışır)"""
+    return PDF_BACKENDS[backend_name]().extract_pages(file_path, start, end)
+
+
 class DocumentProcessor:
     """Belge işleme sınıfı"""
     
     def __init__(self, config_path: str = "config/config.yaml"):
         """Başlatma"""
+        self.config_path = config_path
         self.config = self._load_config(config_path)
         self.supported_formats = self.config['document_processing']['supported_formats']
-        self.chunk_size = self.config['embedding']['chunk_size']
-        self.chunk_overlap = self.config['embedding']['chunk_overlap']
+        embedding_config = self.config['embedding']
+        self.chunker = TokenChunker(
+            embedding_config['model_name'],
+            max_tokens=embedding_config.get('max_tokens', 128),
+            overlap_tokens=embedding_config.get('chunk_overlap_tokens', 32),
+            model_max_length=embedding_config.get('max_seq_length', 128)
+        )
+        self.chunking_strategy = self.config['document_processing'].get('chunking_strategy', 'token')
+        self.legal_splitter = LegalStructureSplitter(self.chunker)
+        self.max_workers = self.config['document_processing'].get('max_workers', 1) or os.cpu_count() or 1
+        self.pdf_page_workers = self.config['document_processing'].get('pdf_page_workers', 1) or os.cpu_count() or 1
+        self.pdf_pages_per_task = self.config['document_processing'].get('pdf_pages_per_task', 32)
+        self.pdf_parallel_min_pages = self.config['document_processing'].get('pdf_parallel_min_pages', 64)
+        self.docx_fast_path = self.config['document_processing'].get('docx_fast_path', True)
+        self.pdf_backend = get_pdf_backend(self.config['document_processing'].get('pdf_backend', DEFAULT_PDF_BACKEND))
         
         logger.info(f"DocumentProcessor başlatıldı - Desteklenen formatlar: {self.supported_formats}")
     
@@ -36,24 +97,43 @@ class DocumentProcessor:
             logger.error(f"Config yüklenemedi: {e}")
             # Varsayılan değerler
             return {
-                'document_processing': {'supported_formats': ['.pdf', '.docx', '.txt']},
-                'embedding': {'chunk_size': 1000, 'chunk_overlap': 200}
+                'document_processing': {
+                    'supported_formats': ['.pdf', '.docx', '.txt'],
+                    'max_workers': 1,
+                    'chunking_strategy': 'token'
+                },
+                'embedding': {
+                    'model_name': 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2',
+                    'max_tokens': 128,
+                    'chunk_overlap_tokens': 32,
+                    'max_seq_length': 128
+                }
             }
     
     def process_file(self, file_path: str) -> List[Dict[str, Any]]:
         """Tek dosya işle"""
+        return list(self.iter_file(file_path))
+    
+    def iter_file(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Tek dosya işle - chunk kayıtlarını üretildikçe döndürür
+        
+        Chunk döndürülmeden önceki hatalar loglanır ve dosya atlanır. Chunk
+        döndürüldükten sonraki hata (yarım okunan dosya) yükseltilir ki eksik
+        dosya tamamlanmış sayılmasın.
+        """
+        yielded = False
         try:
             file_path = Path(file_path)
             
             # Dosya kontrolü
             if not file_path.exists():
                 logger.error(f"Dosya bulunamadı: {file_path}")
-                return []
+                return
             
             # Format kontrolü
             if file_path.suffix.lower() not in self.supported_formats:
                 logger.error(f"Desteklenmeyen format: {file_path.suffix}")
-                return []
+                return
             
             # Dosya boyutu kontrolü (MB)
             file_size = file_path.stat().st_size
@@ -61,193 +141,434 @@ class DocumentProcessor:
             
             if file_size > max_size:
                 logger.error(f"Dosya çok büyük: {file_size / 1024 / 1024:.1f}MB")
-                return []
+                return
             
-            # Metni çıkar
-            text_content = self._extract_text(file_path)
+            # İçerik hash'i (deterministik chunk id'leri ve artımlı senkronizasyon için)
+            content_hash = self.file_hash(file_path)
             
-            if not text_content.strip():
+            # Metni bölüm bölüm (PDF'de sayfa sayfa) çıkar ve temizle
+            keep_lines = self.chunking_strategy == 'legal'
+            separator = "\n" if keep_lines else " "
+            segments = self._iter_clean_segments(file_path, keep_lines)
+            
+            # Çok kısa metinleri filtrele (yalnızca ilk bölümler okunur)
+            head, head_length = [], 0
+            for segment in segments:
+                head.append(segment)
+                head_length += len(segment[0]) + 1
+                if head_length - 1 >= 10:
+                    break
+            if head_length - 1 < 10:
                 logger.warning(f"Dosyada metin bulunamadı: {file_path.name}")
-                return []
+                return
             
-            # Temizle
-            cleaned_text = self._clean_text(text_content)
+            # Bölümler birleştirilmeden chunker'a akar; offset'ler birleşik metne göredir
+            segment_starts = []
+            segment_metadata = []
             
-            # Parçalara böl
-            chunks = self._split_into_chunks(cleaned_text)
+            def blocks() -> Iterator[str]:
+                offset = 0
+                for cleaned, metadata in chain(head, segments):
+                    if segment_starts:
+                        yield separator
+                    segment_starts.append(offset)
+                    segment_metadata.append(metadata)
+                    offset += len(cleaned) + 1
+                    yield cleaned
             
-            # Belge objelerini oluştur
-            documents = []
-            for i, chunk in enumerate(chunks):
-                doc = {
-                    'content': chunk,
+            # Parçalara böl ve belge objelerini tek tek üret
+            chunk_stats = {'chunks': 0, 'tokens': 0, 'truncated': 0}
+            now = datetime.now()
+            for i, chunk in enumerate(self._iter_chunks(blocks(), chunk_stats)):
+                yielded = True
+                yield {
+                    'content': chunk['text'],
                     'filename': file_path.name,
                     'file_path': str(file_path),
                     'file_type': file_path.suffix.lower(),
                     'file_size': file_size,
+                    'content_hash': content_hash,
                     'chunk_index': i,
-                    'total_chunks': len(chunks),
-                    'timestamp': datetime.now().isoformat(),
-                    'processed_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    'token_count': chunk['token_count'],
+                    'truncated': chunk['truncated'],
+                    'timestamp': now.isoformat(),
+                    'processed_date': now.strftime('%Y-%m-%d %H:%M:%S'),
+                    **{key: chunk[key] for key in STRUCTURE_METADATA_KEYS if key in chunk},
+                    **self._segment_metadata(chunk, segment_starts, segment_metadata)
                 }
-                documents.append(doc)
             
-            logger.success(f"✅ Dosya işlendi: {file_path.name} ({len(chunks)} chunk)")
-            return documents
+            logger.success(
+                f"✅ Dosya işlendi: {file_path.name} ({chunk_stats['chunks']} chunk, "
+                f"{chunk_stats['tokens']} token, {chunk_stats['truncated']} kırpılmış)"
+            )
             
         except Exception as e:
             logger.error(f"Dosya işleme hatası ({file_path}): {e}")
-            return []
+            if yielded:
+                raise
     
-    def process_directory(self, directory_path: str) -> List[Dict[str, Any]]:
+    def process_directory(self, directory_path: str, max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
         """Dizindeki tüm dosyaları işle"""
+        return list(self.iter_directory(directory_path, max_workers))
+    
+    def iter_directory(self, directory_path: str, max_workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Dizindeki tüm dosyaları işle - chunk kayıtlarını dosya sırasıyla akış halinde döndürür"""
         try:
             directory = Path(directory_path)
             
             if not directory.exists():
                 logger.error(f"Dizin bulunamadı: {directory}")
-                return []
-            
-            all_documents = []
-            processed_files = 0
+                return
             
-            # Tüm dosyaları tara
-            for file_path in directory.rglob('*'):
-                if file_path.is_file() and file_path.suffix.lower() in self.supported_formats:
-                    documents = self.process_file(str(file_path))
-                    all_documents.extend(documents)
-                    if documents:
-                        processed_files += 1
-            
-            logger.success(f"✅ Dizin işlendi: {processed_files} dosya, {len(all_documents)} chunk")
-            return all_documents
+            yield from self.iter_files(self.list_files(directory), max_workers)
             
         except Exception as e:
             logger.error(f"Dizin işleme hatası: {e}")
-            return []
     
-    def _extract_text(self, file_path: Path) -> str:
-        """Dosya türüne göre metin çıkar"""
+    def iter_files(self, files: List[Path], max_workers: Optional[int] = None,
+                   failed_files: Optional[set] = None) -> Iterator[Dict[str, Any]]:
+        """Verilen dosyaları işle - chunk kayıtlarını dosya sırasıyla akış halinde döndürür
+        
+        Bir dosya yarıda hata verirse diğerleri işlenmeye devam eder; dosyanın
+        çözümlenmiş yolu failed_files'a eklenir (o ana kadarki chunk'ları döndürülmüş olabilir).
+        """
+        if failed_files is None:
+            failed_files = set()
+        files = [Path(file_path) for file_path in files]
+        total_bytes = sum(file_path.stat().st_size for file_path in files)
+        
+        workers = min(max_workers or self.max_workers, len(files)) or 1
+        start_time = time.perf_counter()
+        
+        if workers > 1:
+            results = self._iter_files_parallel(files, workers, failed_files)
+        else:
+            results = ((file_path, self.iter_file(str(file_path))) for file_path in files)
+        
+        processed_files = 0
+        total_chunks = 0
+        truncated_chunks = 0
+        for file_path, documents in results:
+            file_chunks = 0
+            documents = iter(documents)
+            while True:
+                try:
+                    doc = next(documents)
+                except StopIteration:
+                    break
+                except Exception as e:
+                    logger.error(f"Dosya yarım kaldı, tamamlanmış sayılmayacak ({file_path.name}): {e}")
+                    failed_files.add(str(file_path.resolve()))
+                    break
+                file_chunks += 1
+                truncated_chunks += bool(doc.get('truncated'))
+                yield doc
+            total_chunks += file_chunks
+            if file_chunks and str(file_path.resolve()) not in failed_files:
+                processed_files += 1
+        
+        elapsed = max(time.perf_counter() - start_time, 1e-9)
+        logger.success(
+            f"✅ Dosyalar işlendi: {processed_files} dosya, {total_chunks} chunk "
+            f"({truncated_chunks} chunk model sınırında kırpılacak)"
+        )
+        logger.info(
+            f"⏱️ {elapsed:.2f}s, {workers} worker - "
+            f"{len(files) / elapsed:.2f} dosya/s, {total_bytes / 1024 / 1024 / elapsed:.2f} MB/s"
+        )
+    
+    def list_files(self, directory: Path) -> List[Path]:
+        """Dizindeki desteklenen dosyaları listele"""
+        return [
+            file_path for file_path in sorted(directory.rglob('*'))
+            if file_path.is_file() and file_path.suffix.lower() in self.supported_formats
+        ]
+    
+    def _iter_files_parallel(self, files: List[Path], workers: int,
+                             failed_files: set) -> Iterator[Tuple[Path, List[Dict[str, Any]]]]:
+        """Dosyaları süreç havuzunda işle: (dosya, chunk'lar), dosya sırasıyla
+        
+        Bellek sınırlı kalsın diye aynı anda en fazla 2 * workers dosya işlemde tutulur.
+        """
+        window = workers * 2
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.config_path,)
+        ) as executor:
+            pending = deque()
+            file_iter = iter(files)
+            
+            for file_path in islice(file_iter, window):
+                pending.append((file_path, executor.submit(_process_file_in_worker, str(file_path))))
+            
+            while pending:
+                file_path, future = pending.popleft()
+                
+                # Bir dosyadaki hata diğerlerini etkilemesin
+                try:
+                    documents = future.result()
+                except Exception as e:
+                    logger.error(f"Dosya işleme hatası ({file_path}): {e}")
+                    failed_files.add(str(file_path.resolve()))
+                    documents = []
+                
+                next_file = next(file_iter, None)
+                if next_file is not None:
+                    pending.append((next_file, executor.submit(_process_file_in_worker, str(next_file))))
+                
+                yield file_path, documents
+    
+    @staticmethod
+    def file_hash(file_path: Path) -> str:
+        """Dosya baytlarının sha256 hash'i"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _extract_segments(self, file_path: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Dosya türüne göre metni sıralı bölümler halinde çıkar: (metin, metadata)
+        
+        Bölüm döndürüldükten sonraki çıkarma hatası (bozuk sayfa, yarım DOCX)
+        yükseltilir; öncesindeki hata loglanır ve dosya boş sayılır.
+        """
+        yielded = False
         try:
             if file_path.suffix.lower() == '.pdf':
-                return self._extract_from_pdf(file_path)
+                for page_num, page_text in self._iter_pdf_pages(file_path):
+                    yielded = True
+                    yield page_text, {'page': page_num}
             elif file_path.suffix.lower() == '.docx':
-                return self._extract_from_docx(file_path)
+                for block in self._iter_docx_blocks(file_path):
+                    yielded = True
+                    yield block, {}
             elif file_path.suffix.lower() == '.txt':
-                return self._extract_from_txt(file_path)
+                for block, encoding in self._iter_txt_blocks(file_path):
+                    yielded = True
+                    yield block, {'encoding': encoding}
             else:
                 logger.error(f"Desteklenmeyen format: {file_path.suffix}")
-                return ""
                 
         except Exception as e:
             logger.error(f"Metin çıkarma hatası ({file_path.name}): {e}")
-            return ""
+            if yielded:
+                raise
     
-    def _extract_from_pdf(self, file_path: Path) -> str:
-        """PDF'den metin çıkar"""
-        try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                for page_num, page in enumerate(pdf_reader.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += f"\n--- Sayfa {page_num + 1} ---\n{page_text}\n"
-                    except Exception as e:
-                        logger.warning(f"Sayfa {page_num + 1} okunamadı: {e}")
+    def _iter_clean_segments(self, file_path: Path, keep_lines: bool) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Temizlenmiş, boş olmayan bölümler: (metin, metadata)"""
+        for segment_text, metadata in self._extract_segments(file_path):
+            cleaned = self._clean_text(segment_text, keep_lines=keep_lines, min_length=0)
+            if cleaned:
+                yield cleaned, metadata
+    
+    def _extract_text(self, file_path: Path) -> str:
+        """Dosya türüne göre metin çıkar"""
+        return "\n".join(text for text, _ in self._extract_segments(file_path))
+    
+    @staticmethod
+    def _segment_metadata(chunk: Dict[str, Any], segment_starts: List[int],
+                          segment_metadata: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Chunk'ın başladığı (ve bittiği) bölümün metadata'sı - PDF'de sayfa numarası"""
+        first = segment_metadata[max(bisect_right(segment_starts, chunk.get('start', 0)) - 1, 0)]
+        metadata = dict(first)
+        
+        if 'page' in first:
+            last = segment_metadata[max(bisect_right(segment_starts, max(chunk.get('end', 1) - 1, 0)) - 1, 0)]
+            if last.get('page') != first['page']:
+                metadata['page_end'] = last['page']
+        
+        return metadata
+    
+    def _iter_pdf_pages(self, file_path: Path) -> Iterator[Tuple[int, str]]:
+        """PDF sayfalarını sırayla döndür: (sayfa no, metin)
+        
+        Büyük PDF'lerde sayfa aralıkları süreç havuzunda paralel çıkarılır; aynı anda
+        en fazla 2 * worker aralık bellekte tutulur.
+        """
+        page_count = self.pdf_backend.page_count(str(file_path))
+        backend_name = self.pdf_backend.name
+        
+        ranges = [
+            (start, min(start + self.pdf_pages_per_task, page_count))
+            for start in range(0, page_count, self.pdf_pages_per_task)
+        ]
+        workers = min(self.pdf_page_workers, len(ranges))
+        
+        # Dosya havuzu worker'ı içindeysek zaten paralel çalışıyoruz
+        if _worker_processor is not None or workers <= 1 or page_count < self.pdf_parallel_min_pages:
+            for start, end in ranges:
+                for i, page_text in enumerate(_extract_pdf_page_range(str(file_path), start, end, backend_name)):
+                    yield start + i + 1, page_text
+            return
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            range_iter = iter(ranges)
             
-            return text
+            for start, end in islice(range_iter, workers * 2):
+                pending.append((start, executor.submit(_extract_pdf_page_range, str(file_path), start, end, backend_name)))
             
-        except Exception as e:
-            logger.error(f"PDF okuma hatası: {e}")
-            return ""
+            while pending:
+                start, future = pending.popleft()
+                pages = future.result()
+                
+                next_range = next(range_iter, None)
+                if next_range is not None:
+                    pending.append((
+                        next_range[0],
+                        executor.submit(_extract_pdf_page_range, str(file_path), *next_range, backend_name)
+                    ))
+                
+                for i, page_text in enumerate(pages):
+                    yield start + i + 1, page_text
+    
+    def _iter_docx_blocks(self, file_path: Path) -> Iterator[str]:
+        """DOCX'den metin çıkar - hızlı yol word/document.xml'i akış halinde ayrıştırır
+        
+        python-docx'e yalnızca ilk bloktan önceki hatalarda dönülür. Blok
+        döndürüldükten sonraki hata yükseltilir: yarım okunan belge tamamlanmış sayılmamalı.
+        """
+        if self.docx_fast_path:
+            yielded = False
+            try:
+                for block in iter_docx_blocks(file_path):
+                    yielded = True
+                    yield block
+                return
+            except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+                if yielded:
+                    logger.error(f"DOCX okuma hatası, belge yarım kaldı ({file_path.name}): {e}")
+                    raise
+                logger.warning(f"DOCX hızlı okuma başarısız, python-docx kullanılacak ({file_path.name}): {e}")
+        
+        yield self._extract_from_docx(file_path)
     
     def _extract_from_docx(self, file_path: Path) -> str:
-        """DOCX'den metin çıkar"""
+        """DOCX'den metin çıkar (python-docx)"""
         try:
             doc = Document(file_path)
-            text = ""
-            
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            
-            return text
+            return "\n".join(paragraph.text for paragraph in doc.paragraphs)
             
         except Exception as e:
             logger.error(f"DOCX okuma hatası: {e}")
             return ""
     
-    def _extract_from_txt(self, file_path: Path) -> str:
-        """TXT dosyasını oku"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
-                
-        except UnicodeDecodeError:
-            # Türkçe karakter sorunu için alternatif encoding'ler dene
-            for encoding in ['cp1254', 'iso-8859-9', 'latin1']:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as file:
-                        logger.info(f"Dosya {encoding} ile okundu: {file_path.name}")
-                        return file.read()
-                except:
-                    continue
+    def _iter_txt_blocks(self, file_path: Path) -> Iterator[Tuple[str, str]]:
+        """TXT dosyasını bellek eşlemeli ve parça parça çöz: (metin bloğu, encoding)
+        
+        Encoding dosyanın başından alınan örnekle belirlenir ve dosya tek geçişte
+        katı modda çözülür. Örnekten sonra çözülemeyen bir bayt gelirse o bloktan
+        itibaren TXT_FALLBACK_ENCODINGS içindeki sonraki uygun encoding'e geçilir;
+        bozuk karakter sessizce U+FFFD'ye çevrilmez. Bloklar satır sonlarından
+        kesilir ki kelimeler bölünmesin.
+        """
+        if file_path.stat().st_size == 0:
+            return
+        
+        with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            encoding = self._detect_encoding(mapped[:TXT_SAMPLE_BYTES])
+            if encoding != 'utf-8':
+                logger.info(f"Dosya {encoding} ile okunuyor: {file_path.name}")
             
-            logger.error(f"Dosya encoding sorunu: {file_path.name}")
-            return ""
+            decoder = codecs.getincrementaldecoder(encoding)()
+            pending = ""
+            size = len(mapped)
+            for offset in range(0, size, TXT_BLOCK_BYTES):
+                final = offset + TXT_BLOCK_BYTES >= size
+                data = mapped[offset:offset + TXT_BLOCK_BYTES]
+                try:
+                    text = decoder.decode(data, final=final)
+                except UnicodeDecodeError as e:
+                    # Hatalı bayta kadarki kısım (önceki bloktan kalan yarım karakter dahil) geçerli;
+                    # kalanı bir sonraki uygun encoding ile çöz
+                    valid = e.object[:e.start].decode('utf-8' if encoding == 'utf-8-sig' else encoding)
+                    rest = e.object[e.start:]
+                    failed, encoding = encoding, self._fallback_encoding(encoding, rest, final)
+                    logger.warning(
+                        f"{file_path.name} {failed} ile çözülemedi ({e.reason}, blok {offset}), "
+                        f"kalan kısım {encoding} ile okunuyor"
+                    )
+                    decoder = codecs.getincrementaldecoder(encoding)()
+                    text = valid + decoder.decode(rest, final=final)
+                block = pending + text
+                
+                cut = block.rfind('\n') + 1 or block.rfind(' ') + 1
+                if cut and not final:
+                    pending = block[cut:]
+                    block = block[:cut]
+                else:
+                    pending = ""
+                
+                if block:
+                    yield block, encoding
             
-        except Exception as e:
-            logger.error(f"TXT okuma hatası: {e}")
-            return ""
+            if pending:
+                yield pending, encoding
     
-    def _clean_text(self, text: str) -> str:
+    @staticmethod
+    def _fallback_encoding(failed: str, data: bytes, final: bool) -> str:
+        """failed encoding'den sonra gelen ve veriyi katı modda çözebilen ilk encoding"""
+        chain = TXT_FALLBACK_ENCODINGS
+        start = chain.index(failed) + 1 if failed in chain else 0
+        for encoding in chain[start:-1]:
+            try:
+                codecs.getincrementaldecoder(encoding)().decode(data, final=final)
+                return encoding
+            except UnicodeDecodeError:
+                continue
+        # Son seçenek (iso-8859-9) her baytı çözer
+        return chain[-1]
+    
+    @staticmethod
+    def _detect_encoding(sample: bytes) -> str:
+        """Dosya başından alınan örnekle encoding belirle"""
+        if sample.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        
+        try:
+            # Örnek çok baytlı bir karakterin ortasında bitebilir
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
+        
+        # Türkçe karakter sorunu için alternatif encoding'ler:
+        # cp1254 0x81, 0x8D-0x90, 0x9D-0x9E baytlarını tanımlamaz, iso-8859-9 her baytı çözer
+        try:
+            sample.decode('cp1254')
+            return 'cp1254'
+        except UnicodeDecodeError:
+            return 'iso-8859-9'
+    
+    def _clean_text(self, text: str, keep_lines: bool = False, min_length: int = 10) -> str:
         """Metni temizle"""
-        # Çoklu boşlukları tek boşluğa çevir
-        text = re.sub(r'\s+', ' ', text)
+        if keep_lines:
+            # Satır içi boşlukları tek boşluğa çevir, boş satırları at
+            text = re.sub(r'[^\S\n]+', ' ', text)
+            text = re.sub(r' ?\n[\s]*', '\n', text)
+        else:
+            # Çoklu boşlukları tek boşluğa çevir
+            text = re.sub(r'\s+', ' ', text)
         
         # Satır başı ve sonundaki boşlukları temizle
         text = text.strip()
         
         # Çok kısa metinleri filtrele
-        if len(text) < 10:
+        if len(text) < min_length:
             return ""
         
         return text
     
-    def _split_into_chunks(self, text: str) -> List[str]:
-        """Metni parçalara böl"""
-        if len(text) <= self.chunk_size:
-            return [text]
-        
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            # Chunk sonunu bul
-            end = start + self.chunk_size
-            
-            if end >= len(text):
-                # Son chunk
-                chunk = text[start:]
-            else:
-                # Kelime ortasında kesilmesin
-                last_space = text.rfind(' ', start, end)
-                if last_space > start:
-                    end = last_space
-                
-                chunk = text[start:end]
-            
-            chunks.append(chunk.strip())
-            
-            # Overlap ile bir sonraki chunk'a geç
-            start = end - self.chunk_overlap
-            
-            if start >= len(text):
-                break
+    def _iter_chunks(self, blocks: Iterator[str], stats: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+        """Sırayla gelen metin bloklarını model token bütçesine göre parçalara böl"""
+        if self.chunking_strategy == 'legal':
+            stats.setdefault('articles', 0)
+            return self.legal_splitter.iter_split(blocks, stats)
         
-        return [chunk for chunk in chunks if chunk.strip()]
+        return self.chunker.iter_chunks(blocks, stats)
 
 
 # Test fonksiyonu
@@ -286,10 +607,29 @@ def test_document_processor():
         
         if documents:
             print(f"📄 İlk chunk: {documents[0]['content'][:100]}...")
-            print(f"📊 Chunk boyutu: {len(documents[0]['content'])} karakter")
+            print(f"📊 Chunk boyutu: {documents[0]['token_count']} token")
+        
+        # Yarıda bozulan dosya (document.xml kesik DOCX) tamamlanmış sayılmamalı
+        broken_file = test_dir / "kesik.docx"
+        docx_document = Document()
+        for i in range(3000):
+            docx_document.add_paragraph(f"Madde {i + 1} - Bu maddenin metni kesik belge testinde kullanılır ve uzundur.")
+        docx_document.save(broken_file)
+        with zipfile.ZipFile(broken_file) as archive:
+            parts = {name: archive.read(name) for name in archive.namelist()}
+        parts['word/document.xml'] = parts['word/document.xml'][:len(parts['word/document.xml']) * 2 // 3]
+        with zipfile.ZipFile(broken_file, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for name, data in parts.items():
+                archive.writestr(name, data)
+        
+        failed_files = set()
+        partial = list(processor.iter_files([broken_file], max_workers=1, failed_files=failed_files))
+        print(f"🧩 Kesik DOCX: {len(partial)} chunk döndü, başarısız: {[Path(path).name for path in failed_files]}")
+        assert str(broken_file.resolve()) in failed_files
         
         # Test dizinini temizle
         test_file.unlink()
+        broken_file.unlink()
         test_dir.rmdir()
         
         print("✅ DocumentProcessor testi başarılı!")
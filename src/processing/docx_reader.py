@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+DOCX Okuyucu - word/document.xml'i DOM kurmadan akış halinde ayrıştırır
+"""
+
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Iterator, List
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_PARAGRAPH = _W + 'p'
+_TEXT = _W + 't'
+_TAB = _W + 'tab'
+_BREAKS = (_W + 'br', _W + 'cr')
+_TABLE = _W + 'tbl'
+_ROW = _W + 'tr'
+_CELL = _W + 'tc'
+_BODY = _W + 'body'
+
+# Kaç karakterlik paragraf grubunun tek blok olarak döndürüleceği
+DOCX_BLOCK_CHARS = 64 * 1024
+
+
+def _paragraph_text(paragraph: ET.Element) -> str:
+    """Paragraftaki run metinlerini birleştir"""
+    parts = []
+    for elem in paragraph.iter():
+        if elem.tag == _TEXT:
+            if elem.text:
+                parts.append(elem.text)
+        elif elem.tag == _TAB:
+            parts.append('\t')
+        elif elem.tag in _BREAKS:
+            parts.append('\n')
+    return ''.join(parts)
+
+
+def iter_docx_lines(file_path: Path) -> Iterator[str]:
+    """Paragrafları ve tablo satırlarını belge sırasıyla döndür
+
+    Tablo satırları hücreleri " | " ile birleştirilmiş tek satır olarak gelir.
+    İşlenen elemanlar hemen temizlenir, bellek kullanımı belge boyutundan bağımsız kalır.
+    """
+    with zipfile.ZipFile(file_path) as archive, archive.open('word/document.xml') as xml_file:
+        body = None
+        row_stack: List[List[str]] = []
+        cell_stack: List[List[str]] = []
+
+        for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+            if event == 'start':
+                if elem.tag == _BODY:
+                    body = elem
+                elif elem.tag == _ROW:
+                    row_stack.append([])
+                elif elem.tag == _CELL:
+                    cell_stack.append([])
+                continue
+
+            if elem.tag == _PARAGRAPH:
+                text = _paragraph_text(elem)
+                if cell_stack:
+                    cell_stack[-1].append(text)
+                elif text.strip():
+                    yield text
+                elem.clear()
+
+            elif elem.tag == _CELL and cell_stack:
+                cell_text = ' '.join(part.strip() for part in cell_stack.pop() if part.strip())
+                if row_stack:
+                    row_stack[-1].append(cell_text)
+
+            elif elem.tag == _ROW and row_stack:
+                cells = [cell for cell in row_stack.pop() if cell]
+                if cells:
+                    row_text = ' | '.join(cells)
+                    # İç içe tablo: satır dış hücrenin parçası olur
+                    if cell_stack:
+                        cell_stack[-1].append(row_text)
+                    else:
+                        yield row_text
+
+            elif elem.tag == _TABLE and not cell_stack:
+                # Üst düzey tablo bitti
+                elem.clear()
+
+            # Gövdenin işlenmiş çocuklarını bırak
+            if body is not None and not cell_stack and elem.tag in (_PARAGRAPH, _TABLE):
+                body.clear()
+
+
+def iter_docx_blocks(file_path: Path, block_chars: int = DOCX_BLOCK_CHARS) -> Iterator[str]:
+    """Satırları yaklaşık block_chars boyutunda bloklar halinde döndür"""
+    lines = []
+    size = 0
+    for line in iter_docx_lines(file_path):
+        lines.append(line)
+        size += len(line) + 1
+        if size >= block_chars:
+            yield '\n'.join(lines)
+            lines, size = [], 0
+
+    if lines:
+        yield '\n'.join(lines)
+
+
+# Test fonksiyonu
+def test_docx_reader():
+    """DOCX okuyucu test fonksiyonu"""
+    print("🧪 DOCX Okuyucu Testi Başlıyor...")
+
+    try:
+        from docx import Document
+
+        test_file = Path("test_docx_reader.docx")
+        doc = Document()
+        doc.add_paragraph("Madde 1 - Sözleşmenin konusu")
+        table = doc.add_table(rows=2, cols=2)
+        table.cell(0, 0).text = "Taraf"
+        table.cell(0, 1).text = "Yükümlülük"
+        table.cell(1, 0).text = "Kiracı"
+        table.cell(1, 1).text = "Kira bedelini öder"
+        doc.add_paragraph("Madde 2 - Süre")
+        doc.save(test_file)
+
+        lines = list(iter_docx_lines(test_file))
+        for line in lines:
+            print(f"📄 {line}")
+
+        test_file.unlink()
+
+        print("✅ DOCX okuyucu testi başarılı!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test hatası: {e}")
+        return False
+
+if __name__ == "__main__":
+    test_docx_reader()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Mevzuat Yapısı Bölücü - Kanun metinlerini Kitap/Kısım/Bölüm/Madde/Fıkra sınırlarından böler
+"""
+
+import re
+import sys
+from typing import List, Dict, Any, Iterable, Iterator, Tuple, Optional
+
+from loguru import logger
+
+# Local imports
+sys.path.append('src')
+from processing.chunker import TokenChunker
+
+# Satır başındaki madde başlıkları:
+#   "Madde 1 - Amaç", "MADDE 12-", "Madde 3: Borçlu ...", "Geçici Madde 2",
+#   "Türk Ceza Kanunu - Madde 1 (Amaç)"
+# Numaradan sonra tire/iki nokta, parantezli başlık ya da satır sonu gelmelidir;
+# "Madde 1 hükmü saklıdır." gibi gövde satırları başlık sayılmaz.
+_ARTICLE_PATTERN = re.compile(
+    r'^[^\S\n]*'
+    r'(?:(?P<prefix>[^\n]{0,120}?)[^\S\n]*[-–—][^\S\n]*)??'
+    r'(?:(?P<kind>Ek|EK|Geçici|GEÇİCİ)[^\S\n]+)?'
+    r'(?:Madde|MADDE)[^\S\n]+(?P<no>\d+)'
+    r'(?=[^\S\n]*(?:[-–—:]|\([^()\n]*\)[^\S\n]*$|$))',
+    re.MULTILINE
+)
+
+# "BİRİNCİ KİTAP", "İKİNCİ KISIM", "ÜÇÜNCÜ BÖLÜM"
+_SECTION_PATTERN = re.compile(
+    r'^[^\S\n]*(?:[A-ZÇĞİÖŞÜ]+[^\S\n]+)?(?:KİTAP|KISIM|BÖLÜM)\b[^\n]*$',
+    re.MULTILINE
+)
+
+# Kanun başlığı: "TÜRK CEZA KANUNU", "İcra ve İflas Kanunu - Temel Hükümler"
+_LAW_TITLE_PATTERN = re.compile(
+    r'^[^\S\n]*(?P<title>[^\n]*?\b(?:KANUNU|Kanunu|KANUN|Kanun))\b',
+    re.MULTILINE
+)
+
+# Maddeler arasında tek başına satır olan kanun başlığı: "TÜRK MEDENİ KANUNU"
+_LAW_HEADING_PATTERN = re.compile(
+    r'^[^\S\n]*(?P<title>[^\n]{0,150}?\b(?:KANUNU|Kanunu|KANUN|Kanun))[^\S\n]*$',
+    re.MULTILINE
+)
+
+# Başlık satırında küçük harfle yazılabilen bağlaçlar ("İcra ve İflas Kanunu", "5237 sayılı ...")
+_HEADING_CONNECTORS = frozenset(('ve', 'ile', 'veya', 'hakkında', 'dair', 'ilişkin', 'sayılı', 'için'))
+
+# Fıkra numaraları: "(1) ...", "(2) ..."
+_PARAGRAPH_PATTERN = re.compile(r'^[^\S\n]*\((?P<no>\d+)\)[^\S\n]*', re.MULTILINE)
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Akış halinde bölmede, başlığı gelmemiş son madde için bellekte tutulan en fazla karakter
+MAX_CARRY_CHARS = 512 * 1024
+
+
+class LegalStructureSplitter:
+    """Mevzuat metinlerini madde bazında bölen chunker
+
+    Her madde tek chunk olur. Token bütçesini aşan maddeler fıkra sınırlarından,
+    tek başına bütçeyi aşan fıkralar ise TokenChunker ile bölünür. Madde
+    bulunamayan metinler doğrudan TokenChunker'a bırakılır.
+    """
+
+    def __init__(self, chunker: TokenChunker):
+        """Başlatma"""
+        self.chunker = chunker
+
+    def split(self, text: str) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """Satır yapısı korunmuş metni madde/fıkra chunk'larına böl"""
+        stats = {'chunks': 0, 'tokens': 0, 'truncated': 0, 'articles': 0}
+        chunks = list(self.iter_split([text], stats))
+        return chunks, stats
+
+    def iter_split(self, blocks: Iterable[str], stats: Optional[Dict[str, int]] = None,
+                   max_carry_chars: int = MAX_CARRY_CHARS) -> Iterator[Dict[str, Any]]:
+        """Sırayla gelen metin bloklarını (bitişik, satır yapısı korunmuş) madde/fıkra chunk'larına böl
+
+        Tamamlanan maddeler (arkasından yeni madde başlığı gelenler) hemen
+        chunk'lanır; bellekte yalnızca son, henüz bitmemiş madde tutulur. Son
+        madde max_carry_chars'ı aşarsa son fıkra başından (yoksa satır sonundan)
+        kesilip devamı aynı madde bilgisiyle işlenir. Chunk offset'leri birleşik metne göredir.
+        """
+        if stats is None:
+            stats = {'chunks': 0, 'tokens': 0, 'truncated': 0, 'articles': 0}
+        # Bölgeler arasında taşınan yapı bilgisi
+        state = {'law_title': None, 'section': None, 'seen_article': False, 'continuation': None}
+        buffer = ""
+        base = 0
+
+        def flush(cut: int, ends_at_article: bool, final: bool = False) -> Iterator[Dict[str, Any]]:
+            nonlocal buffer, base
+            for chunk in self._split_region(buffer[:cut], base, state, stats, ends_at_article, final):
+                stats['chunks'] += 1
+                stats['tokens'] += chunk['token_count']
+                stats['truncated'] += chunk['truncated']
+                yield chunk
+            buffer, base = buffer[cut:], base + cut
+
+        for block in blocks:
+            if not block:
+                continue
+            buffer += block
+            # Yalnızca tamamlanmış satırlarda başlık ara (blok sonu satır ortası olabilir)
+            complete = buffer.rfind('\n') + 1
+            last_heading = None
+            for match in _ARTICLE_PATTERN.finditer(buffer, 0, complete):
+                last_heading = match
+            if last_heading is not None and last_heading.start() > 0:
+                yield from flush(last_heading.start(), ends_at_article=True)
+            elif len(buffer) > max_carry_chars and complete:
+                # Çok uzun madde ya da maddesiz metin: son fıkra başından, yoksa satır sonundan kes
+                last_paragraph = None
+                for match in _PARAGRAPH_PATTERN.finditer(buffer, 0, complete):
+                    last_paragraph = match
+                cut = last_paragraph.start() if last_paragraph is not None and last_paragraph.start() > 0 else complete
+                yield from flush(cut, ends_at_article=False)
+
+        if buffer:
+            yield from flush(len(buffer), ends_at_article=False, final=True)
+
+    def _split_region(self, text: str, offset: int, state: Dict[str, Any], stats: Dict[str, int],
+                      ends_at_article: bool, final: bool) -> Iterator[Dict[str, Any]]:
+        """Kendi içinde tamamlanmış bir metin bölgesini chunk'la
+
+        Bölge ya belgenin başıdır ya bir madde başlığıyla ya da kesilmiş uzun
+        bir maddenin devamıyla başlar. ends_at_article, bölgenin hemen
+        arkasından yeni bir madde başlığı geldiğini gösterir.
+        """
+        articles = list(_ARTICLE_PATTERN.finditer(text))
+        sections = [(match.start(), self._normalize(match.group(0))) for match in _SECTION_PATTERN.finditer(text)]
+
+        lead = text[:articles[0].start()] if articles else text
+        if self._normalize(lead):
+            if state['continuation'] is not None:
+                # Kesilmiş uzun maddenin devamı
+                yield from self._split_article(lead, offset, state['continuation'])
+            elif state['seen_article'] or articles or ends_at_article:
+                # İlk maddeden önceki giriş metni (kanun adı, kabul tarihi vb.)
+                if not state['seen_article']:
+                    state['law_title'] = self._find_law_title(lead)
+                law_title = state['law_title']
+                yield from self._split_plain(lead, offset, {'law_title': law_title} if law_title else {})
+            else:
+                # Henüz madde görülmedi: yapısız metin
+                yield from self._split_plain(lead, offset, {})
+        if articles or ends_at_article:
+            state['seen_article'] = True
+            state['continuation'] = None
+        stats['articles'] += len(articles)
+
+        section_index = 0
+        for i, match in enumerate(articles):
+            start = match.start()
+            end = articles[i + 1].start() if i + 1 < len(articles) else len(text)
+
+            # Maddeden önce gelen son bölüm başlığı
+            while section_index < len(sections) and sections[section_index][0] < start:
+                state['section'] = sections[section_index][1]
+                section_index += 1
+
+            # "Türk Ceza Kanunu - Madde 1" biçimindeki başlık sonraki maddeler için de geçerli
+            state['law_title'] = self._law_from_prefix(match.group('prefix')) or state['law_title']
+
+            metadata = {
+                'article_no': int(match.group('no')),
+                'article_kind': self._article_kind(match.group('kind'))
+            }
+            if state['law_title']:
+                metadata['law_title'] = state['law_title']
+            if state['section']:
+                metadata['section'] = state['section']
+
+            # Maddeden sonra gelen yeni kanun başlığı maddeyi bitirir ve sonraki maddelerin kanunu olur
+            heading = self._find_law_heading(text, match.end(), end)
+            article_end = heading.start() if heading else end
+            yield from self._split_article(text[start:article_end], offset + start, metadata)
+
+            if heading:
+                # Yeni kanunda önceki kanunun bölüm başlığı geçerli değil
+                state['law_title'], state['section'] = self._normalize(heading.group('title')), None
+                yield from self._split_plain(text[article_end:end], offset + article_end,
+                                             {'law_title': state['law_title']})
+            elif i == len(articles) - 1 and not ends_at_article and not final:
+                # Bölge maddenin ortasında kesildi; devamı bu madde bilgisiyle işlenir
+                state['continuation'] = metadata
+
+    def _split_article(self, article: str, offset: int, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Maddeyi tek chunk olarak ver, bütçeyi aşıyorsa fıkralara böl"""
+        text = self._normalize(article)
+        token_count = self.chunker.count_tokens(text)
+        if token_count <= self.chunker.max_tokens:
+            return [self._make_chunk(text, offset, offset + len(article), token_count, metadata)]
+
+        paragraphs = list(_PARAGRAPH_PATTERN.finditer(article))
+        if not paragraphs:
+            return self._split_plain(article, offset, metadata)
+
+        # Madde başlığı ilk fıkraya eklenir
+        bounds = [0] + [match.start() for match in paragraphs[1:]] + [len(article)]
+        numbers = [int(match.group('no')) for match in paragraphs]
+
+        chunks = []
+        group_start = None
+        group_numbers = []
+        group_text = ""
+        group_tokens = 0
+        for i, number in enumerate(numbers):
+            piece_start, piece_end = bounds[i], bounds[i + 1]
+            piece = self._normalize(article[piece_start:piece_end])
+            candidate = f"{group_text} {piece}".strip()
+            candidate_tokens = self.chunker.count_tokens(candidate)
+
+            if group_numbers and candidate_tokens > self.chunker.max_tokens:
+                chunks.append(self._make_chunk(
+                    group_text, offset + group_start, offset + piece_start, group_tokens,
+                    {**metadata, 'paragraph': self._paragraph_range(group_numbers)}
+                ))
+                group_start, group_numbers, group_text = None, [], ""
+                candidate, candidate_tokens = piece, self.chunker.count_tokens(piece)
+
+            if candidate_tokens > self.chunker.max_tokens:
+                # Tek fıkra bile bütçeyi aşıyor
+                chunks.extend(self._split_plain(
+                    article[piece_start:piece_end], offset + piece_start,
+                    {**metadata, 'paragraph': str(number)}
+                ))
+                continue
+
+            if group_start is None:
+                group_start = piece_start
+            group_numbers.append(number)
+            group_text = candidate
+            group_tokens = candidate_tokens
+
+        if group_numbers:
+            chunks.append(self._make_chunk(
+                group_text, offset + group_start, offset + len(article), group_tokens,
+                {**metadata, 'paragraph': self._paragraph_range(group_numbers)}
+            ))
+
+        return chunks
+
+    def _split_plain(self, text: str, offset: int, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Yapısız metni token bütçesine göre böl"""
+        normalized = self._normalize(text)
+        chunks, _ = self.chunker.split(normalized)
+        # Normalize edilmiş metindeki offset'ler orijinal aralığa yaklaşık olarak taşınır
+        scale = len(text) / max(len(normalized), 1)
+        for chunk in chunks:
+            chunk['start'] = offset + int(chunk['start'] * scale)
+            chunk['end'] = offset + int(chunk['end'] * scale)
+            chunk.update(metadata)
+        return chunks
+
+    def _make_chunk(self, text: str, start: int, end: int, token_count: int, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Chunk kaydı oluştur"""
+        return {
+            'text': text,
+            'start': start,
+            'end': end,
+            'token_count': token_count,
+            'truncated': token_count > self.chunker.model_max_length,
+            **metadata
+        }
+
+    def _find_law_title(self, preamble: str) -> Optional[str]:
+        """Giriş metnindeki ilk kanun başlığı"""
+        match = _LAW_TITLE_PATTERN.search(preamble)
+        return self._normalize(match.group('title')) if match else None
+
+    @staticmethod
+    def _find_law_heading(text: str, start: int, end: int) -> Optional[re.Match]:
+        """[start, end) aralığında tek başına satır olan ilk kanun başlığı
+
+        Satırdaki her kelime büyük harf ya da rakamla başlamalı (bağlaçlar hariç);
+        "... hükümleri Türk Medeni Kanunu" gibi kırılmış cümle satırları başlık sayılmaz.
+        """
+        for match in _LAW_HEADING_PATTERN.finditer(text, start, end):
+            words = match.group('title').split()
+            if len(words) <= 12 and all(word[0].isupper() or word[0].isdigit() or word in _HEADING_CONNECTORS
+                                        for word in words):
+                return match
+        return None
+
+    def _law_from_prefix(self, prefix: Optional[str]) -> Optional[str]:
+        """"Türk Ceza Kanunu - Madde 1" biçimindeki başlıktan kanun adı"""
+        if not prefix:
+            return None
+        match = _LAW_TITLE_PATTERN.search(prefix)
+        return self._normalize(match.group('title')) if match else None
+
+    @staticmethod
+    def _article_kind(kind: Optional[str]) -> str:
+        """Madde türü: madde, ek, gecici"""
+        if not kind:
+            return 'madde'
+        return 'ek' if kind.lower() == 'ek' else 'gecici'
+
+    @staticmethod
+    def _paragraph_range(numbers: List[int]) -> str:
+        """Fıkra aralığı: "2" veya "2-4" """
+        return str(numbers[0]) if len(numbers) == 1 else f"{numbers[0]}-{numbers[-1]}"
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Boşlukları tek boşluğa indir"""
+        return _WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+# Test fonksiyonu
+def test_legal_splitter():
+    """LegalStructureSplitter test fonksiyonu"""
+    print("🧪 LegalStructureSplitter Testi Başlıyor...")
+
+    try:
+        chunker = TokenChunker('sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2', max_tokens=128)
+        splitter = LegalStructureSplitter(chunker)
+
+        text = """TÜRK CEZA KANUNU
+BİRİNCİ KİTAP
+Genel Hükümler
+BİRİNCİ KISIM
+Temel İlkeler, Tanımlar ve Uygulama Alanı
+Madde 1 - Ceza Kanununun amacı
+(1) Ceza Kanununun amacı; kişi hak ve özgürlüklerini, kamu düzen ve güvenliğini, hukuk devletini korumak ve suç işlenmesini önlemektir.
+Madde 2 - Suçta ve cezada kanunîlik ilkesi
+(1) Kanunun açıkça suç saymadığı bir fiil için kimseye ceza verilemez ve güvenlik tedbiri uygulanamaz.
+(2) İdarenin düzenleyici işlemleriyle suç ve ceza konulamaz.
+Madde 1 hükmü saklıdır.
+TÜRK MEDENİ KANUNU
+Madde 1 - Hukukun uygulanması
+(1) Kanun, sözüyle ve özüyle değindiği bütün konularda uygulanır.
+"""
+        chunks, stats = splitter.split(text)
+
+        print(f"✅ {stats['articles']} madde, {stats['chunks']} chunk")
+        for chunk in chunks:
+            print(f"📄 Madde {chunk.get('article_no')} ({chunk.get('law_title')}, {chunk.get('section')}): "
+                  f"{chunk['text'][:60]}...")
+
+        print("✅ LegalStructureSplitter testi başarılı!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test hatası: {e}")
+        return False
+
+if __name__ == "__main__":
+    test_legal_splitter()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+PDF Backend'leri - PDF metin çıkarma motorları için ortak arayüz
+"""
+
+import importlib.util
+from typing import List, Dict, Type
+
+from loguru import logger
+
+
+class PDFBackend:
+    """PDF metin çıkarma motoru arayüzü"""
+
+    name = "base"
+    module = None
+
+    @classmethod
+    def available(cls) -> bool:
+        """Motorun kütüphanesi kurulu mu?"""
+        return cls.module is None or importlib.util.find_spec(cls.module) is not None
+
+    def page_count(self, file_path: str) -> int:
+        """PDF'in sayfa sayısı"""
+        raise NotImplementedError
+
+    def extract_pages(self, file_path: str, start: int, end: int) -> List[str]:
+        """[start, end) aralığındaki sayfaların metinleri (okunamayan sayfa boş döner)"""
+        raise NotImplementedError
+
+
+class PyPDF2Backend(PDFBackend):
+    """PyPDF2 - saf Python, varsayılan motor"""
+
+    name = "pypdf2"
+    module = "PyPDF2"
+
+    def page_count(self, file_path: str) -> int:
+        import PyPDF2
+        with open(file_path, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages)
+
+    def extract_pages(self, file_path: str, start: int, end: int) -> List[str]:
+        import PyPDF2
+        pages = []
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            for page_num in range(start, end):
+                try:
+                    pages.append(pdf_reader.pages[page_num].extract_text() or "")
+                except Exception as e:
+                    logger.warning(f"Sayfa {page_num + 1} okunamadı: {e}")
+                    pages.append("")
+        return pages
+
+
+class PdfiumBackend(PDFBackend):
+    """pypdfium2 - PDFium (C++) tabanlı hızlı motor"""
+
+    name = "pypdfium2"
+    module = "pypdfium2"
+
+    def page_count(self, file_path: str) -> int:
+        import pypdfium2 as pdfium
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def extract_pages(self, file_path: str, start: int, end: int) -> List[str]:
+        import pypdfium2 as pdfium
+        pages = []
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            for page_num in range(start, end):
+                try:
+                    page = pdf[page_num]
+                    textpage = page.get_textpage()
+                    pages.append(textpage.get_text_range())
+                    textpage.close()
+                    page.close()
+                except Exception as e:
+                    logger.warning(f"Sayfa {page_num + 1} okunamadı: {e}")
+                    pages.append("")
+        finally:
+            pdf.close()
+        return pages
+
+
+class PdfMinerBackend(PDFBackend):
+    """pdfminer.six - yerleşim analizli motor"""
+
+    name = "pdfminer"
+    module = "pdfminer"
+
+    def page_count(self, file_path: str) -> int:
+        from pdfminer.pdfpage import PDFPage
+        with open(file_path, 'rb') as file:
+            return sum(1 for _ in PDFPage.get_pages(file))
+
+    def extract_pages(self, file_path: str, start: int, end: int) -> List[str]:
+        from pdfminer.high_level import extract_text
+        try:
+            text = extract_text(file_path, page_numbers=range(start, end))
+        except Exception as e:
+            logger.warning(f"Sayfa {start + 1}-{end} okunamadı: {e}")
+            return [""] * (end - start)
+
+        # pdfminer sayfaları form feed ile ayırır
+        pages = text.split('\x0c')[:end - start]
+        return pages + [""] * (end - start - len(pages))
+
+
+PDF_BACKENDS: Dict[str, Type[PDFBackend]] = {
+    backend.name: backend for backend in (PyPDF2Backend, PdfiumBackend, PdfMinerBackend)
+}
+
+DEFAULT_PDF_BACKEND = PyPDF2Backend.name
+
+
+def get_pdf_backend(name: str = DEFAULT_PDF_BACKEND) -> PDFBackend:
+    """İsme göre PDF motoru; bilinmiyor veya kurulu değilse varsayılana düşer"""
+    backend_class = PDF_BACKENDS.get(name)
+
+    if backend_class is None:
+        logger.warning(f"Bilinmeyen PDF motoru: {name}, {DEFAULT_PDF_BACKEND} kullanılacak")
+        backend_class = PDF_BACKENDS[DEFAULT_PDF_BACKEND]
+    elif not backend_class.available():
+        logger.warning(f"PDF motoru kurulu değil: {name}, {DEFAULT_PDF_BACKEND} kullanılacak")
+        backend_class = PDF_BACKENDS[DEFAULT_PDF_BACKEND]
+
+    return backend_class()
+
+
+def available_backends() -> List[str]:
+    """Kurulu PDF motorları"""
+    return [name for name, backend in PDF_BACKENDS.items() if backend.available()]
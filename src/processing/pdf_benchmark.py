@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+PDF Backend Benchmark - Aynı PDF setini her motorla çıkarır ve hız/bellek/kalite karşılaştırır
+"""
+
+import multiprocessing
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from loguru import logger
+
+# Local imports
+sys.path.append('src')
+from processing.pdf_backends import PDF_BACKENDS, DEFAULT_PDF_BACKEND, available_backends
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Sürecin en yüksek RSS değeri (MB); resource modülü yoksa None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS bayt döndürür
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_backend(backend_name: str, pdf_paths: List[str]) -> Dict[str, Any]:
+    """Tek motoru temiz bir süreçte çalıştır (tepe RSS ölçümü diğer motorlardan etkilenmesin)"""
+    backend = PDF_BACKENDS[backend_name]()
+    texts = {}
+    pages = 0
+
+    start_time = time.perf_counter()
+    for path in pdf_paths:
+        try:
+            page_count = backend.page_count(path)
+            texts[path] = "\n".join(backend.extract_pages(path, 0, page_count))
+            pages += page_count
+        except Exception as e:
+            logger.error(f"{backend_name} hata ({path}): {e}")
+            texts[path] = ""
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        'backend': backend_name,
+        'pages': pages,
+        'seconds': elapsed,
+        'pages_per_sec': pages / elapsed if elapsed > 0 else 0.0,
+        'peak_rss_mb': _peak_rss_mb(),
+        'texts': texts
+    }
+
+
+def text_similarity(reference: str, candidate: str, shingle_size: int = 3) -> float:
+    """Kelime n-gram'ları üzerinden Jaccard benzerliği (0-1)"""
+    def shingles(text):
+        words = _WORD_PATTERN.findall(text.lower())
+        if len(words) < shingle_size:
+            return {tuple(words)} if words else set()
+        return {tuple(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+
+    ref, cand = shingles(reference), shingles(candidate)
+    if not ref and not cand:
+        return 1.0
+    return len(ref & cand) / len(ref | cand)
+
+
+def benchmark_backends(pdf_paths: List[str], backend_names: Optional[List[str]] = None,
+                       reference: str = DEFAULT_PDF_BACKEND) -> List[Dict[str, Any]]:
+    """PDF setini her motorla çıkar, referans motora göre metin benzerliğini hesapla
+
+    Referans motor kurulu değilse benzerlik hesaplanamaz; iş başlamadan ValueError verilir.
+    """
+    installed = available_backends()
+    if reference not in installed:
+        raise ValueError(
+            f"Referans PDF motoru kullanılamıyor: {reference} "
+            f"(kurulu motorlar: {', '.join(installed) or 'yok'})"
+        )
+
+    backend_names = backend_names or installed
+    if reference not in backend_names:
+        backend_names = [reference] + list(backend_names)
+
+    context = multiprocessing.get_context('spawn')
+    results = {}
+    for name in backend_names:
+        if name not in PDF_BACKENDS or not PDF_BACKENDS[name].available():
+            logger.warning(f"PDF motoru atlandı (kurulu değil): {name}")
+            continue
+
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results[name] = executor.submit(_run_backend, name, pdf_paths).result()
+        logger.info(f"⏱️ {name}: {results[name]['pages_per_sec']:.1f} sayfa/s")
+
+    reference_texts = results[reference]['texts']
+    report = []
+    for name, result in results.items():
+        similarities = [text_similarity(reference_texts[path], result['texts'][path]) for path in pdf_paths]
+        report.append({
+            'backend': name,
+            'pages': result['pages'],
+            'seconds': round(result['seconds'], 3),
+            'pages_per_sec': round(result['pages_per_sec'], 1),
+            'peak_rss_mb': round(result['peak_rss_mb'], 1) if result['peak_rss_mb'] is not None else None,
+            'similarity': round(sum(similarities) / len(similarities), 3) if similarities else 0.0
+        })
+
+    return sorted(report, key=lambda row: row['pages_per_sec'], reverse=True)
+
+
+def collect_pdfs(paths: List[str]) -> List[str]:
+    """Dosya ve dizinlerden PDF listesi"""
+    pdfs = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            pdfs.extend(str(p) for p in sorted(path.rglob('*.pdf')))
+        elif path.suffix.lower() == '.pdf':
+            pdfs.append(str(path))
+    return pdfs
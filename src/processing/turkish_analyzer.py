@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Türkçe Metin Çözümleyici - Türkçe küçük harf dönüşümü, aksan katlama, stopword ve hafif ek atma
+"""
+
+import re
+import threading
+from typing import List, Dict, Optional, Iterable
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+# Aksansız eşleşme: klavyede Türkçe karakter olmadan yazılan sorgular da aynı terime düşer.
+# Büyük metinlerde str.replace zinciri, karakter eşlemeli str.translate'ten çok daha hızlı
+_DIACRITICS = (('ç', 'c'), ('ğ', 'g'), ('ı', 'i'), ('ö', 'o'), ('ş', 's'), ('ü', 'u'),
+               ('â', 'a'), ('î', 'i'), ('û', 'u'))
+
+# Çözümleme kuralları değişirse artırılır (kalıcı indeksler yeniden kurulur)
+ANALYZER_VERSION = 1
+
+# Aksanları katlanmış halde tutulur
+TURKISH_STOPWORDS = frozenset("""
+acaba ama ancak bazi belki ben beni benim bir biri birkac biz bizi bu buna bunu bunun cok cunku
+da daha de defa diye en gibi hem hep her hic icin ile ise kadar ki kim mi mu ne neden nasil
+o olan olarak oldugu olup ona onu onun sen siz su sunu tum uzere ve veya ya yani yine
+""".split())
+
+# Gövdesi önek uzunluğunu bir harf aşan kelimelerde atılan kısa iyelik/hal ekleri (kirası -> kira)
+_SHORT_SUFFIXES = ('si', 'su', 'yi', 'yu', 'ya', 'ye', 'a', 'e', 'i', 'u')
+
+
+def casefold(text: str) -> str:
+    """Türkçe kurallarıyla küçük harfe çevir
+
+    str.lower() 'I' -> 'i' ve 'İ' -> 'i̇' (i + U+0307) üretir; Türkçede 'I' -> 'ı', 'İ' -> 'i' olmalı.
+    """
+    return text.replace('I', 'ı').replace('İ', 'i').lower().replace('\u0307', '')
+
+
+def fold_diacritics(text: str) -> str:
+    """Türkçe aksanlı harfleri ASCII karşılıklarına indir (küçük harfli metin bekler)"""
+    for accented, plain in _DIACRITICS:
+        if accented in text:
+            text = text.replace(accented, plain)
+    return text
+
+
+class TurkishAnalyzer:
+    """Lexical indeks ve sorgular için Türkçe terim çözümleyici
+
+    Dönüşümler tüm metne bir kez str.replace ile (C hızında) uygulanır,
+    kelimeler tek regex ile çıkarılır. Kelime başına iş (stopword, ek atma) her
+    farklı kelime biçimi için bir kez yapılıp sözlükte tutulur; korpus tekrar
+    eden kelimelerden oluştuğundan indeksleme çoğunlukla sözlük aramasıdır.
+    """
+
+    def __init__(self, stopwords: Optional[Iterable[str]] = None, prefix_length: int = 5,
+                 min_stem_length: int = 4, max_cache_entries: int = 500000):
+        """Başlatma
+
+        Args:
+            stopwords: Aksanları katlanmış stopword listesi (None: varsayılan Türkçe liste)
+            prefix_length: Uzun kelimelerde tutulan önek uzunluğu
+            min_stem_length: Kısa ek atıldıktan sonra kalması gereken en kısa gövde
+        """
+        self.stopwords = frozenset(TURKISH_STOPWORDS if stopwords is None else stopwords)
+        self.prefix_length = prefix_length
+        self.min_stem_length = min_stem_length
+        self.max_cache_entries = max_cache_entries
+        self._terms: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def normalize(self, text: str) -> str:
+        """Küçük harf + aksan katlama"""
+        return fold_diacritics(casefold(text))
+
+    def stem(self, word: str) -> str:
+        """Normalize kelimeden hafif ek at (sayılar olduğu gibi kalır)
+
+        Türkçe eklemeli olduğundan uzun kelimelerin ilk prefix_length harfi tutulur
+        (kanunların, kanunda -> kanun); sınırı bir harf aşan kelimelerde önce kısa
+        iyelik/hal eki denenir (cezası -> ceza). Kısa kelimeler olduğu gibi kalır.
+        """
+        if word.isdigit() or len(word) <= self.prefix_length:
+            return word
+        if len(word) == self.prefix_length + 1:
+            for suffix in _SHORT_SUFFIXES:
+                if word.endswith(suffix) and len(word) - len(suffix) >= self.min_stem_length:
+                    return word[:-len(suffix)]
+        return word[:self.prefix_length]
+
+    def analyze(self, text: str) -> List[str]:
+        """Metni indeks terimlerine ayır"""
+        words = _WORD_PATTERN.findall(self.normalize(text))
+        terms = self._terms
+        with self._lock:
+            unseen = set(words).difference(terms)
+            if unseen:
+                if len(terms) + len(unseen) > self.max_cache_entries:
+                    terms.clear()
+                    unseen = set(words)
+                for word in unseen:
+                    # Stopword'ler boş terimle saklanır ve sonuçtan elenir
+                    terms[word] = '' if word in self.stopwords else self.stem(word)
+            return list(filter(None, map(terms.__getitem__, words)))
+
+    def normalize_key(self, text: str) -> str:
+        """Önbellek anahtarı: büyük/küçük harf, aksan, noktalama ve boşluk farkları silinir
+
+        Stopword ve ekler korunur; anlamı değiştirebilecek farklar aynı anahtara düşmez.
+        """
+        return ' '.join(_WORD_PATTERN.findall(self.normalize(text)))
+
+
+_default_analyzer = TurkishAnalyzer()
+
+
+def analyze(text: str) -> List[str]:
+    """Varsayılan çözümleyici ile indeks terimleri"""
+    return _default_analyzer.analyze(text)
+
+
+def normalize_key(text: str) -> str:
+    """Varsayılan çözümleyici ile önbellek anahtarı"""
+    return _default_analyzer.normalize_key(text)
+
+
+# Test fonksiyonu
+def test_turkish_analyzer():
+    """TurkishAnalyzer test fonksiyonu"""
+    print("🧪 Türkçe Çözümleyici Testi Başlıyor...")
+
+    try:
+        import time
+
+        print(f"🔤 casefold: {casefold('İSTANBUL IĞDIR İcra')}")
+        print(f"📄 analyze: {analyze('Borçlu, ÖDEME EMRİNE yedi gün içinde itiraz edebilir.')}")
+        print(f"🌱 gövde: {analyze('kanun kanunu kanunların cezası ödemesi maddesinde')}")
+        print(f"🔑 anahtar: '{normalize_key('  Ödeme emri  nedir? ')}' == '{normalize_key('odeme EMRI nedir')}'")
+
+        text = "Madde 81 - (1) Bir insanı kasten öldüren kişi, müebbet hapis cezası ile cezalandırılır. " * 20000
+        start_time = time.perf_counter()
+        token_count = len(analyze(text))
+        elapsed = time.perf_counter() - start_time
+        print(f"⚡ {token_count} terim, {token_count / elapsed / 1e6:.2f}M terim/sn")
+
+        print("✅ Türkçe çözümleyici testi başarılı!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test hatası: {e}")
+        return False
+
+if __name__ == "__main__":
+    test_turkish_analyzer()
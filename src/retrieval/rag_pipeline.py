@@ -50,7 +50,7 @@ class RAGPipeline:
             },
             'retrieval': {
                 'top_k': 5,
-                'similarity_threshold': 0.7
+                'similarity_threshold': 0.35
             }
         }
     
@@ -72,15 +72,22 @@ class RAGPipeline:
             logger.error(f"LLM başlatma hatası: {e}")
             raise
     
-    def query(self, question: str, chat_history: Optional[List[Dict]] = None) -> Dict[str, Any]:
-        """Ana RAG sorgu fonksiyonu"""
+    def query(self, question: str, chat_history: Optional[List[Dict]] = None,
+              filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Ana RAG sorgu fonksiyonu (filters: ChromaManager.search metadata filtreleri)"""
         try:
             logger.info(f"🔍 Sorgu: {question}")
             
+            # 0. Yalnızca madde atıfıysa ("TCK madde 81") madde metni doğrudan döner; embedding ve LLM yok
+            article = None if filters else self.chroma_manager.lookup_citation(question)
+            if article:
+                return self._citation_result(question, article)
+            
             # 1. Retrieval - İlgili belgeleri bul
             relevant_docs = self.chroma_manager.search(
                 question, 
-                n_results=self.config['retrieval']['top_k']
+                n_results=self.config['retrieval']['top_k'],
+                filters=filters
             )
             
             if not relevant_docs:
@@ -108,7 +115,8 @@ class RAGPipeline:
                 'confidence': self._calculate_confidence(relevant_docs),
                 'query': question,
                 'timestamp': datetime.now().isoformat(),
-                'retrieved_docs_count': len(relevant_docs)
+                'retrieved_docs_count': len(relevant_docs),
+                'route': 'rag'
             }
             
             logger.success(f"✅ Sorgu tamamlandı: {len(llm_response)} karakter cevap")
@@ -124,6 +132,23 @@ class RAGPipeline:
                 'timestamp': datetime.now().isoformat()
             }
     
+    def _citation_result(self, question: str, article: Dict[str, Any]) -> Dict[str, Any]:
+        """Atıf kısayolu sonucu: maddenin metni olduğu gibi"""
+        chunks = article['chunks']
+        answer = f"{article['label']} ({chunks[0]['metadata']['filename']}):\n\n" + \
+            "\n".join(chunk['content'].strip() for chunk in chunks)
+        
+        logger.success(f"✅ Atıf kısayolu: {article['label']}")
+        return {
+            'answer': answer,
+            'sources': self._format_sources(chunks),
+            'confidence': 1.0,
+            'query': question,
+            'timestamp': datetime.now().isoformat(),
+            'retrieved_docs_count': len(chunks),
+            'route': 'citation'
+        }
+    
     def _prepare_context(self, relevant_docs: List[Dict]) -> str:
         """Context metni hazırla"""
         context_parts = []
@@ -137,13 +162,23 @@ class RAGPipeline:
                 continue
             
             # Context formatı
-            source_info = f"[Kaynak {i+1}: {doc['metadata']['filename']}]"
+            source_info = f"[Kaynak {i+1}: {self._source_label(doc['metadata'])}]"
             content = doc['content'].strip()
             
             context_parts.append(f"{source_info}\n{content}\n")
         
         return "\n".join(context_parts)
     
+    def _source_label(self, metadata: Dict[str, Any]) -> str:
+        """Kaynak etiketi: dosya adı ve varsa madde/fıkra numarası"""
+        label = metadata['filename']
+        if metadata.get('article_no') is not None:
+            prefix = {'ek': 'Ek Madde', 'gecici': 'Geçici Madde'}.get(metadata.get('article_kind'), 'Madde')
+            label += f", {prefix} {metadata['article_no']}"
+            if metadata.get('paragraph'):
+                label += f"/{metadata['paragraph']}"
+        return label
+    
     def _create_prompt(self, question: str, context: str, chat_history: Optional[List[Dict]] = None) -> str:
         """LLM için prompt oluştur"""
         
@@ -234,6 +269,7 @@ Lütfen bu soruyu sadece verilen hukuki belgelere dayanarak yanıtla. Kaynak ref
                 'filename': doc['metadata']['filename'],
                 'similarity': f"{similarity:.2f}",
                 'chunk_index': doc['metadata'].get('chunk_index', 0),
+                'article_no': doc['metadata'].get('article_no'),
                 'preview': doc['content'][:200] + "..." if len(doc['content']) > 200 else doc['content']
             }
             sources.append(source)